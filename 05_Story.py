@@ -2,14 +2,19 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-
-# Load datasets
-df_predict_cleaned = pd.read_csv("Data/Predict Hair Fall Cleaned.csv")
-df_luke_cleaned = pd.read_csv("Data/Luke_hair_loss_documentation Cleaned.csv")
+from src.catalog import load_dataset
+from src.story import PREDICT, story_summaries
 
 # Set page config
 st.set_page_config(page_title="Hair Loss Insights Story", layout="wide")
 
+# Precomputed summary tables (src/story.py); the row-level datasets are only loaded for drill-downs
+summaries = story_summaries()
+if summaries is None:
+    st.error("Cleaned datasets not found in Data/.")
+    st.stop()
+df_luke_daily = summaries["luke_daily"]
+
 # --------- Page Header ---------
 st.title("Hair Loss Insights: Population & Personal Story")
 st.markdown("""
@@ -20,7 +25,7 @@ This page explores population-level insights (1000 individuals) and individual-l
 # --------- Section 1: Genetics and Hair Loss ---------
 st.header("Genetics and Hair Loss")
 
-genetic_summary = df_predict_cleaned.groupby('Genetic_Encoding')['Hair_Loss'].value_counts(normalize=True).rename('proportion').reset_index()
+genetic_summary = summaries["genetic_summary"]
 fig_genetics = px.bar(
     genetic_summary, 
     x='Genetic_Encoding', y='proportion', color='Hair_Loss',
@@ -47,13 +52,8 @@ Genetics is a major predictor of hair loss:
 # --------- Section 2: Nutrition and Hair Health ---------
 st.header("Nutrition and Hair Health")
 
-# Example for Iron and Vitamin D deficiencies
-nutrient_cols = ['Nutritional_Deficiencies', 'Hair_Loss', 'Genetic_Encoding']
-df_nutrition = df_predict_cleaned[df_predict_cleaned['Genetic_Encoding']==1]  # Only genetically predisposed
-
-# Count deficiencies
-nutrient_summary = df_nutrition.groupby(['Hair_Loss', 'Nutritional_Deficiencies']).size().reset_index(name='count')
-nutrient_summary['proportion'] = nutrient_summary.groupby('Hair_Loss')['count'].transform(lambda x: x/x.sum())
+# Deficiency proportions among the genetically predisposed
+nutrient_summary = summaries["nutrient_summary"]
 
 fig_nutrition = px.bar(
     nutrient_summary,
@@ -81,15 +81,15 @@ st.header("Lifestyle & Daily Factors: Luke's Hair Loss Data")
 # Line chart: Hair Loss, Stress, Brain Working Hours
 fig_luke = go.Figure()
 fig_luke.add_trace(go.Scatter(
-    x=df_luke_cleaned['Date'], y=df_luke_cleaned['Hair_Loss_Encoding'],
+    x=df_luke_daily['Date'], y=df_luke_daily['Hair_Loss_Encoding'],
     mode='lines+markers', name='Hair Loss', line=dict(color='orange')
 ))
 fig_luke.add_trace(go.Scatter(
-    x=df_luke_cleaned['Date'], y=df_luke_cleaned['Stress_Level_Encoding'],
+    x=df_luke_daily['Date'], y=df_luke_daily['Stress_Level_Encoding'],
     mode='lines+markers', name='Stress Level', line=dict(color='purple')
 ))
 fig_luke.add_trace(go.Scatter(
-    x=df_luke_cleaned['Date'], y=df_luke_cleaned['Brain_Working_Duration'],
+    x=df_luke_daily['Date'], y=df_luke_daily['Brain_Working_Duration'],
     mode='lines+markers', name='Brain Working Duration', line=dict(color='blue')
 ))
 fig_luke.update_layout(
@@ -109,7 +109,7 @@ Luke's daily data shows:
 st.header("Hair Grease and Hair Loss")
 
 fig_grease = px.bar(
-    df_luke_cleaned, x='Date', y=['Hair_Grease','Hair_Loss_Encoding'],
+    df_luke_daily, x='Date', y=['Hair_Grease','Hair_Loss_Encoding'],
     barmode='group', labels={'value':'Level', 'variable':'Factor'},
     color_discrete_map={'Hair_Grease':'brown','Hair_Loss_Encoding':'orange'}
 )
@@ -124,7 +124,7 @@ st.markdown("Higher hair grease buildup is associated with increased hair sheddi
 # --------- Section 5: Age & Alopecia Trends ---------
 st.header("Age & Alopecia Trends (Population)")
 
-alopecia_summary = df_predict_cleaned.groupby(['Age_Range','Hair_Loss']).size().reset_index(name='count')
+alopecia_summary = summaries["alopecia_summary"]
 fig_age = px.bar(
     alopecia_summary, x='Age_Range', y='count', color='Hair_Loss',
     color_discrete_map={0:'lightblue',1:'orange'},
@@ -141,6 +141,11 @@ st.markdown("""
 - Ages 25–40 show the highest hair loss occurrences.
 """)
 
+if st.checkbox("Show the individual records behind this chart"):
+    df_predict_cleaned = load_dataset(PREDICT)
+    st.dataframe(df_predict_cleaned[['Id', 'Age', 'Age_Range', 'Genetics', 'Nutritional_Deficiencies', 'Hair_Loss']],
+                 use_container_width=True)
+
 # --------- Section 6: Recommendations ---------
 st.header("Recommendations & Takeaways")
 
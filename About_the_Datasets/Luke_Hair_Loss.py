@@ -3,6 +3,8 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
+from src.catalog import load_dataset
+from src.downloads import DOWNLOAD_FORMATS, download_file_name, download_payload, frame_payload
 
 BASE_BG = "#FFFFFF"
 ACCENT = "#FFFFFF"
@@ -12,32 +14,24 @@ SECTION_BG = "#2a5a55"
 SUB_HEADING_BG = "#749683"
 SECONDARY = "#E67E22"
 
-@st.cache_data
-def load_csv(path):
-    try:
-        return pd.read_csv(path)
-    except FileNotFoundError:
-        st.markdown(FileNotFoundError)
-        return None
-
 def detect_target(col_candidates, df):
     for c in col_candidates:
         if c in df.columns:
             return c
     return None
 
-def show_luke_hair_loss(raw_path=None, cleaned_path=None, raw_df=None, cleaned_df=None, show_age_dist=True):
+def show_luke_hair_loss(raw_dataset=None, cleaned_dataset=None, raw_df=None, cleaned_df=None, show_age_dist=True):
     if raw_df is not None:
         df_raw = raw_df
-    elif raw_path:
-        df_raw = load_csv(raw_path)
+    elif raw_dataset:
+        df_raw = load_dataset(raw_dataset)
     else:
         df_raw = None
 
     if cleaned_df is not None:
         df_cleaned = cleaned_df
-    elif cleaned_path:
-        df_cleaned = load_csv(cleaned_path)
+    elif cleaned_dataset:
+        df_cleaned = load_dataset(cleaned_dataset)
     else:
         df_cleaned = None
 
@@ -133,28 +127,33 @@ def show_luke_hair_loss(raw_path=None, cleaned_path=None, raw_df=None, cleaned_d
     )
 
     # Vertical stacked buttons
+    fmt = st.radio("Download format", list(DOWNLOAD_FORMATS), horizontal=True, key="luke_download_format")
     with st.spinner("Preparing datasets for download..."):
         
         # import time
         # time.sleep(2)
         # st.write("Done!")
         
+        # frames passed in directly have no dataset version, so they are serialized as-is
+        cleaned_payload = frame_payload(cleaned_df, fmt) if cleaned_df is not None else download_payload(cleaned_dataset, fmt)
+        raw_payload = frame_payload(raw_df, fmt) if raw_df is not None else download_payload(raw_dataset, fmt)
+
         col = st.container()
 
         with col:
             st.download_button(
                 label="📥 Download Cleaned Dataset",
-                data=df_cleaned.to_csv(index=False).encode('utf-8'),
-                file_name="Luke_Hair_Loss_Cleaned.csv",
-                mime="text/csv",
+                data=cleaned_payload,
+                file_name=download_file_name("Luke_Hair_Loss_Cleaned", fmt),
+                mime=DOWNLOAD_FORMATS[fmt][1],
                 use_container_width=True
             )
 
             st.download_button(
                 label="📄 Download Raw Dataset",
-                data=df_raw.to_csv(index=False).encode('utf-8'),
-                file_name="Luke_Hair_Loss_Raw.csv",
-                mime="text/csv",
+                data=raw_payload,
+                file_name=download_file_name("Luke_Hair_Loss_Raw", fmt),
+                mime=DOWNLOAD_FORMATS[fmt][1],
                 use_container_width=True
             )
 
@@ -7,6 +7,8 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import io
 from PIL import Image
+from src.catalog import load_dataset
+from src.downloads import DOWNLOAD_FORMATS, download_file_name, download_payload
 
 BASE_BG = "#FFFFFF"
 ACCENT = "#FFFFFF"
@@ -17,14 +19,6 @@ SUB_HEADING_BG = "#749683"
 SECONDARY = "#E67E22"
 
 # ---------------- HELPER FUNCTIONS ----------------
-@st.cache_data
-def load_csv(path):
-    try:
-        return pd.read_csv(path)
-    except FileNotFoundError:
-        st.error(f"File not found: {path}")
-        return None
-
 def create_donut_image(df, column, title, top_n=5, colors=None):
     if column not in df.columns:
         return None
@@ -64,10 +58,11 @@ def create_donut_image(df, column, title, top_n=5, colors=None):
     return img
 
 # ---------------- MAIN FUNCTION ----------------
-def show_nutrition_dataset(path):
-    df = load_csv(path)
-    df_cleaned = load_csv('Data/Cleaned_Nutrition_Dataset.csv')
+def show_nutrition_dataset(dataset="nutrition", cleaned_dataset="nutrition_cleaned"):
+    df = load_dataset(dataset)
+    df_cleaned = load_dataset(cleaned_dataset)
     if df is None:
+        st.error(f"Dataset not found: {dataset}")
         return
 
     st.markdown(
@@ -188,23 +183,24 @@ def show_nutrition_dataset(path):
 
 
     # Download buttons (vertical stack)
+    fmt = st.radio("Download format", list(DOWNLOAD_FORMATS), horizontal=True, key="nutrition_download_format")
     with st.spinner("Preparing datasets for download..."):
         col = st.container()
 
         with col:
             st.download_button(
                 label="📥 Download Cleaned Dataset",
-                data=df_cleaned.to_csv(index=False).encode('utf-8'),
-                file_name="Predict_Hair_Fall_Cleaned.csv",
-                mime="text/csv",
+                data=download_payload(cleaned_dataset, fmt),
+                file_name=download_file_name("Nutrition_Dataset_Cleaned", fmt),
+                mime=DOWNLOAD_FORMATS[fmt][1],
                 use_container_width=True
             )
 
             st.download_button(
                 label="📄 Download Raw Dataset",
-                data=df.to_csv(index=False).encode('utf-8'),
-                file_name="Predict_Hair_Fall_Raw.csv",
-                mime="text/csv",
+                data=download_payload(dataset, fmt),
+                file_name=download_file_name("Nutrition_Dataset_Raw", fmt),
+                mime=DOWNLOAD_FORMATS[fmt][1],
                 use_container_width=True
             )
             
@@ -5,6 +5,9 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import io
 from PIL import Image
+from src.aggregates import AGGREGATES, column_counts
+from src.catalog import load_dataset
+from src.downloads import DOWNLOAD_FORMATS, download_file_name, download_payload
 
 BASE_BG = "#FFFFFF"
 ACCENT = "#FFFFFF"
@@ -14,20 +17,17 @@ SECTION_BG = "#2a5a55"
 SUB_HEADING_BG = "#749683"
 SECONDARY = "#E67E22"
 
-@st.cache_data
-def load_csv(path):
-    return pd.read_csv(path)
-
 def detect_target(col_candidates, df):
     for c in col_candidates:
         if c in df.columns:
             return c
     return None
 
-def create_donut_image(df, column, title, top_n=5, colors=None):
+def create_donut_image(df, column, title, top_n=5, colors=None, counts=None):
     if column not in df.columns:
         return None
-    counts = df[column].dropna().astype(str).value_counts()
+    if counts is None:
+        counts = df[column].dropna().astype(str).value_counts()
     if len(counts) > top_n:
         top_counts = counts[:top_n]
         other_count = counts[top_n:].sum()
@@ -59,10 +59,14 @@ def create_donut_image(df, column, title, top_n=5, colors=None):
     plt.close(fig)
     return img
 
-def show_predict_hair_fall(raw_path, cleaned_path):
+def _precomputed_counts(dataset, column):
+    # counts from the aggregate store (src/aggregates.py); None lets create_donut_image count live
+    return column_counts(dataset, column, dropna=True) if dataset in AGGREGATES else None
+
+def show_predict_hair_fall(raw_dataset, cleaned_dataset):
     
-    df_raw = load_csv(raw_path)
-    df_cleaned = load_csv(cleaned_path)
+    df_raw = load_dataset(raw_dataset)
+    df_cleaned = load_dataset(cleaned_dataset)
 
     if df_raw is None or df_cleaned is None:
         st.error("Dataset file not found.")
@@ -199,11 +203,13 @@ def show_predict_hair_fall(raw_path, cleaned_path):
     c1, c2 = st.columns(2)
     with st.spinner("Generating donut charts..."):
         with c1:
-            med_img = create_donut_image(df_cleaned, "Medical_Conditions", "Top Medical Conditions (%)", top_n=5)
+            med_img = create_donut_image(df_cleaned, "Medical_Conditions", "Top Medical Conditions (%)", top_n=5,
+                                         counts=_precomputed_counts(cleaned_dataset, "Medical_Conditions"))
             if med_img:
                 st.image(med_img)
         with c2:
-            nut_img = create_donut_image(df_cleaned, "Nutritional_Deficiencies", "Top Nutritional Deficiencies (%)", top_n=5)
+            nut_img = create_donut_image(df_cleaned, "Nutritional_Deficiencies", "Top Nutritional Deficiencies (%)", top_n=5,
+                                         counts=_precomputed_counts(cleaned_dataset, "Nutritional_Deficiencies"))
             if nut_img:
                 st.image(nut_img)
 
@@ -248,22 +254,23 @@ def show_predict_hair_fall(raw_path, cleaned_path):
 
 
     # Download buttons (vertical stack)
+    fmt = st.radio("Download format", list(DOWNLOAD_FORMATS), horizontal=True, key="predict_download_format")
     with st.spinner("Preparing datasets for download..."):
         col = st.container()
 
         with col:
             st.download_button(
                 label="📥 Download Cleaned Dataset",
-                data=df_cleaned.to_csv(index=False).encode('utf-8'),
-                file_name="Predict_Hair_Fall_Cleaned.csv",
-                mime="text/csv",
+                data=download_payload(cleaned_dataset, fmt),
+                file_name=download_file_name("Predict_Hair_Fall_Cleaned", fmt),
+                mime=DOWNLOAD_FORMATS[fmt][1],
                 use_container_width=True
             )
 
             st.download_button(
                 label="📄 Download Raw Dataset",
-                data=df_raw.to_csv(index=False).encode('utf-8'),
-                file_name="Predict_Hair_Fall_Raw.csv",
-                mime="text/csv",
+                data=download_payload(raw_dataset, fmt),
+                file_name=download_file_name("Predict_Hair_Fall_Raw", fmt),
+                mime=DOWNLOAD_FORMATS[fmt][1],
                 use_container_width=True
             )
@@ -3,6 +3,7 @@ import streamlit as st
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
+from src.catalog import load_dataset
 
 # Duplicate color & style constants to keep page identical when module runs standalone
 BASE_BG = "#FFFFFF"
@@ -15,21 +16,13 @@ SECTION_BG = "#2a5a55"
 BG_COLOR = "#0C0505"
 SIDBAR_TEXT ="#a9cac6"
 
-# Dataset loader function (duplicated here per your instructions)
-@st.cache_data
-def load_csv(path):
-    try:
-        return pd.read_csv(path)
-    except FileNotFoundError:
-        return None
-
 def run():
     """
     Render the Luke Hair Loss Dataset cleaning page.
     Contains cleaning summary, unique values table, and visualizations from your original file.
     """
-    df_luke_raw = load_csv("Data/Luke_hair_loss_documentation Raw.csv")
-    df_luke_cleaned = load_csv("Data/Luke_hair_loss_documentation Cleaned.csv")
+    df_luke_raw = load_dataset("luke_hair_loss_raw")
+    df_luke_cleaned = load_dataset("luke_hair_loss_cleaned")
 
     df = df_luke_cleaned if df_luke_cleaned is not None else df_luke_raw
 
@@ -1,6 +1,7 @@
 # Cleaning/Nutrition_Dataset.py
 import streamlit as st
 import pandas as pd
+from src.catalog import load_dataset
 
 # Duplicate color & style constants to keep page identical when module runs standalone
 BASE_BG = "#FFFFFF"
@@ -13,16 +14,9 @@ SECTION_BG = "#2a5a55"
 BG_COLOR = "#0C0505"
 SIDBAR_TEXT = "#a9cac6"
 
-@st.cache_data
-def load_csv(path):
-    try:
-        return pd.read_csv(path)
-    except FileNotFoundError:
-        return None
-
 def run():
-    df_nutrition_raw = load_csv("Data/Nutrition_Dataset.csv")
-    df_nutrition_cleaned = load_csv("Data/Cleaned_Nutrition_Dataset.csv")
+    df_nutrition_raw = load_dataset("nutrition")
+    df_nutrition_cleaned = load_dataset("nutrition_cleaned")
 
     df = df_nutrition_cleaned if df_nutrition_cleaned is not None else df_nutrition_raw
 
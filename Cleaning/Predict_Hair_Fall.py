@@ -3,6 +3,8 @@ import streamlit as st
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
+from src.catalog import load_dataset
+from src.cleaning import CleaningPipeline, create_age_ranges, map_stress_levels
 
 # Duplicate color & style constants to keep page identical when module runs standalone
 BASE_BG = "#FFFFFF"
@@ -15,22 +17,14 @@ SECTION_BG = "#2a5a55"
 BG_COLOR = "#0C0505"
 SIDBAR_TEXT ="#a9cac6"
 
-# Dataset loader function (duplicated here per your instructions)
-@st.cache_data
-def load_csv(path):
-    try:
-        return pd.read_csv(path)
-    except FileNotFoundError:
-        return None
-
 def run():
     """
     Render the Hair Health Prediction Dataset cleaning page.
     This contains the same text, unique-values table, and visualizations from your original file.
     """
     # Load dataset(s) locally within this module
-    df_predict_raw = load_csv("Data/Predict Hair Fall Raw.csv")
-    df_predict_cleaned = load_csv("Data/Predict Hair Fall Cleaned.csv")
+    df_predict_raw = load_dataset("predict_hair_fall_raw")
+    df_predict_cleaned = load_dataset("predict_hair_fall_cleaned")
 
     # If cleaned file not present, fallback to raw for visual/unique display where possible
     df = df_predict_cleaned if df_predict_cleaned is not None else df_predict_raw
@@ -168,18 +162,11 @@ def run():
     st.markdown("<br>", unsafe_allow_html=True)
 
     # Prepare columns for plotting safely (check columns exist)
-    if 'Age' in df.columns:
-        try:
-            df['Age_Range'] = pd.cut(df['Age'], bins=[18,30,40,51], labels=['18-30','30-40','40-51'], right=False)
-        except Exception:
-            df['Age_Range'] = None
-    else:
-        df['Age_Range'] = None
-
-    if 'Stress' in df.columns:
-        df['Stress_Level'] = df['Stress'].map({'Low':0,'Moderate':1,'High':2})
-    else:
-        df['Stress_Level'] = None
+    plot_steps = [step for step, source in ((create_age_ranges, 'Age'), (map_stress_levels, 'Stress')) if source in df.columns]
+    df = CleaningPipeline(plot_steps, profile_memory=False).run(df)
+    for col in ('Age_Range', 'Stress_Level'):
+        if col not in df.columns:
+            df[col] = None
 
     # ---- Plots ----
     fig, axes = plt.subplots(1,2, figsize=(14,4))
@@ -7,7 +7,9 @@ import plotly.express as px
 import plotly.graph_objects as go
 import seaborn as sns
 from matplotlib.colors import LinearSegmentedColormap
-from sklearn.preprocessing import LabelEncoder
+from src.aggregates import column_counts, load_aggregate, load_pair_counts
+from src.luke_cleaning import parse_luke_dates
+from src.luke_log import load_smoothed
 
 # Local copies of the style/colors used by the main page
 BASE_BG = "#FFFFFF"
@@ -22,6 +24,9 @@ SIDBAR_TEXT = "#a9cac6"
 CARD_COLOR ="#d4e6e4"
 CARD_COLOR2 = "#dcf4e0"
 
+# counts and correlations come from the precomputed aggregates (python -m src.aggregates build)
+DATASET = "luke_hair_loss_cleaned"
+
 def render_luke_page(df_luke_cleaned):
     """
     Render the Luke Hair Loss EDA page.
@@ -92,16 +97,15 @@ def render_luke_page(df_luke_cleaned):
 
     # Distribution plot
     try:
-        col_data = df[col_choice].fillna('Missing').astype(str)
+        col_counts = column_counts(DATASET, col_choice)
         if col_choice in custom_orders:
             categories = custom_orders[col_choice]
-            counts = col_data.value_counts().reindex(categories, fill_value=0)
+            counts = col_counts.reindex(categories, fill_value=0)
         elif col_choice in ['Coffee_Consumed', 'Brain_Working_Duration', 'Stay_Up_Late']:
-            col_numeric = pd.to_numeric(col_data, errors='coerce')
-            counts = col_numeric.value_counts().sort_index()
+            counts = col_counts.groupby(pd.to_numeric(col_counts.index, errors='coerce')).sum().sort_index()
             categories = counts.index.tolist()
         else:
-            counts = col_data.value_counts().sort_index()
+            counts = col_counts.sort_index()
             categories = counts.index.tolist()
 
         values = counts.values
@@ -162,7 +166,8 @@ def render_luke_page(df_luke_cleaned):
     y_choice = st.selectbox("Y-axis:", options=cols_list, index=cols_list.index(default_y))
 
     try:
-        df_plot = df[[x_choice, y_choice]].copy()
+        # one row per (x, y) combination with its 'count'
+        df_plot = load_pair_counts(DATASET, x_choice, y_choice)
         df_plot[y_choice] = df_plot[y_choice].fillna('Missing').astype(str)
         df_plot[x_choice] = df_plot[x_choice].fillna('Missing')
 
@@ -171,10 +176,9 @@ def render_luke_page(df_luke_cleaned):
             categories_x = custom_orders[x_choice]
         elif x_choice in ['Coffee_Consumed', 'Brain_Working_Duration', 'Stay_Up_Late']:
             col_numeric = pd.to_numeric(df_plot[x_choice], errors='coerce')
-            counts_x = col_numeric.value_counts().sort_index()
-            categories_x = counts_x.index.tolist()
+            categories_x = sorted(col_numeric.dropna().unique().tolist())
         else:
-            categories_x = df_plot[x_choice].astype(str).value_counts().sort_index().index.tolist()
+            categories_x = sorted(df_plot[x_choice].astype(str).unique().tolist())
 
         # categories for y
         if y_choice in custom_orders:
@@ -182,7 +186,7 @@ def render_luke_page(df_luke_cleaned):
         else:
             categories_y = df_plot[y_choice].astype(str).unique().tolist()
 
-        counts = df_plot.groupby([x_choice, y_choice]).size().reset_index(name='Count')
+        counts = df_plot.groupby([x_choice, y_choice], observed=True)['count'].sum().reset_index(name='Count')
 
         colors_palette = ["#b7e4c7", "#2db17a", "#186b46", "#d9a044", "#74c69d", "#c744c1"]
 
@@ -234,11 +238,7 @@ def render_luke_page(df_luke_cleaned):
     cols = [c for c in candidate_cols if c in df.columns]
     if cols:
         try:
-            df_corr = df[cols].copy()
-            for col in df_corr.select_dtypes(include='object').columns:
-                df_corr[col] = LabelEncoder().fit_transform(df_corr[col].astype(str))
-
-            corr_matrix = df_corr.corr()
+            corr_matrix = load_aggregate(DATASET, "corr")
 
             colors_palette = ["#c1dab8", "#77a48f", "#4e8f73", "#407059", "#255B42", "#0E3A26"]
             cmap = LinearSegmentedColormap.from_list("green_palette", colors_palette, N=256)
@@ -268,16 +268,19 @@ def render_luke_page(df_luke_cleaned):
             """, unsafe_allow_html=True)
     st.markdown("<br>", unsafe_allow_html=True)
 
-    if 'Date' in df.columns and 'Hair_Loss_Encoding' in df.columns:
+    # days appended through src/luke_log.py come with the smoothed series already maintained;
+    # it is only used when it holds every day of the dataset shown on the rest of the page
+    df_time = load_smoothed(covering=parse_luke_dates(df['Date'])) if 'Date' in df.columns else None
+    if df_time is not None or ('Date' in df.columns and 'Hair_Loss_Encoding' in df.columns):
         try:
-            df_time = df.copy()
-            # try common date formats; if fails user will see error printed
-            df_time['Date'] = pd.to_datetime(df_time['Date'], errors='coerce', dayfirst=True)
-            df_time = df_time.sort_values('Date').dropna(subset=['Date']).copy()
+            if df_time is None:
+                df_time = df[['Date', 'Hair_Loss_Encoding']].copy()
+                df_time['Date'] = parse_luke_dates(df_time['Date'])
+                df_time = df_time.sort_values('Date').dropna(subset=['Date']).copy()
+                df_time['Smoothed_Hair_Loss'] = df_time['Hair_Loss_Encoding'].rolling(window=5, center=True, min_periods=1).mean()
             if df_time.empty:
                 st.info("No valid date values to plot time series.")
             else:
-                df_time['Smoothed_Hair_Loss'] = df_time['Hair_Loss_Encoding'].rolling(window=5, center=True, min_periods=1).mean()
                 fig = px.line(df_time, x='Date', y='Smoothed_Hair_Loss', labels={'Smoothed_Hair_Loss': 'Hair Loss (Smoothed)', 'Date':'Date'}, line_shape='spline', template='simple_white')
                 fig.update_traces(line=dict(color='mediumseagreen', width=3), hovertemplate='Date: %{x|%d-%b-%Y}<br>Hair Loss: %{y:.2f}<extra></extra>')
                 fig.update_layout(height=500, xaxis=dict(showgrid=True), yaxis=dict(showgrid=True))
@@ -313,10 +316,7 @@ def render_luke_page(df_luke_cleaned):
     corr_cols = [c for c in corr_cols if c in df.columns]
     if 'Hair_Loss_Encoding' in corr_cols:
         try:
-            df_corr = df[corr_cols].copy()
-            for col in df_corr.select_dtypes(include='object').columns:
-                df_corr[col] = LabelEncoder().fit_transform(df_corr[col].astype(str))
-            corr_matrix = df_corr.corr()
+            corr_matrix = load_aggregate(DATASET, "hair_loss_corr")
             if 'Hair_Loss_Encoding' in corr_matrix.columns:
                 hair_loss_corr = corr_matrix['Hair_Loss_Encoding'].drop('Hair_Loss_Encoding').sort_values(ascending=False)
                 if not hair_loss_corr.empty:
@@ -4,6 +4,7 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
 from matplotlib.colors import LinearSegmentedColormap
+from src.nutrient_matrix import get_nutrient_matrix
 
 # Local copies of color/style tokens used across other EDA modules
 BASE_BG = "#FFFFFF"
@@ -13,7 +14,7 @@ TEXT = "#2C3E50"
 SECTION_BG_PLOTS = "#749683"
 CARD_COLOR = "#d4e6e4"
 
-def render_nutrition_page(df):
+def render_nutrition_page():
     
     st.markdown(f"""
     <div padding:14px; border-radius:12px;'>
@@ -39,33 +40,21 @@ def render_nutrition_page(df):
 
     st.markdown("<br>", unsafe_allow_html=True)
 
-    if df is None:
+    # Everything on this page reads the memory-mapped matrix (src/nutrient_matrix.py), not a DataFrame
+    try:
+        nm = get_nutrient_matrix()
+    except FileNotFoundError:
         st.error("Nutrition dataset not loaded.")
         return
 
-    data = df.copy()
-
     # --- detect sensible columns ---
-    # Food column (exact match fallback)
-    food_col_candidates = [c for c in data.columns if c.lower() in ('food', 'food_name', 'item')]
-    food_col = food_col_candidates[0] if food_col_candidates else (data.columns[0] if len(data.columns) > 0 else None)
-
     # Metric columns (numeric). Prefer 'Nutrition_Density' if present.
-    numeric_cols = data.select_dtypes(include=[np.number]).columns.tolist()
+    numeric_cols = list(nm.columns)
     preferred_metric = 'Nutrition_Density'
-    metric_col = preferred_metric if preferred_metric in data.columns else (numeric_cols[0] if numeric_cols else None)
-
-    # Categorical columns for grouping (exclude 'Food' and numeric)
-    cat_cols = [c for c in data.select_dtypes(include=['object', 'category']).columns if c != food_col]
-    # Provide fallback: small-cardinality numeric columns could also represent categories (encoded)
-    for c in data.columns:
-        if c not in cat_cols and c != metric_col and c != food_col:
-            # treat as categorical if few unique values
-            try:
-                if data[c].nunique(dropna=True) <= 30:
-                    cat_cols.append(c)
-            except Exception:
-                pass
+    metric_col = preferred_metric if preferred_metric in numeric_cols else (numeric_cols[0] if numeric_cols else None)
+
+    # Small-cardinality numeric columns can be used as categories (encoded)
+    cat_cols = [c for c in numeric_cols if c != metric_col and len(nm.unique(c)) <= 30]
 
 
 
@@ -90,41 +79,32 @@ def render_nutrition_page(df):
 
     # --- Data preparation ---
     try:
-        # If user selected a category, filter dataset to that category
-        working = data.copy()
-        if category_choice != "All" and category_choice in working.columns:
+        # If user selected a category, restrict the rows to that category
+        rows = None
+        if category_choice != "All" and category_choice in cat_cols:
             # allow user to pick a specific category value optionally
-            unique_vals = working[category_choice].dropna().unique().tolist()
-            unique_vals_sorted = sorted(unique_vals, key=lambda x: str(x))
+            unique_vals_sorted = sorted(nm.unique(category_choice).tolist(), key=lambda x: str(x))
             selected_val = st.selectbox(f"Filter {category_choice} by value (optional):", options=["All"] + unique_vals_sorted, index=0)
             if selected_val != "All":
-                working = working[working[category_choice] == selected_val].copy()
+                rows = nm.column(category_choice) == selected_val
 
-        # Clean metric & food columns
-        if metric_choice not in working.columns:
+        if metric_choice not in numeric_cols:
             st.error(f"Metric column '{metric_choice}' not found in data.")
             return
-        if food_col not in working.columns:
-            st.error("Food column not found in data.")
-            return
 
-        # Drop NA in required cols and ensure numeric metric
-        tmp = working[[food_col, metric_choice]].dropna(subset=[metric_choice, food_col]).copy()
-        tmp[metric_choice] = pd.to_numeric(tmp[metric_choice], errors='coerce')
-        tmp = tmp.dropna(subset=[metric_choice])
+        # NaN metrics are skipped by top_n
+        top_n = int(top_n)
+        top = nm.frame(nm.top_n(metric_choice, top_n, rows), [metric_choice])
 
-        if tmp.empty:
+        if top.empty:
             st.info("No data available for the selected filters.")
             return
 
-        top_n = int(top_n)
-        top = tmp.sort_values(by=metric_choice, ascending=False).head(top_n)
-
         # --- Plot ---
         # --- Plot ---
         fig, ax = plt.subplots(figsize=(10,6))  # height scales with top_n
         # Capitalize food names
-        food_names = top[food_col].astype(str).str.title()[::-1]
+        food_names = top['Food'][::-1]
         ax.barh(food_names, top[metric_choice].values[::-1], color="#77a48f")
         ax.set_xlabel(f'{metric_choice} (g)')
         ax.set_title(f'Top {top_n} Foods by {metric_choice}')
@@ -139,8 +119,6 @@ def render_nutrition_page(df):
 
         # Prepare display copy
         top_display = top.copy()
-        # Capitalize food names
-        top_display[food_col] = top_display[food_col].astype(str).str.title()
         # Round metric to whole numbers
         top_display[metric_choice] = top_display[metric_choice].round(0).astype(int)
 
@@ -184,9 +162,9 @@ def render_nutrition_page(df):
 
         # --- Prepare Data ---
     try:
-        top_macro = data[['Food'] + macro_cols].dropna(subset=macro_cols)
-        top_macro = top_macro.sort_values(by=macro_choice, ascending=False).head(top_n_macro)
-        top_macro['Food'] = top_macro['Food'].astype(str).str.title()  # Capitalize food names
+        # foods with all three macros present
+        complete = ~np.isnan(np.stack([nm.column(c) for c in macro_cols], axis=1)).any(axis=1)
+        top_macro = nm.frame(nm.top_n(macro_choice, int(top_n_macro), complete), macro_cols)
         top_macro = top_macro.set_index('Food')
 
         # --- Plot ---
@@ -231,8 +209,7 @@ def render_nutrition_page(df):
     st.markdown("<br>", unsafe_allow_html=True)
 
     # --- UI Control ---
-    food_options = data['Food'].dropna().astype(str).str.title().unique().tolist()
-    food_options.sort() 
+    food_options = nm.food_options()
     default_food = 'Cream Cheese' if 'Cream Cheese' in food_options else food_options[0]
     food_choice = st.selectbox("Select food for vitamin profile:", options=food_options, index=food_options.index(default_food))
 
@@ -241,8 +218,7 @@ def render_nutrition_page(df):
                 'Vitamin_B3','Vitamin_B5','Vitamin_B6','Vitamin_C','Vitamin_D','Vitamin_E','Vitamin_K']
 
     try:
-        row = data[data['Food'].str.title() == food_choice].iloc[0]
-        values = row[vit_list].fillna(0).values
+        values = np.nan_to_num(nm.row(food_choice, vit_list))
         max_val = max(values.max(), 1)
         values = values / max_val  # normalize
 
@@ -284,7 +260,7 @@ def render_nutrition_page(df):
     st.markdown("<br>", unsafe_allow_html=True)
 
     # --- Numeric columns for selection ---
-    numeric_cols = data.select_dtypes(include=[np.number]).columns.tolist()
+    numeric_cols = list(nm.columns)
 
     # --- User selection for X and Y ---
     col1, col2 = st.columns(2)
@@ -298,11 +274,11 @@ def render_nutrition_page(df):
         plt.figure(figsize=(8,6))
         
         # Use green gradient for point color
-        x = data[x_choice]
-        y = data[y_choice]
+        x = nm.column(x_choice)
+        y = nm.column(y_choice)
         # normalize color intensity based on distance from origin
-        distances = np.sqrt((x - x.min())**2 + (y - y.min())**2)
-        norm = (distances - distances.min()) / (distances.max() - distances.min())
+        distances = np.sqrt((x - np.nanmin(x))**2 + (y - np.nanmin(y))**2)
+        norm = (distances - np.nanmin(distances)) / (np.nanmax(distances) - np.nanmin(distances))
         colors = plt.cm.Greens(norm*0.4 + 0.6)  # start with lighter shade (#c1dab8) and darker as values increase
 
         plt.scatter(x, y, alpha=0.7, color=colors, edgecolor='k', s=25)
@@ -312,8 +288,8 @@ def render_nutrition_page(df):
         plt.title(f'{x_choice} vs {y_choice}')
 
         # annotate top 6 points by y_choice
-        for _, r in data.nlargest(6, y_choice)[['Food', x_choice, y_choice]].iterrows():
-            plt.annotate(str(r['Food']).title(), (r[x_choice], r[y_choice]), textcoords="offset points", xytext=(5,5))
+        for _, r in nm.frame(nm.top_n(y_choice, 6), [x_choice, y_choice]).iterrows():
+            plt.annotate(r['Food'], (r[x_choice], r[y_choice]), textcoords="offset points", xytext=(5,5))
 
         plt.tight_layout()
         st.pyplot(plt)
@@ -341,12 +317,11 @@ def render_nutrition_page(df):
     st.markdown("<br>", unsafe_allow_html=True)
 
     # Ensure data exists
-    if df is None:
+    if len(nm) == 0:
         st.info("Nutrition data not available for comparison.")
     else:
-        # Normalize food names and get sorted unique list
-        data['Food_Title'] = data[food_col].astype(str).str.title()
-        food_options = sorted(data['Food_Title'].dropna().unique().tolist())
+        # Title-cased, sorted unique food names
+        food_options = nm.food_options()
 
         if len(food_options) < 2:
             st.info("Need at least two foods in the dataset to compare.")
@@ -365,15 +340,16 @@ def render_nutrition_page(df):
                 idx_b = remaining.index(default_b) if default_b in remaining else 0
                 food_b = st.selectbox("Food B:", options=remaining, index=idx_b)
 
-            # fetch rows (case-insensitive title match)
-            row_a = data[data['Food_Title'] == food_a]
-            row_b = data[data['Food_Title'] == food_b]
+            # fetch rows (O(1) lookup by title-cased name)
+            try:
+                row_a = pd.Series(nm.row(food_a), index=nm.columns)
+                row_b = pd.Series(nm.row(food_b), index=nm.columns)
+            except KeyError:
+                row_a = row_b = None
 
-            if row_a.empty or row_b.empty:
+            if row_a is None:
                 st.error("Could not find one or both foods in the data after normalization.")
             else:
-                row_a = row_a.iloc[0]
-                row_b = row_b.iloc[0]
 
                 # KEY METRICS to show in table (try to pick sensible columns)
                 # Prefer some common nutrition columns if present
@@ -381,10 +357,10 @@ def render_nutrition_page(df):
                     'Calories', 'Protein', 'Fat', 'Carbohydrates', 'Sugars', 'Fiber',
                     'Sodium', 'Calcium', 'Iron', 'Vitamin_A', 'Vitamin_C', 'Vitamin_D', 'Nutrition_Density'
                 ]
-                metrics = [m for m in preferred_metrics if m in data.columns]
+                metrics = [m for m in preferred_metrics if m in nm.columns]
                 # fallback: pick top 8 numeric cols
                 if not metrics:
-                    metrics = data.select_dtypes(include=[np.number]).columns.tolist()[:8]
+                    metrics = list(nm.columns)[:8]
 
                 # Prepare comparison table
                 comp = pd.DataFrame({
@@ -393,8 +369,6 @@ def render_nutrition_page(df):
                     f'{food_b}': [row_b.get(m, np.nan) for m in metrics]
                 })
                 # Round numeric metrics for display (Nutrition_Density as whole number)
-                for c in [f'{food_a}', f'{food_b}']:
-                    comp[c] = pd.to_numeric(comp[c], errors='coerce')
                 if 'Nutrition_Density' in metrics:
                     comp.loc[comp['Metric'] == 'Nutrition_Density', f'{food_a}'] = comp.loc[comp['Metric'] == 'Nutrition_Density', f'{food_a}'].round(0).astype('Int64')
                     comp.loc[comp['Metric'] == 'Nutrition_Density', f'{food_b}'] = comp.loc[comp['Metric'] == 'Nutrition_Density', f'{food_b}'].round(0).astype('Int64')
@@ -404,7 +378,7 @@ def render_nutrition_page(df):
                 st.dataframe(comp.set_index('Metric'))
 
                 # --- Macronutrient stacked bars (Protein, Carbohydrates, Fat) for each food ---
-                macro_cols = [c for c in ['Protein', 'Carbohydrates', 'Fat'] if c in data.columns]
+                macro_cols = [c for c in ['Protein', 'Carbohydrates', 'Fat'] if c in nm.columns]
                 if macro_cols:
                     st.markdown("<br>", unsafe_allow_html=True)
                     st.markdown("**Macronutrient breakdown (g)**", unsafe_allow_html=True)
@@ -440,7 +414,7 @@ def render_nutrition_page(df):
                 # --- Vitamins radar charts side-by-side ---
                 vit_list = [v for v in ['Vitamin_A','Vitamin_B1','Vitamin_B11','Vitamin_B12','Vitamin_B2',
                                         'Vitamin_B3','Vitamin_B5','Vitamin_B6','Vitamin_C','Vitamin_D','Vitamin_E','Vitamin_K']
-                            if v in data.columns]
+                            if v in nm.columns]
                 if vit_list:
                     st.markdown("<br>", unsafe_allow_html=True)
                     st.markdown("**Vitamin profile (normalized)**", unsafe_allow_html=True)
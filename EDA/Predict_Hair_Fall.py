@@ -7,6 +7,7 @@ import plotly.graph_objects as go
 from matplotlib.colors import LinearSegmentedColormap
 import seaborn as sns
 import numpy as np
+from src.aggregates import column_counts, load_aggregate, load_pair_counts
 
 # Local copies of the style colors used in the main page
 BASE_BG = "#FFFFFF"
@@ -21,6 +22,9 @@ SIDBAR_TEXT = "#a9cac6"
 CARD_COLOR ="#d4e6e4"
 CARD_COLOR2 = "#dcf4e0"
 
+# counts, crosstabs and correlations come from the precomputed aggregates (python -m src.aggregates build)
+DATASET = "predict_hair_fall_cleaned"
+
 def render_predict_page(df_predict_cleaned):
 
     st.markdown(f"""
@@ -61,7 +65,7 @@ def render_predict_page(df_predict_cleaned):
 
         try:
             # prepare counts (treat NaN as 'Missing')
-            counts = df[col_choice].fillna('Missing').astype(str).value_counts().sort_index()
+            counts = column_counts(DATASET, col_choice).sort_index()
             categories = counts.index.tolist()
             values = counts.values
 
@@ -146,13 +150,13 @@ def render_predict_page(df_predict_cleaned):
         st.markdown("<br>", unsafe_allow_html=True)
 
         try:
-            temp = df[[x_var, y_var]].copy()
-            temp = temp.fillna('Missing')
+            # one row per (x, y) combination with its 'count'
+            temp = load_pair_counts(DATASET, x_var, y_var).fillna('Missing')
 
             if x_var == "Hair_Loss" or y_var == "Hair_Loss":
                 temp[x_var] = temp[x_var].astype(str)
                 temp[y_var] = temp[y_var].astype(str)
-                counts = temp.groupby([x_var, y_var]).size().reset_index(name='count')
+                counts = temp.groupby([x_var, y_var], observed=True)['count'].sum().reset_index()
 
                 fig = px.bar(
                     counts,
@@ -171,7 +175,7 @@ def render_predict_page(df_predict_cleaned):
                 is_y_num = pd.api.types.is_numeric_dtype(temp[y_var])
 
                 if not is_x_num and not is_y_num:
-                    counts = temp.groupby([x_var, y_var]).size().reset_index(name='count')
+                    counts = temp
                     fig = px.bar(
                         counts,
                         x=x_var,
@@ -208,18 +212,11 @@ def render_predict_page(df_predict_cleaned):
     st.markdown("<br>", unsafe_allow_html=True)
     requested_cols = ['Hair_Loss', 'Genetic_Encoding', 'Hormonal_Changes', 'Stress_Level', 'Age', 'Smoking', 'Weight_Loss']
 
-    df_corr_src = df_predict_cleaned.copy()
-
-    cols = [c for c in requested_cols if c in df_corr_src.columns]
+    cols = [c for c in requested_cols if c in df_predict_cleaned.columns]
     if not cols:
         st.error("None of the requested columns were found in the dataset: " + ", ".join(requested_cols))
     else:
-        df_work = df_corr_src[cols].copy()
-        for col in df_work.columns:
-            if df_work[col].dtype == 'object' or df_work[col].dtype.name == 'category':
-                df_work[col] = pd.factorize(df_work[col].astype(str))[0]
-
-        corr_matrix = df_work.corr()
+        corr_matrix = load_aggregate(DATASET, "corr")
 
         colors_palette = ["#c1dab8", "#77a48f", "#4e8f73", "#407059", "#255B42", "#0E3A26"]
         cmap = LinearSegmentedColormap.from_list("green_palette", colors_palette, N=256)
@@ -249,7 +246,7 @@ def render_predict_page(df_predict_cleaned):
 
     # ---------------- Genetics stacked bar & insights ----------------
     try:
-        changeWithTarget = df_predict_cleaned.groupby(['Genetic_Encoding', 'Hair_Loss']).size().unstack(fill_value=0)
+        changeWithTarget = load_aggregate(DATASET, "genetics_hair_loss").set_index(['Genetic_Encoding', 'Hair_Loss'])['count'].unstack(fill_value=0)
 
         # Calculate proportions safely (handle if index values missing)
         if 1 in changeWithTarget.index:
@@ -306,8 +303,7 @@ def render_predict_page(df_predict_cleaned):
 
     # ---------------- Nutritional deficiencies vs hair loss (genetic subset) ----------------
     try:
-        df_genetic = df_predict_cleaned[df_predict_cleaned['Genetic_Encoding'] == 1]
-        counts = df_genetic.groupby(['Nutritional_Deficiencies', 'Hair_Loss']).size().reset_index(name='Count')
+        counts = load_aggregate(DATASET, "genetic_nutrition_counts")
         counts['Hair_Loss'] = counts['Hair_Loss'].astype(str)
 
         st.markdown(f"""
@@ -345,14 +341,8 @@ def render_predict_page(df_predict_cleaned):
 
     # ---------------- Alopecia / Age trends ----------------
     try:
-        bins = [18, 25, 40, 51]
         labels = ['18-25', '25-40', '40-51']
-        df_predict_cleaned['Age_Range_New'] = pd.cut(df_predict_cleaned['Age'], bins=bins, labels=labels, right=False)
-
-        alopecia_conditions = ['Alopecia Areata', 'Androgenetic Alopecia']
-        df_alopecia = df_predict_cleaned[df_predict_cleaned['Medical_Conditions'].isin(alopecia_conditions)]
-
-        alopecia_counts = df_alopecia.groupby(['Age_Range_New', 'Medical_Conditions'])['Hair_Loss'].sum().unstack(fill_value=0)
+        alopecia_counts = load_aggregate(DATASET, "alopecia_age_counts").set_index(['Age_Range_New', 'Medical_Conditions'])['Hair_Loss'].unstack(fill_value=0)
 
         alopecia_table_html = alopecia_counts.to_html(classes='table', border=0, index=True)
 
@@ -376,10 +366,7 @@ def render_predict_page(df_predict_cleaned):
         st.markdown("<br>", unsafe_allow_html=True)
 
         # filter and plot for genetic + alopecia
-        df_genetic = df_predict_cleaned[(df_predict_cleaned['Genetic_Encoding'] == 1) & 
-                            (df_predict_cleaned['Medical_Conditions'].isin(alopecia_conditions))]
-
-        counts = df_genetic.groupby(['Medical_Conditions', 'Hair_Loss']).size().reset_index(name='Count')
+        counts = load_aggregate(DATASET, "genetic_alopecia_counts")
         counts['Hair_Loss'] = counts['Hair_Loss'].astype(str)
 
         st.markdown("<br>", unsafe_allow_html=True)
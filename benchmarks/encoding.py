@@ -0,0 +1,52 @@
+# benchmarks/encoding.py
+"""
+Per-column Series.map (the old encode_binary_columns) vs CategoricalEncoder.
+
+    python -m benchmarks.encoding --rows 1000000 10000000
+"""
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from src.cleaning import BINARY_ENCODED_COLUMNS
+from src.encoding import YES_NO_CODES, CategoricalEncoder
+
+def make_frame(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Yes/No columns with ~2% missing, like the raw Predict Hair Fall export."""
+    rng = np.random.default_rng(seed)
+    labels = np.array(['Yes', 'No', None], dtype=object)
+    return pd.DataFrame({source: labels[rng.choice(3, size=rows, p=[0.49, 0.49, 0.02])]
+                         for source in BINARY_ENCODED_COLUMNS.values()})
+
+def per_column_map(df: pd.DataFrame) -> pd.DataFrame:
+    return pd.DataFrame({out: df[source].map(YES_NO_CODES) for out, source in BINARY_ENCODED_COLUMNS.items()})
+
+def best_of(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000, 10_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    encoder = CategoricalEncoder({out: (source, YES_NO_CODES) for out, source in BINARY_ENCODED_COLUMNS.items()})
+    print(f"{'rows':>12} {'map s':>8} {'encoder s':>10} {'speedup':>8} {'map MB':>8} {'encoder MB':>11}")
+    for rows in args.rows:
+        df = make_frame(rows)
+        mapped, encoded = per_column_map(df), encoder.encode(df)
+        assert (mapped.fillna(-1).astype('int8') == encoded.fillna(-1)).all().all()
+        t_map = best_of(lambda: per_column_map(df), args.repeat)
+        t_enc = best_of(lambda: encoder.encode(df), args.repeat)
+        mb_map = mapped.memory_usage(index=False).sum() / 1e6
+        mb_enc = encoded.memory_usage(index=False).sum() / 1e6
+        print(f"{rows:>12,} {t_map:>8.3f} {t_enc:>10.3f} {t_map / t_enc:>7.1f}x {mb_map:>8.1f} {mb_enc:>11.1f}")
+        del df, mapped, encoded
+
+if __name__ == "__main__":
+    main()
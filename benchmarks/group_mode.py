@@ -0,0 +1,70 @@
+# benchmarks/group_mode.py
+"""
+Row-wise mode imputation (the old df.apply(impute_medical_condition_mode, axis=1)) vs impute_group_mode.
+
+    python -m benchmarks.group_mode --rows 1000 10000 100000 1000000 5000000
+"""
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from src.missingness import MEDICAL_MODE_GROUPS, impute_group_mode
+
+# the row-wise version re-filters the whole frame for every missing row, so it is O(n^2);
+# it is only timed up to this many rows
+ROW_WISE_MAX_ROWS = 20_000
+
+CONDITIONS = ['Alopecia Areata', 'Androgenetic Alopecia', 'Dermatitis', 'Dermatosis', 'Eczema',
+              'Psoriasis', 'Ringworm', 'Scalp Infection', 'Seborrheic Dermatitis', 'Thyroid Problems']
+
+def make_frame(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Age/Stress/Medical_Conditions like the raw Predict Hair Fall export, ~10% conditions missing."""
+    rng = np.random.default_rng(seed)
+    conditions = np.array(CONDITIONS, dtype=object)[rng.integers(0, len(CONDITIONS), rows)]
+    conditions[rng.random(rows) < 0.1] = None
+    df = pd.DataFrame({
+        'Age': rng.integers(18, 51, rows),
+        'Stress_Level': np.array(['Low', 'Moderate', 'High'], dtype=object)[rng.integers(0, 3, rows)],
+        'Medical_Conditions': conditions,
+    })
+    df['Age_Range'] = pd.cut(df['Age'], bins=[18, 30, 40, 51], labels=['18-30', '30-40', '40-51'], right=False)
+    return df
+
+def row_wise_mode(row, df):
+    if pd.isna(row['Medical_Conditions']):
+        group = df[(df['Age_Range'] == row['Age_Range']) & (df['Stress_Level'] == row['Stress_Level'])]
+        mode_value = group['Medical_Conditions'].mode()
+        return mode_value[0] if not mode_value.empty else 'Unknown'
+    return row['Medical_Conditions']
+
+def vectorized(df: pd.DataFrame) -> pd.Series:
+    return impute_group_mode(df, 'Medical_Conditions', MEDICAL_MODE_GROUPS)
+
+def best_of(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000, 5_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'rows':>12} {'row-wise s':>11} {'grouped s':>10} {'grouped s/M rows':>17}")
+    for rows in args.rows:
+        df = make_frame(rows)
+        t_rows = "-"
+        if rows <= ROW_WISE_MAX_ROWS:
+            expected = df.apply(lambda row: row_wise_mode(row, df), axis=1)
+            assert (expected == vectorized(df)).all()
+            t_rows = f"{best_of(lambda: df.apply(lambda row: row_wise_mode(row, df), axis=1), 1):.3f}"
+        t_vec = best_of(lambda: vectorized(df), args.repeat)
+        print(f"{rows:>12,} {t_rows:>11} {t_vec:>10.3f} {t_vec / rows * 1e6:>17.3f}")
+        del df
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+# benchmarks/imputers.py
+"""
+Mask-and-recover benchmark of the Medical_Conditions / Nutritional_Deficiencies imputers.
+
+    python -m benchmarks.imputers --rates 0.05 0.1 0.3 --sizes 5000 20000 100000 --plot scaling.png
+
+Known values of Predict Hair Fall Cleaned.csv (those already present in the raw export, so no
+earlier imputation is scored against itself) are masked at each rate; every imputer fills them
+and is scored on how many it recovers, with its wall time and tracemalloc peak memory.
+Synthetic sizes resample the cleaned rows with replacement: use them for time/memory scaling,
+their accuracy is optimistic since a masked row can have an unmasked twin.
+"""
+import argparse
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from src.catalog import load_dataset
+from src.mice import MICE_TARGETS, multiple_imputation
+from src.missingness import MEDICAL_MODE_GROUPS, NUTRITIONAL_MODE_GROUPS, impute_group_mode
+from src.rf_imputer import RF_FEATURES, RandomForestImputer
+
+MODE_GROUPS = {'Medical_Conditions': MEDICAL_MODE_GROUPS, 'Nutritional_Deficiencies': NUTRITIONAL_MODE_GROUPS}
+
+def known_values(cleaned: pd.DataFrame, raw: pd.DataFrame) -> pd.DataFrame:
+    """Cleaned rows with each target set to NaN where the raw export had no value (matched by Id)."""
+    raw = raw.set_index('Id')
+    df = cleaned.copy()
+    for target in MICE_TARGETS:
+        observed = raw[target].reindex(df['Id']).notna().to_numpy()
+        df[target] = df[target].astype(object).where(observed)
+    return df[['Id', *RF_FEATURES, *MICE_TARGETS]].reset_index(drop=True)
+
+def resample(df: pd.DataFrame, rows: int, seed: int = 0) -> pd.DataFrame:
+    """rows rows drawn with replacement from df."""
+    rng = np.random.default_rng(seed)
+    return df.iloc[rng.integers(0, len(df), rows)].reset_index(drop=True)
+
+def mask(df: pd.DataFrame, rate: float, seed: int = 0) -> tuple:
+    """(df with rate of every target's known values set to NaN, {target: masked row positions})."""
+    rng = np.random.default_rng(seed)
+    df = df.copy()
+    masked = {}
+    for target in MICE_TARGETS:
+        known = np.flatnonzero(df[target].notna().to_numpy())
+        masked[target] = np.sort(rng.choice(known, int(round(rate * len(known))), replace=False))
+        df.loc[masked[target], target] = np.nan
+    return df, masked
+
+def mode_imputer(df: pd.DataFrame, args) -> dict:
+    return {t: impute_group_mode(df, t, MODE_GROUPS[t]).to_numpy() for t in MICE_TARGETS}
+
+def rf_imputer(df: pd.DataFrame, args) -> dict:
+    filled = {}
+    for t in MICE_TARGETS:
+        imputer = RandomForestImputer(t, n_estimators=args.trees, n_jobs=args.jobs)
+        filled[t] = imputer.fit_transform(df[[t, *RF_FEATURES]])[t].to_numpy()
+    return filled
+
+def mice_imputer(df: pd.DataFrame, args) -> dict:
+    """Every imputation's draws, as (m x rows) arrays; scored as the mean accuracy of one draw."""
+    deltas = multiple_imputation(df, m=args.mice_m, workers=args.jobs if args.jobs > 0 else None)
+    filled = {}
+    for t in MICE_TARGETS:
+        values = np.tile(df[t].astype(object).to_numpy(), (args.mice_m, 1))
+        cells = deltas[deltas['Column'] == t]
+        values[cells['Imputation'].to_numpy(), cells['Row'].to_numpy()] = cells['Value'].astype(object).to_numpy()
+        filled[t] = values
+    return filled
+
+IMPUTERS = {'mode': mode_imputer, 'rf': rf_imputer, 'mice': mice_imputer}
+
+def measure(fn, df: pd.DataFrame, args) -> tuple:
+    """
+    (result, wall seconds, peak MB). tracemalloc slows allocation-heavy code down several times,
+    so the peak comes from a second, traced run (skipped with --no-memory).
+    """
+    start = time.perf_counter()
+    result = fn(df, args)
+    seconds = time.perf_counter() - start
+    peak = float('nan')
+    if args.memory:
+        tracemalloc.start()
+        fn(df, args)
+        peak = tracemalloc.get_traced_memory()[1] / 1e6
+        tracemalloc.stop()
+    return result, seconds, peak
+
+def accuracy(truth: pd.DataFrame, filled: dict, masked: dict) -> dict:
+    scores = {}
+    for t, rows in masked.items():
+        expected = truth[t].astype(object).to_numpy()[rows]
+        got = np.atleast_2d(filled[t])[:, rows]
+        scores[t] = float((got == expected).mean()) if len(rows) else float('nan')
+    return scores
+
+def run(base: pd.DataFrame, sizes: list, rates: list, imputers: list, args) -> pd.DataFrame:
+    results = []
+    for rows in [len(base), *sizes]:
+        data = base if rows == len(base) else resample(base, rows, args.seed)
+        for rate in rates:
+            masked_df, masked = mask(data, rate, args.seed)
+            for name in imputers:
+                if rows > args.max_rows.get(name, float('inf')):
+                    continue
+                filled, seconds, peak = measure(IMPUTERS[name], masked_df, args)
+                scores = accuracy(data, filled, masked)
+                results.append({'imputer': name, 'rows': rows, 'rate': rate, 'seconds': seconds, 'peak_mb': peak,
+                                **{f"acc_{t}": s for t, s in scores.items()}})
+                r = results[-1]
+                print(f"{name:>6} {rows:>10,} {rate:>5.2f} {seconds:>9.3f} {peak:>9.1f} "
+                      f"{r['acc_Medical_Conditions']:>8.3f} {r['acc_Nutritional_Deficiencies']:>8.3f}", flush=True)
+        del data
+    return pd.DataFrame(results)
+
+def plot_scaling(results: pd.DataFrame, path: str) -> None:
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    rate = results['rate'].min()
+    fig, (ax_time, ax_mem) = plt.subplots(1, 2, figsize=(12, 5))
+    for name, curve in results[results['rate'] == rate].groupby('imputer'):
+        ax_time.plot(curve['rows'], curve['seconds'], marker='o', label=name)
+        ax_mem.plot(curve['rows'], curve['peak_mb'], marker='o', label=name)
+    for ax, label in [(ax_time, 'Wall time (s)'), (ax_mem, 'Peak traced memory (MB)')]:
+        ax.set_xscale('log')
+        ax.set_yscale('log')
+        ax.set_xlabel('Rows')
+        ax.set_ylabel(label)
+        ax.legend()
+    fig.suptitle(f'Imputer scaling (mask rate {rate:g})')
+    fig.tight_layout()
+    fig.savefig(path)
+    plt.close(fig)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rates", type=float, nargs="+", default=[0.1, 0.3])
+    parser.add_argument("--sizes", type=int, nargs="*", default=[5_000, 20_000],
+                        help="synthetic sizes (resampled rows) besides the file itself")
+    parser.add_argument("--imputers", nargs="+", choices=list(IMPUTERS), default=list(IMPUTERS))
+    parser.add_argument("--trees", type=int, default=1000, help="Random Forest n_estimators (the notebook's 1000)")
+    parser.add_argument("--mice-m", type=int, default=5, help="imputations per MICE run")
+    parser.add_argument("--jobs", type=int, default=-1, help="RF n_jobs / MICE workers")
+    parser.add_argument("--rf-max-rows", type=int, default=20_000, help="skip the forest above this many rows")
+    parser.add_argument("--mice-max-rows", type=int, default=100_000, help="skip MICE above this many rows")
+    parser.add_argument("--no-memory", dest="memory", action="store_false", help="skip the traced peak-memory run")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--csv", help="write the results table here")
+    parser.add_argument("--plot", help="save time / memory scaling curves (lowest rate) here")
+    args = parser.parse_args()
+    args.max_rows = {'rf': args.rf_max_rows, 'mice': args.mice_max_rows}
+
+    base = known_values(load_dataset("predict_hair_fall_cleaned"), load_dataset("predict_hair_fall_raw"))
+    print(f"{'imputer':>6} {'rows':>10} {'rate':>5} {'seconds':>9} {'peak MB':>9} {'acc MC':>8} {'acc ND':>8}")
+    results = run(base, args.sizes, args.rates, args.imputers, args)
+    if args.csv:
+        results.to_csv(args.csv, index=False)
+    if args.plot:
+        plot_scaling(results, args.plot)
+
+if __name__ == "__main__":
+    main()
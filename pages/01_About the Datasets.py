@@ -77,17 +77,18 @@ dataset_choice = st.selectbox(
 
 if dataset_choice == "Hair Health Prediction Dataset":
     show_predict_hair_fall(
-        raw_path="Data/Predict Hair Fall.csv",
-        cleaned_path="Data/Predict Hair Fall Cleaned.csv"
+        raw_dataset="predict_hair_fall",
+        cleaned_dataset="predict_hair_fall_cleaned"
     )
 elif dataset_choice == "Luke Hair Loss Dataset":
     show_luke_hair_loss(
-        raw_path="Data/Luke_hair_loss_documentation.csv",
-        cleaned_path="Data/Luke_hair_loss_documentation Cleaned.csv"
+        raw_dataset="luke_hair_loss",
+        cleaned_dataset="luke_hair_loss_cleaned"
     )
 elif dataset_choice == "Nutrition Dataset":
     show_nutrition_dataset(
-        path="Data/Nutrition_Dataset.csv"
+        dataset="nutrition",
+        cleaned_dataset="nutrition_cleaned"
     )
 else:
     st.info("Select a dataset from the dropdown above to begin. (You may also leave it as 'None')")
@@ -4,7 +4,10 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import scipy.stats as stats
 import numpy as np
-from src.missingness import impute_medical_condition_mode
+from src.catalog import dataset_version, load_dataset
+from src.mcar import N_PERMUTATIONS, mcar_tests, with_missingness_factors
+from src.missingness import missingness_patterns
+from src.viz import missing_patterns_plot
 from src.medical_missingness import render_medical_missingness
 from src.nutritional_missingness import render_nutritional_missingness
 
@@ -77,17 +80,10 @@ st.markdown(f"""
 st.markdown("<hr style='border:2px solid #DDD;'>", unsafe_allow_html=True)
 
 # ======== LOAD DATASETS ==========
-@st.cache_data
-def load_csv(path):
-    try:
-        return pd.read_csv(path)
-    except FileNotFoundError:
-        return None
-
-df_predict_raw = load_csv("Data/Predict Hair Fall Raw.csv")
-df_predict_cleaned = load_csv("Data/Predict Hair Fall Cleaned.csv")
-df_luke_raw = load_csv("Data/Luke_hair_loss_documentation Raw.csv")
-df_luke_cleaned = load_csv("Data/Luke_hair_loss_documentation Cleaned.csv")
+df_predict_raw = load_dataset("predict_hair_fall_raw")
+df_predict_cleaned = load_dataset("predict_hair_fall_cleaned")
+df_luke_raw = load_dataset("luke_hair_loss_raw")
+df_luke_cleaned = load_dataset("luke_hair_loss_cleaned")
 
 # ======== DATASET SELECTOR ==========
 dataset_option = st.selectbox(
@@ -119,32 +115,51 @@ else:
             subset_cols = [c for c in subset_cols if c in hair_raw.columns]
 
             if subset_cols:
-                missing_matrix = hair_raw[subset_cols].isna().astype(int).to_numpy()
-                fig, ax = plt.subplots(figsize=(11, 5))
-                im = ax.imshow(missing_matrix.T, interpolation="nearest", aspect="auto", cmap="YlGn")
-                ax.set_xlabel("Index", fontsize=13, color=TEXT)
-                ax.set_ylabel("Features", fontsize=13, color=TEXT)
-                ax.set_yticks(range(len(subset_cols)))
-                ax.set_yticklabels(subset_cols, fontsize=12, color=TEXT)
-                ax.set_title("Missing Values Heatmap", fontsize=16, fontweight="600", color=HEADER_COLOR)
-                ax.grid(True, axis="y", linestyle="--", alpha=0.6)
-                fig.colorbar(im, ax=ax, fraction=0.02, pad=0.02)
+                # one row per distinct missingness pattern (row bitmask), with Age/Stress cohort counts
+                patterns = missingness_patterns(with_missingness_factors(hair_raw), subset_cols,
+                                                by=["Age_Range", "Stress_Level"])
+                fig = missing_patterns_plot(patterns, subset_cols)
+                fig.axes[0].set_ylabel("Pattern", fontsize=13, color=TEXT)
+                fig.axes[0].tick_params(labelsize=12, labelcolor=TEXT)
+                fig.suptitle("Missing Value Patterns", fontsize=16, fontweight="600", color=HEADER_COLOR)
                 st.pyplot(fig)
                 plt.close(fig)
+                st.dataframe(patterns.round({"Share": 4}), use_container_width=True)
 
                 # ---- Missing counts table ----
                 st.markdown(f"<p style='font-size:25px; color:{TEXT}; text-align:center; '><b>Missing Value Counts</b></p>", unsafe_allow_html=True)
                 missing_counts = hair_raw.isna().sum().reset_index().rename(columns={"index":"Feature", 0:"Missing Count"})
                 st.dataframe(missing_counts, use_container_width=True)
                 st.markdown("<br>", unsafe_allow_html=True)
+
+                # ---- Formal MCAR tests ----
+                little, permutations = mcar_tests(df_predict_raw, version=dataset_version("predict_hair_fall_raw"))
+                st.markdown(f"<p style='font-size:25px; color:{TEXT}; text-align:center; '><b>Is the Missingness Completely at Random?</b></p>", unsafe_allow_html=True)
+                st.markdown(
+                    f"""
+                    <p style="font-size:18px; color:{TEXT}; line-height:1.5;">
+                    <b>Little's MCAR test</b> over all columns: d² = <b>{little['statistic']:.1f}</b>
+                    on <b>{little['dof']}</b> degrees of freedom ({little['patterns']} missingness patterns),
+                    p-value <b>{little['p_value']:.3e}</b>. A small p-value rejects MCAR.<br>
+                    Below, every missingness × factor chi-squared test with its asymptotic p-value and a
+                    Monte Carlo p-value from {N_PERMUTATIONS:,} seeded row permutations.
+                    </p>
+                    """,
+                    unsafe_allow_html=True
+                )
+                st.dataframe(permutations.round({'Chi2': 3}), use_container_width=True)
+                st.markdown("<br>", unsafe_allow_html=True)
                 
-            df_raw = pd.read_csv("Data/Predict Hair Fall Raw.csv")
-            df_cleaned = pd.read_csv("Data/Predict Hair Fall Cleaned.csv")
+            df_raw = df_predict_raw
+            df_cleaned = df_predict_cleaned
+            raw_version = dataset_version("predict_hair_fall_raw")
             render_medical_missingness(hair_raw=hair_raw, df_raw=df_raw, df_cleaned=df_cleaned,
-                           HEADER_COLOR=HEADER_COLOR, TEXT=TEXT, SECTION_BG=SECTION_BG, ACCENT=ACCENT)
+                           HEADER_COLOR=HEADER_COLOR, TEXT=TEXT, SECTION_BG=SECTION_BG, ACCENT=ACCENT,
+                           version=raw_version)
             
             render_nutritional_missingness(hair_raw=hair_raw, df_raw=df_raw, df_cleaned=df_cleaned,
-                               HEADER_COLOR=HEADER_COLOR, TEXT=TEXT, SECTION_BG=SECTION_BG, ACCENT=ACCENT)
+                               HEADER_COLOR=HEADER_COLOR, TEXT=TEXT, SECTION_BG=SECTION_BG, ACCENT=ACCENT,
+                               version=raw_version)
 
             
             st.markdown(f"""
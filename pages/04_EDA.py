@@ -1,6 +1,7 @@
 import streamlit as st
 import pandas as pd
 from EDA import render_predict_page, render_luke_page, render_nutrition_page
+from src.catalog import load_dataset
 
 # ======== PAGE CONFIG ==========
 st.set_page_config(page_title="Exploratory Data Analysis", layout="wide")
@@ -42,16 +43,8 @@ st.markdown(f"""
 st.markdown("<hr style='border:2px solid #DDD;'>", unsafe_allow_html=True)
 
 # ======== LOAD DATASETS ==========
-@st.cache_data
-def load_csv(path):
-    try:
-        return pd.read_csv(path)
-    except FileNotFoundError:
-        return None
-
-df_predict_cleaned = load_csv("Data/Predict Hair Fall Cleaned.csv")
-df_luke_cleaned = load_csv("Data/Luke_hair_loss_documentation Cleaned.csv")
-df_nutrition_cleaned = load_csv("Data/Cleaned_Nutrition_Dataset.csv")
+df_predict_cleaned = load_dataset("predict_hair_fall_cleaned")
+df_luke_cleaned = load_dataset("luke_hair_loss_cleaned")
 
 # ======== DATASET SELECTOR ==========
 dataset_option = st.selectbox(
@@ -79,4 +72,4 @@ if dataset_option == "Hair Health Prediction Dataset":
 elif dataset_option == "Luke Hair Loss Dataset":
     render_luke_page(df_luke_cleaned)
 elif dataset_option == "Nutrition Dataset":
-    render_nutrition_page(df_nutrition_cleaned)
\ No newline at end of file
+    render_nutrition_page()
\ No newline at end of file
@@ -0,0 +1,184 @@
+# src/aggregates.py
+import pandas as pd
+from sklearn.preprocessing import LabelEncoder
+from src.artifacts import cached_artifact, prune_all, save_artifact
+from src.catalog import dataset_version, load_dataset
+
+# The joint-count table behind the two-variable explorers only spans columns with at most
+# this many distinct values; anything wider (Id, Date) is close to row-level and is
+# computed live by the pages.
+MAX_PAIR_LEVELS = 60
+
+ALOPECIA_CONDITIONS = ['Alopecia Areata', 'Androgenetic Alopecia']
+PREDICT_CORR_COLUMNS = ['Hair_Loss', 'Genetic_Encoding', 'Hormonal_Changes', 'Stress_Level', 'Age', 'Smoking', 'Weight_Loss']
+LUKE_CORR_COLUMNS = ['Date', 'Hair_Loss_Encoding', 'Stay_Up_Late', 'Pressure_Level_Encoding',
+    'Coffee_Consumed', 'Brain_Working_Duration', 'School_Assesssment',
+    'Stress_Level_Encoding', 'Shampoo_Brand', 'Swimming', 'Hair_Washing',
+    'Hair_Grease', 'Dandruff_Encoding', 'Libido']
+LUKE_HAIR_LOSS_CORR_COLUMNS = ['Hair_Loss_Encoding', 'Stay_Up_Late', 'Pressure_Level_Encoding', 'Coffee_Consumed',
+    'Brain_Working_Duration', 'Stress_Level_Encoding', 'Shampoo_Brand', 'Swimming', 'Hair_Washing',
+    'Hair_Grease', 'Dandruff_Encoding', 'Libido']
+
+# ---------- aggregate builders (row-level frame -> small table) ----------
+
+def value_counts(df: pd.DataFrame) -> pd.DataFrame:
+    """Long table (column, value, is_na, count) of every column's value counts, values as strings."""
+    parts = []
+    for col in df.columns:
+        s = df[col]
+        is_na = s.isna()
+        values = s.astype(object).where(~is_na, 'Missing').astype(str)
+        counts = pd.DataFrame({'value': values, 'is_na': is_na}).value_counts(sort=True).reset_index(name='count')
+        counts.insert(0, 'column', col)
+        parts.append(counts)
+    return pd.concat(parts, ignore_index=True)
+
+def numeric_summary(df: pd.DataFrame) -> pd.DataFrame:
+    """describe() of the numeric columns (count, mean, std, min, quartiles, max)."""
+    return df.select_dtypes(include='number').describe()
+
+def pair_counts(df: pd.DataFrame, x: str, y: str) -> pd.DataFrame:
+    """Row count of every (x, y) combination, NaNs kept, original dtypes kept."""
+    return df.groupby([x, y], observed=True, dropna=False).size().reset_index(name='count')
+
+def narrow_combinations(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Row count of every combination of the columns with at most MAX_PAIR_LEVELS values, in one
+    groupby; any (x, y) pair table of those columns is a marginal of it (see load_pair_counts).
+    """
+    narrow = [c for c in df.columns if df[c].nunique(dropna=False) <= MAX_PAIR_LEVELS]
+    return df.groupby(narrow, observed=True, dropna=False).size().reset_index(name='count')
+
+def _label_encoded(df: pd.DataFrame, cols) -> pd.DataFrame:
+    df_corr = df[[c for c in cols if c in df.columns]].copy()
+    for col in df_corr.select_dtypes(include=['object', 'category', 'string', 'datetime']).columns:
+        df_corr[col] = LabelEncoder().fit_transform(df_corr[col].astype(str))
+    return df_corr
+
+def predict_corr(df: pd.DataFrame) -> pd.DataFrame:
+    df_work = df[[c for c in PREDICT_CORR_COLUMNS if c in df.columns]].copy()
+    for col in df_work.columns:
+        if df_work[col].dtype == 'object' or df_work[col].dtype.name == 'category':
+            df_work[col] = pd.factorize(df_work[col].astype(str))[0]
+    return df_work.corr()
+
+def luke_corr(df: pd.DataFrame) -> pd.DataFrame:
+    return _label_encoded(df, LUKE_CORR_COLUMNS).corr()
+
+def luke_hair_loss_corr(df: pd.DataFrame) -> pd.DataFrame:
+    return _label_encoded(df, LUKE_HAIR_LOSS_CORR_COLUMNS).corr()
+
+def genetics_hair_loss(df: pd.DataFrame) -> pd.DataFrame:
+    return df.groupby(['Genetic_Encoding', 'Hair_Loss']).size().reset_index(name='count')
+
+def genetic_nutrition_counts(df: pd.DataFrame) -> pd.DataFrame:
+    df_genetic = df[df['Genetic_Encoding'] == 1]
+    return df_genetic.groupby(['Nutritional_Deficiencies', 'Hair_Loss'], observed=True).size().reset_index(name='Count')
+
+def alopecia_age_counts(df: pd.DataFrame) -> pd.DataFrame:
+    """Hair-loss cases per (18-25/25-40/40-51 age band, alopecia type)."""
+    df_alopecia = df[df['Medical_Conditions'].isin(ALOPECIA_CONDITIONS)].copy()
+    df_alopecia['Age_Range_New'] = pd.cut(df_alopecia['Age'], bins=[18, 25, 40, 51], labels=['18-25', '25-40', '40-51'], right=False)
+    return df_alopecia.groupby(['Age_Range_New', 'Medical_Conditions'], observed=True)['Hair_Loss'].sum().reset_index()
+
+def genetic_alopecia_counts(df: pd.DataFrame) -> pd.DataFrame:
+    df_genetic = df[(df['Genetic_Encoding'] == 1) & (df['Medical_Conditions'].isin(ALOPECIA_CONDITIONS))]
+    return df_genetic.groupby(['Medical_Conditions', 'Hair_Loss'], observed=True).size().reset_index(name='Count')
+
+# catalog dataset -> aggregate name -> builder
+AGGREGATES = {
+    "predict_hair_fall_cleaned": {
+        "value_counts": value_counts,
+        "numeric_summary": numeric_summary,
+        "corr": predict_corr,
+        "genetics_hair_loss": genetics_hair_loss,
+        "genetic_nutrition_counts": genetic_nutrition_counts,
+        "alopecia_age_counts": alopecia_age_counts,
+        "genetic_alopecia_counts": genetic_alopecia_counts,
+    },
+    "luke_hair_loss_cleaned": {
+        "value_counts": value_counts,
+        "numeric_summary": numeric_summary,
+        "corr": luke_corr,
+        "hair_loss_corr": luke_hair_loss_corr,
+    },
+    "nutrition_cleaned": {
+        "value_counts": value_counts,
+        "numeric_summary": numeric_summary,
+    },
+}
+# datasets whose two-variable explorers read the narrow_combinations table
+PAIR_DATASETS = ["predict_hair_fall_cleaned", "luke_hair_loss_cleaned"]
+
+# ---------- store ----------
+
+def _kind(dataset: str, name: str) -> str:
+    return f"aggregates/{dataset}/{name}"
+
+def load_aggregate(dataset: str, name: str) -> pd.DataFrame:
+    """
+    Aggregate table for the current version of dataset. Reads the stored Parquet;
+    on a miss (never built, or the dataset changed) it is computed once and stored.
+    """
+    build = AGGREGATES[dataset][name]
+    return cached_artifact(_kind(dataset, name), dataset_version(dataset), lambda: build(load_dataset(dataset)))
+
+def load_pair_counts(dataset: str, x: str, y: str) -> pd.DataFrame:
+    """
+    (x, y, count) table, the same as pair_counts(df, x, y). Narrow columns are summed out of
+    the stored narrow_combinations table; anything else is computed live.
+    """
+    combos = cached_artifact(_kind(dataset, "pairs"), dataset_version(dataset),
+                             lambda: narrow_combinations(load_dataset(dataset)))
+    if x != y and x in combos.columns and y in combos.columns:
+        return combos.groupby([x, y], observed=True, dropna=False)['count'].sum().reset_index()
+    return pair_counts(load_dataset(dataset), x, y)
+
+def column_counts(dataset: str, column: str, dropna: bool = False) -> pd.Series:
+    """
+    value (as str) -> count for one column, most frequent first.
+    dropna=False matches df[column].fillna('Missing').astype(str).value_counts(),
+    dropna=True matches df[column].dropna().astype(str).value_counts().
+    """
+    vc = load_aggregate(dataset, "value_counts")
+    vc = vc[vc['column'] == column]
+    if dropna:
+        vc = vc[~vc['is_na']]
+    return vc.groupby('value', sort=False)['count'].sum().rename('count').rename_axis(None)
+
+def build_dataset(dataset: str) -> list:
+    """Compute and store every aggregate (and the narrow_combinations table) for one dataset."""
+    df = load_dataset(dataset)
+    if df is None:
+        return []
+    version = dataset_version(dataset)
+    written = []
+    for name, build in AGGREGATES.get(dataset, {}).items():
+        written.append(save_artifact(_kind(dataset, name), version, build(df)))
+    if dataset in PAIR_DATASETS:
+        written.append(save_artifact(_kind(dataset, "pairs"), version, narrow_combinations(df)))
+    return written
+
+def build_all() -> dict:
+    """Build every dataset's aggregates plus the story page summaries."""
+    from src.story import story_summaries
+    written = {dataset: len(build_dataset(dataset)) for dataset in AGGREGATES}
+    story_summaries()
+    return written
+
+if __name__ == "__main__":
+    import argparse
+    import time
+    parser = argparse.ArgumentParser(description="Precompute the dashboard aggregates for the current datasets.")
+    parser.add_argument("command", choices=["build", "prune"],
+                        help="build: precompute the aggregates; prune: trim every artifact kind to its latest versions")
+    parser.add_argument("--dataset", choices=sorted(AGGREGATES), help="only this dataset")
+    args = parser.parse_args()
+    start = time.perf_counter()
+    if args.command == "prune":
+        print(f"removed {len(prune_all())} stale artifact files")
+    elif args.dataset:
+        print({args.dataset: len(build_dataset(args.dataset))})
+    else:
+        print(build_all())
+    print(f"done in {time.perf_counter() - start:.1f}s")
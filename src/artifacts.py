@@ -0,0 +1,121 @@
+# src/artifacts.py
+import hashlib
+import os
+import pickle
+from pathlib import Path
+import pandas as pd
+from src.data_io import CACHE_DIRNAME, DATA_DIR
+
+ARTIFACT_DIR = DATA_DIR / CACHE_DIRNAME / "artifacts"
+# dataset versions kept per (kind, params) when a new artifact is stored; older ones are deleted
+KEEP_LATEST = 2
+
+def artifact_key(versions, params=None) -> str:
+    """
+    File-name key for one or more DatasetVersions plus optional build parameters.
+    Anything derived from the data (figures, imputations, test results, models) keys on this.
+    """
+    if not isinstance(versions, (list, tuple)):
+        versions = [versions]
+    key = "+".join(v.key for v in versions)
+    if params is not None:
+        key += "-" + hashlib.blake2b(repr(params).encode(), digest_size=6).hexdigest()
+    return key
+
+def artifact_path(kind: str, versions, params=None, suffix: str = ".pkl") -> Path:
+    return ARTIFACT_DIR / kind / f"{artifact_key(versions, params)}{suffix}"
+
+def _read_artifact(path: Path):
+    if path.suffix == ".parquet":
+        return pd.read_parquet(path)
+    with open(path, "rb") as fh:
+        return pickle.load(fh)
+
+def load_artifact(kind: str, versions, params=None):
+    """Stored artifact for these versions/params, or None if it was never built."""
+    for suffix in (".parquet", ".pkl"):
+        path = artifact_path(kind, versions, params, suffix)
+        if path.exists():
+            return _read_artifact(path)
+    return None
+
+def latest_artifact(kind: str, params):
+    """
+    Most recently stored artifact of kind built with params, whatever dataset version it was
+    built for (None if there is none). Used to warm-start from an older version's result.
+    """
+    key = artifact_key((), params)  # "-<params hash>"
+    paths = [p for p in (ARTIFACT_DIR / kind).glob(f"*{key}.*") if p.suffix in (".parquet", ".pkl")]
+    if not paths:
+        return None
+    return _read_artifact(max(paths, key=lambda p: p.stat().st_mtime_ns))
+
+def _params_tag(stem: str) -> str:
+    """The "-<params hash>" part of an artifact file stem ("" when it was stored without params)."""
+    # every version key holds exactly one "-", so a further one starts the params hash
+    parts = stem.split("-")
+    return parts[-1] if len(parts) - 1 > stem.count("+") + 1 else ""
+
+def prune(kind: str, keep_latest: int = KEEP_LATEST) -> list:
+    """
+    Delete all but the keep_latest most recently stored versions of each params set of kind.
+    Files sharing a stem (a download's .csv / .csv.gz / .parquet) count as one version;
+    in-flight .tmp files are left alone. Returns the deleted paths.
+    """
+    folder = ARTIFACT_DIR / kind
+    if not folder.is_dir():
+        return []
+    groups = {}  # params tag -> stem -> files
+    for path in folder.iterdir():
+        if path.is_file() and path.suffix != ".tmp":
+            stem = path.name.split(".", 1)[0]
+            groups.setdefault(_params_tag(stem), {}).setdefault(stem, []).append(path)
+    removed = []
+    for stems in groups.values():
+        ranked = sorted(stems.values(), key=lambda paths: max(p.stat().st_mtime_ns for p in paths), reverse=True)
+        for paths in ranked[keep_latest:]:
+            for path in paths:
+                path.unlink(missing_ok=True)
+                removed.append(path)
+    return removed
+
+def prune_all(keep_latest: int = KEEP_LATEST) -> list:
+    """prune() every kind folder under ARTIFACT_DIR."""
+    if not ARTIFACT_DIR.is_dir():
+        return []
+    folders = [p for p in ARTIFACT_DIR.rglob("*") if p.is_dir()]
+    return [path for folder in folders for path in prune(folder.relative_to(ARTIFACT_DIR).as_posix(), keep_latest)]
+
+def save_artifact(kind: str, versions, obj, params=None, keep_latest: int = KEEP_LATEST) -> Path:
+    """
+    Store obj (DataFrames as Parquet, anything else pickled); write-then-rename.
+    Older versions of the same kind and params beyond keep_latest are pruned afterwards.
+    """
+    suffix = ".parquet" if isinstance(obj, pd.DataFrame) else ".pkl"
+    path = artifact_path(kind, versions, params, suffix)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    if suffix == ".parquet":
+        obj.to_parquet(tmp, index=True)
+    else:
+        with open(tmp, "wb") as fh:
+            pickle.dump(obj, fh, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+    prune(kind, keep_latest)
+    return path
+
+def cached_artifact(kind: str, versions, build, params=None):
+    """
+    Return the stored artifact for (kind, versions, params), building and storing it on a miss.
+    Artifacts survive restarts and are shared between processes; a new dataset version
+    simply misses and rebuilds. A read-only cache folder degrades to building every time.
+    """
+    obj = load_artifact(kind, versions, params)
+    if obj is not None:
+        return obj
+    obj = build()
+    try:
+        save_artifact(kind, versions, obj, params)
+    except (OSError, pickle.PicklingError):
+        pass
+    return obj
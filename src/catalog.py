@@ -0,0 +1,148 @@
+# src/catalog.py
+import os
+import threading
+from collections import OrderedDict
+import pandas as pd
+from src.data_io import DATA_DIR, file_version, read_csv_cached
+from src.luke_cleaning import RAW_EXPORT as LUKE_RAW_EXPORT, load_luke_cleaned
+from src.schemas import LUKE_CLEANED_SCHEMA, SCHEMAS
+
+# dataset name -> CSV file in Data/
+DATASETS = {
+    "predict_hair_fall": "Predict Hair Fall.csv",
+    "predict_hair_fall_raw": "Predict Hair Fall Raw.csv",
+    "predict_hair_fall_cleaned": "Predict Hair Fall Cleaned.csv",
+    "luke_hair_loss": "Luke_hair_loss_documentation.csv",
+    "luke_hair_loss_raw": "Luke_hair_loss_documentation Raw.csv",
+    "luke_hair_loss_cleaned": "Luke_hair_loss_documentation Cleaned.csv",
+    "nutrition": "Nutrition_Dataset.csv",
+    "nutrition_cleaned": "Cleaned_Nutrition_Dataset.csv",
+}
+
+DEFAULT_MAX_BYTES = int(os.environ.get("HAIRFALL_CATALOG_MAX_MB", "1024")) * 1024 ** 2
+
+class DatasetCatalog:
+    """
+    Process-wide registry of datasets (name -> loader).
+    Loaders for the cleaned datasets apply their compact schema (src/schemas.py).
+    Every page and session gets the same in-memory frame; frames are evicted
+    least-recently-used once the total footprint exceeds max_bytes.
+    Datasets registered with a version function are reloaded when their version changes.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._loaders = {}
+        self._versions = {}
+        self._frames = OrderedDict()  # name -> (DataFrame, nbytes, version)
+        self._stats = {}
+        self._lock = threading.RLock()
+
+    def register(self, name: str, loader, version=None) -> None:
+        """
+        Register (or replace) the zero-argument loader for a dataset name.
+        version is an optional zero-argument function returning the current DatasetVersion.
+        """
+        with self._lock:
+            self._loaders[name] = loader
+            self._versions[name] = version
+            self.invalidate(name)
+
+    def names(self) -> list:
+        return list(self._loaders)
+
+    def version(self, name: str):
+        """Current DatasetVersion of `name`, or None if it was registered without one."""
+        if name not in self._loaders:
+            raise KeyError(f"Unknown dataset: {name!r}")
+        version = self._versions[name]
+        return version() if version is not None else None
+
+    def get(self, name: str) -> pd.DataFrame:
+        """
+        Return the shared frame for `name`, loading it on first use.
+        The result is a shallow copy: adding columns is fine, but edit values on a .copy().
+        Raises KeyError for unknown names and FileNotFoundError for missing files.
+        """
+        with self._lock:
+            if name not in self._loaders:
+                raise KeyError(f"Unknown dataset: {name!r}")
+            stats = self._stats.setdefault(name, {"hits": 0, "loads": 0})
+            version = self.version(name)
+            if name in self._frames and self._frames[name][2] == version:
+                self._frames.move_to_end(name)
+                stats["hits"] += 1
+                return self._frames[name][0].copy(deep=False)
+
+            df = self._loaders[name]()
+            nbytes = int(df.memory_usage(deep=True).sum())
+            self._frames.pop(name, None)
+            self._frames[name] = (df, nbytes, version)
+            stats["loads"] += 1
+            self._evict(keep=name)
+            return df.copy(deep=False)
+
+    def _evict(self, keep: str) -> None:
+        while self.total_bytes() > self.max_bytes and len(self._frames) > 1:
+            oldest = next(iter(self._frames))
+            if oldest == keep:
+                self._frames.move_to_end(keep)
+                continue
+            del self._frames[oldest]
+
+    def invalidate(self, name: str = None) -> None:
+        """Drop one cached frame, or all of them when name is None."""
+        with self._lock:
+            if name is None:
+                self._frames.clear()
+            else:
+                self._frames.pop(name, None)
+
+    def total_bytes(self) -> int:
+        return sum(nbytes for _, nbytes, _ in self._frames.values())
+
+    def memory_report(self) -> pd.DataFrame:
+        """Per-dataset resident bytes and hit/load counters, most recently used last."""
+        with self._lock:
+            rows = [{"Dataset": name,
+                     "Resident": name in self._frames,
+                     "Bytes": self._frames[name][1] if name in self._frames else 0,
+                     "Version": self._frames[name][2].key if name in self._frames and self._frames[name][2] else "",
+                     **self._stats.get(name, {"hits": 0, "loads": 0})}
+                    for name in self._loaders]
+        return pd.DataFrame(rows)
+
+def _csv_loader(filename: str, schema: dict = None):
+    return lambda: read_csv_cached(DATA_DIR / filename, schema=schema)
+
+def _csv_version(filename: str, schema: dict = None):
+    return lambda: file_version(DATA_DIR / filename, schema=schema)
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+def get_catalog() -> DatasetCatalog:
+    """Return the process-wide catalog, registering the Data/ CSVs on first use."""
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            _catalog = DatasetCatalog()
+            for name, filename in DATASETS.items():
+                schema = SCHEMAS.get(name)
+                _catalog.register(name, _csv_loader(filename, schema), _csv_version(filename, schema))
+            # the cleaned Luke log is built from the raw export by src.luke_cleaning (typed Parquet),
+            # so it follows that export instead of the published CSV
+            _catalog.register("luke_hair_loss_cleaned", load_luke_cleaned,
+                              lambda: file_version(LUKE_RAW_EXPORT, schema=LUKE_CLEANED_SCHEMA))
+        return _catalog
+
+def load_dataset(name: str):
+    """Shared frame for a catalog name, or None if its file is missing (page-friendly)."""
+    try:
+        return get_catalog().get(name)
+    except FileNotFoundError:
+        return None
+
+def dataset_version(name: str):
+    """DatasetVersion of a catalog dataset; key figure/model/result caches on its .key."""
+    return get_catalog().version(name)
@@ -1,59 +1,279 @@
+import inspect
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
 import pandas as pd
 import numpy as np
+from src.encoding import YES_NO_CODES, CategoricalEncoder
+from src.validation import PREDICT_COLUMNS, ValidationReport, structure_ok, validate_chunk
 
-def standardize_column_names(df: pd.DataFrame) -> pd.DataFrame:
+def standardize_column_names(df: pd.DataFrame, copy: bool = True) -> pd.DataFrame:
     """
     Rename columns to standardized names and replace spaces with underscores.
-    Returns modified copy.
-    """
-    columns = ['Id', 'Genetics', 'Hormonal_Changes', 'Medical_Conditions',
-               'Medications_and_Treatments', 'Nutritional_Deficiencies', 'Stress',
-               'Age', 'Poor_Hair_Care_Habits', 'Environmental_Factors', 'Smoking',
-               'Weight_Loss', 'Hair_Loss']
-    df = df.copy()
-    df.columns = columns  # be cautious: ensure same number of columns
+    Returns modified copy (or df itself with copy=False).
+    """
+    columns = list(PREDICT_COLUMNS)
+    if len(df.columns) != len(columns):
+        raise ValueError(f"Expected {len(columns)} columns (Id ... Hair Loss), got {len(df.columns)}: {list(df.columns)}")
+    if copy:
+        df = df.copy()
+    df.columns = columns
     df.columns = [col.replace(' ', '_') for col in df.columns]
     return df
 
-def replace_no_data_with_na(df: pd.DataFrame, values=('No Data', 'No data')) -> pd.DataFrame:
+def replace_no_data_with_na(df: pd.DataFrame, values=('No Data', 'No data'), copy: bool = True) -> pd.DataFrame:
     """Replace strings representing missing values with pd.NA and return copy."""
-    df = df.copy()
-    df.replace(list(values), pd.NA, inplace=True)
+    if copy:
+        df = df.copy()
+    # only the text columns can hold these markers; columns are reassigned, never edited in place
+    text = df.select_dtypes(include=['object', 'string'])
+    for c in text.columns[text.isin(values).any()]:
+        df[c] = df[c].replace(list(values), pd.NA)
     return df
 
-def encode_binary_columns(df: pd.DataFrame, mapping=None) -> pd.DataFrame:
+# encoded column -> source Yes/No column
+BINARY_ENCODED_COLUMNS = {
+    'Genetic_Encoding': 'Genetics',
+    'Hormonal_Encoding': 'Hormonal_Changes',
+    'Poor_Hair_Care_Encoding': 'Poor_Hair_Care_Habits',
+    'Environmental_Encoding': 'Environmental_Factors',
+    'Smoking_Encoding': 'Smoking',
+    'Weight_Loss_Encoding': 'Weight_Loss',
+}
+
+def encode_binary_columns(df: pd.DataFrame, mapping=None, copy: bool = True) -> pd.DataFrame:
     """
     Create encoded columns for binary Yes/No columns:
     - Genetics -> Genetic_Encoding
     - Hormonal_Changes -> Hormonal_Encoding ...
+    All six are encoded in one pass into nullable Int8 (see src/encoding.py).
     Returns df copy with new columns.
     """
-    df = df.copy()
     if mapping is None:
-        mapping = {'Yes': 1, 'No': 0}
-    df['Genetic_Encoding'] = df['Genetics'].map(mapping)
-    df['Hormonal_Encoding'] = df['Hormonal_Changes'].map(mapping)
-    df['Poor_Hair_Care_Encoding'] = df['Poor_Hair_Care_Habits'].map(mapping)
-    df['Environmental_Encoding'] = df['Environmental_Factors'].map(mapping)
-    df['Smoking_Encoding'] = df['Smoking'].map(mapping)
-    df['Weight_Loss_Encoding'] = df['Weight_Loss'].map(mapping)
-    return df
+        mapping = YES_NO_CODES
+    encoder = CategoricalEncoder({out: (source, mapping) for out, source in BINARY_ENCODED_COLUMNS.items()})
+    return encoder.transform(df, copy=copy)
 
-def clean_trailing_spaces(df: pd.DataFrame, cols=('Medical_Conditions','Medications_and_Treatments','Nutritional_Deficiencies')) -> pd.DataFrame:
+def clean_trailing_spaces(df: pd.DataFrame, cols=('Medical_Conditions','Medications_and_Treatments','Nutritional_Deficiencies'),
+                          copy: bool = True) -> pd.DataFrame:
     """Strip whitespace for listed columns."""
-    df = df.copy()
+    if copy:
+        df = df.copy()
     for c in cols:
         df[c] = df[c].astype("string").str.strip()
     return df
 
-def map_stress_levels(df: pd.DataFrame) -> pd.DataFrame:
+def map_stress_levels(df: pd.DataFrame, copy: bool = True) -> pd.DataFrame:
     """Map 'Low','Moderate','High' to 0,1,2 as Stress_Level. Returns copy."""
-    df = df.copy()
+    if copy:
+        df = df.copy()
     df['Stress_Level'] = df['Stress'].map({'Low': 0, 'Moderate': 1, 'High': 2})
     return df
 
-def create_age_ranges(df: pd.DataFrame, bins=(18,30,40,51), labels=('18-30','30-40','40-51')) -> pd.DataFrame:
+def create_age_ranges(df: pd.DataFrame, bins=(18,30,40,51), labels=('18-30','30-40','40-51'), copy: bool = True) -> pd.DataFrame:
     """Create Age_Range column and return copy."""
-    df = df.copy()
+    if copy:
+        df = df.copy()
     df['Age_Range'] = pd.cut(df['Age'], bins=bins, labels=labels, right=False)
     return df
+
+# Yes/No feature columns the notebook label-encodes in place before writing the cleaned CSV
+LABEL_ENCODED_FEATURES = ('Hormonal_Changes', 'Environmental_Factors', 'Smoking', 'Weight_Loss')
+
+def label_encode_features(df: pd.DataFrame, cols=LABEL_ENCODED_FEATURES, copy: bool = True) -> pd.DataFrame:
+    """Replace the Yes/No feature columns by 0/1 and Age_Range by its bin number, as in the cleaned CSV."""
+    if copy:
+        df = df.copy()
+    df = CategoricalEncoder({c: (c, YES_NO_CODES) for c in cols}).transform(df, copy=False)
+    if isinstance(df['Age_Range'].dtype, pd.CategoricalDtype):
+        df['Age_Range'] = df['Age_Range'].cat.codes
+    return df
+
+def add_missing_flags(df: pd.DataFrame, cols=('Nutritional_Deficiencies',), copy: bool = True) -> pd.DataFrame:
+    """Add <col>_missing (0/1) for each column; run before imputation."""
+    if copy:
+        df = df.copy()
+    for c in cols:
+        df[f"{c}_missing"] = df[c].isna().astype('int8')
+    return df
+
+# column order of Predict Hair Fall Cleaned.csv
+PREDICT_CLEANED_COLUMNS = [
+    'Id', 'Genetics', 'Hormonal_Changes', 'Medical_Conditions', 'Medications_and_Treatments',
+    'Nutritional_Deficiencies', 'Stress', 'Age', 'Poor_Hair_Care_Habits', 'Environmental_Factors',
+    'Smoking', 'Weight_Loss', 'Hair_Loss', 'Genetic_Encoding', 'Hormonal_Encoding',
+    'Poor_Hair_Care_Encoding', 'Environmental_Encoding', 'Smoking_Encoding', 'Weight_Loss_Encoding',
+    'Stress_Level', 'Age_Range', 'Nutritional_Deficiencies_missing',
+]
+
+PREDICT_CLEANING_STEPS = (
+    standardize_column_names,
+    replace_no_data_with_na,
+    encode_binary_columns,
+    clean_trailing_spaces,
+    map_stress_levels,
+    create_age_ranges,
+)
+
+# mapped columns come out int or float depending on whether a chunk has gaps; pin them
+STREAMING_DTYPES = {
+    'Genetic_Encoding': 'Int8', 'Hormonal_Encoding': 'Int8', 'Poor_Hair_Care_Encoding': 'Int8',
+    'Environmental_Encoding': 'Int8', 'Smoking_Encoding': 'Int8', 'Weight_Loss_Encoding': 'Int8',
+    'Stress_Level': 'Int8',
+}
+
+class CleaningPipeline:
+    """
+    Ordered cleaning steps run against one working frame instead of a copy per step.
+    Steps that take a copy= keyword (all of the above) are called with copy=False and
+    only ever assign whole columns, so the input frame is never modified: the working
+    frame starts as a shallow copy and just the columns a step touches get new memory.
+    Other callables are run as-is (they copy, and are marked so in the stats).
+    After run(), stats holds one row per step: seconds, rows, columns and frame bytes.
+    """
+
+    def __init__(self, steps=PREDICT_CLEANING_STEPS, profile_memory: bool = True):
+        self.steps = list(steps)
+        self.profile_memory = profile_memory
+        self.stats = None
+
+    def then(self, step) -> "CleaningPipeline":
+        """New pipeline with step appended."""
+        return CleaningPipeline(self.steps + [step], self.profile_memory)
+
+    @staticmethod
+    def _takes_copy(step) -> bool:
+        try:
+            return "copy" in inspect.signature(step).parameters
+        except (TypeError, ValueError):
+            return False
+
+    def run(self, df: pd.DataFrame, inplace: bool = False) -> pd.DataFrame:
+        """
+        Clean df and return the result. inplace=True works on df itself (for frames the
+        caller owns, e.g. CSV chunks); otherwise df's own columns are left untouched.
+        """
+        work = df if inplace else df.copy(deep=False)
+        rows = []
+        for step in self.steps:
+            start = time.perf_counter()
+            takes_copy = self._takes_copy(step)
+            work = step(work, copy=False) if takes_copy else step(work)
+            rows.append({
+                "Step": getattr(step, "__name__", repr(step)),
+                "Seconds": time.perf_counter() - start,
+                "Copied": not takes_copy,
+                "Rows": len(work),
+                "Columns": work.shape[1],
+                "Bytes": int(work.memory_usage(deep=True).sum()) if self.profile_memory else None,
+            })
+        self.stats = pd.DataFrame(rows)
+        return work
+
+def clean_predict_hair_fall(df: pd.DataFrame, steps=PREDICT_CLEANING_STEPS) -> pd.DataFrame:
+    """Run the cleaning steps above in order and return the cleaned frame (df is not modified)."""
+    return CleaningPipeline(steps, profile_memory=False).run(df)
+
+def _clean_chunk_csv(chunk: pd.DataFrame, steps, header: bool, rules=None, offset: int = 0,
+                     columns=None) -> tuple:
+    """
+    Validate one raw chunk, then clean it and render it as CSV text; runs in pool workers too.
+    Returns (text, rows, violations), violations being validate_chunk's report (None without rules).
+    A chunk without the expected columns is only reported: ("", 0, violations).
+    """
+    violations = validate_chunk(chunk, rules, offset, columns) if rules else None
+    if rules and not structure_ok(chunk, columns):
+        return "", 0, violations
+    cleaned = CleaningPipeline(steps, profile_memory=False).run(chunk, inplace=True)
+    cleaned = cleaned.astype({c: t for c, t in STREAMING_DTYPES.items() if c in cleaned.columns})
+    return cleaned.to_csv(header=header, index=False), len(cleaned), violations
+
+@contextmanager
+def _atomic_text(dst):
+    """Open a temp file next to dst for writing; it replaces dst only if the block succeeds."""
+    dst = Path(dst)
+    tmp = dst.with_name(f"{dst.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, "w", newline="") as fh:
+            yield fh
+        os.replace(tmp, dst)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+def clean_csv_streaming(src, dst, chunksize: int = 100_000, steps=PREDICT_CLEANING_STEPS,
+                        report: ValidationReport = None) -> int:
+    """
+    Clean a raw Predict Hair Fall CSV chunk by chunk and append each chunk to dst.
+    Only one chunk is in memory at a time, so peak memory depends on chunksize, not file size.
+    Every step is row-local, so the output matches clean_predict_hair_fall on the whole file.
+    With a ValidationReport, every raw chunk is first checked against report.columns and
+    report.rules; chunks with the wrong columns are recorded there and left out instead of
+    aborting the load. dst is written to a temp file and renamed at the end. Returns the number of rows written.
+    """
+    rules, columns = (report.rules, report.columns) if report is not None else (None, None)
+    rows = read = 0
+    with _atomic_text(dst) as fh:
+        for chunk in pd.read_csv(src, chunksize=chunksize):
+            text, n, violations = _clean_chunk_csv(chunk, steps, rows == 0, rules, read, columns)
+            fh.write(text)
+            rows += n
+            read += len(chunk)
+            if report is not None:
+                report.add(violations, len(chunk))
+    return rows
+
+def clean_csv_parallel(src, dst, chunksize: int = 100_000, workers: int = None,
+                       steps=PREDICT_CLEANING_STEPS, report: ValidationReport = None) -> int:
+    """
+    clean_csv_streaming with the chunks cleaned (and rendered to CSV) in a process pool.
+    Chunks are written in file order as they complete, so dst is byte-identical to the
+    serial output. At most 2 * workers chunks are in flight, which bounds memory the same
+    way chunksize does for the serial path. steps must be picklable (module-level functions).
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        return clean_csv_streaming(src, dst, chunksize, steps, report)
+    rules, columns = (report.rules, report.columns) if report is not None else (None, None)
+    rows = read = 0
+    with _atomic_text(dst) as fh, ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+
+        def write_next():
+            nonlocal rows
+            chunk_rows, future = pending.popleft()
+            text, n, violations = future.result()
+            fh.write(text)
+            rows += n
+            if report is not None:
+                report.add(violations, chunk_rows)
+
+        for chunk in pd.read_csv(src, chunksize=chunksize):
+            pending.append((len(chunk), pool.submit(_clean_chunk_csv, chunk, steps, read == 0, rules, read, columns)))
+            read += len(chunk)
+            while len(pending) >= 2 * workers or (pending and pending[0][1].done()):
+                write_next()
+        while pending:
+            write_next()
+    return rows
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Stream-clean a raw Predict Hair Fall export.")
+    parser.add_argument("src")
+    parser.add_argument("dst")
+    parser.add_argument("--chunksize", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=1, help="worker processes (0 = one per core)")
+    parser.add_argument("--no-validate", action="store_true", help="skip the PREDICT_RULES checks")
+    args = parser.parse_args()
+    report = None if args.no_validate else ValidationReport()
+    if args.workers == 1:
+        rows = clean_csv_streaming(args.src, args.dst, args.chunksize, report=report)
+    else:
+        rows = clean_csv_parallel(args.src, args.dst, args.chunksize, args.workers or None, report=report)
+    print(f"{rows} rows -> {args.dst}")
+    if report is not None and not report.ok:
+        print(report.frame().to_string(index=False))
@@ -1,15 +1,144 @@
 from pathlib import Path
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from src.schemas import apply_schema, schema_fingerprint
 
 DATA_DIR = Path(__file__).resolve().parents[1] / "Data"
+CACHE_DIRNAME = ".cache"
+SOURCE_METADATA_KEY = b"hairfall.source"
 
-def load_csv(filename: str) -> pd.DataFrame:
+def file_content_hash(path, block_size: int = 1 << 20) -> str:
+    """Return the blake2b digest of a file, read in fixed-size blocks."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def columnar_cache_path(path) -> Path:
+    """Parquet copy of a CSV, kept in a .cache/ folder next to the CSV."""
+    path = Path(path)
+    return path.parent / CACHE_DIRNAME / f"{path.stem}.parquet"
+
+def _options_key(read_kwargs: dict, schema=None) -> str:
+    # read_csv options and the schema change the loaded frame, so they are part of the cache key
+    key = repr(sorted(read_kwargs.items())) + (schema_fingerprint(schema) if schema else "")
+    return hashlib.blake2b(key.encode(), digest_size=8).hexdigest()
+
+def _read_source_metadata(cache_path: Path):
+    try:
+        metadata = pq.read_schema(cache_path).metadata or {}
+    except (OSError, pa.ArrowInvalid):
+        return None
+    if SOURCE_METADATA_KEY not in metadata:
+        return None
+    return json.loads(metadata[SOURCE_METADATA_KEY])
+
+def _write_columnar(df: pd.DataFrame, cache_path: Path, source: dict) -> None:
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[SOURCE_METADATA_KEY] = json.dumps(source).encode()
+    table = table.replace_schema_metadata(metadata)
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    # write-then-rename so concurrent readers never see a half-written file
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    pq.write_table(table, tmp_path)
+    os.replace(tmp_path, cache_path)
+
+@dataclass(frozen=True)
+class DatasetVersion:
+    """
+    Identity of a loaded dataset: hash of the source file plus hash of the schema applied to it.
+    Two processes that see the same file and schema get equal versions, so key caches on .key.
+    """
+    source: str
+    content_hash: str
+    schema_hash: str
+
+    @property
+    def key(self) -> str:
+        return f"{self.content_hash[:16]}-{self.schema_hash}"
+
+    def __str__(self) -> str:
+        return f"{self.source}@{self.key}"
+
+_versions = {}  # (path, size, mtime_ns, schema_hash) -> DatasetVersion
+_versions_lock = threading.Lock()
+
+def file_version(path, schema: dict = None) -> DatasetVersion:
+    """
+    DatasetVersion of a file (with an optional schema). The content hash is only recomputed
+    when the file's size/mtime change, and is taken from the columnar cache stamp when that is current.
+    """
+    path = Path(path)
+    stat = path.stat()
+    schema_hash = schema_fingerprint(schema) if schema else "raw"
+    memo_key = (str(path), stat.st_size, stat.st_mtime_ns, schema_hash)
+    with _versions_lock:
+        if memo_key in _versions:
+            return _versions[memo_key]
+    content_hash = None
+    cache_path = columnar_cache_path(path)
+    cached = _read_source_metadata(cache_path) if cache_path.exists() else None
+    if cached and cached["size"] == stat.st_size and cached["mtime_ns"] == stat.st_mtime_ns:
+        content_hash = cached["sha"]
+    version = DatasetVersion(path.name, content_hash or file_content_hash(path), schema_hash)
+    with _versions_lock:
+        _versions[memo_key] = version
+    return version
+
+def read_csv_cached(path, schema: dict = None, **read_kwargs) -> pd.DataFrame:
+    """
+    Read a CSV through its columnar (Parquet) copy, applying schema (see src/schemas.py) if given.
+    The copy is reused while the CSV size/mtime match; if only the mtime moved,
+    the content hash decides. Otherwise the CSV is re-parsed and the copy rewritten.
+    Categorical and datetime dtypes survive the round trip.
+    """
+    path = Path(path)
+    stat = path.stat()  # raises FileNotFoundError for a missing CSV, like read_csv
+    cache_path = columnar_cache_path(path)
+    options = _options_key(read_kwargs, schema)
+    cached = _read_source_metadata(cache_path) if cache_path.exists() else None
+
+    if cached is not None and cached.get("options") == options:
+        if cached["size"] == stat.st_size and cached["mtime_ns"] == stat.st_mtime_ns:
+            return pq.read_table(cache_path).to_pandas()
+        if cached["size"] == stat.st_size and cached["sha"] == file_version(path).content_hash:
+            df = pq.read_table(cache_path).to_pandas()
+            cached["mtime_ns"] = stat.st_mtime_ns
+            try:
+                _write_columnar(df, cache_path, cached)  # re-stamp so the next load skips hashing
+            except OSError:
+                pass
+            return df
+
+    df = pd.read_csv(path, **read_kwargs)
+    if schema:
+        df = apply_schema(df, schema)
+    source = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+              "sha": file_version(path).content_hash, "options": options}
+    try:
+        _write_columnar(df, cache_path, source)
+    except (OSError, pa.ArrowException):
+        pass  # read-only Data/ or unsupported dtypes: fall back to plain CSV reads
+    return df
+
+def load_csv(filename: str, schema: dict = None, use_cache: bool = True, **read_kwargs) -> pd.DataFrame:
     """
     Load CSV from Data/ folder. Example: load_csv("Predict Hair Fall.csv")
-    Does not mutate dataframe (returns a copy).
+    Goes through the columnar cache unless use_cache=False.
     """
     path = DATA_DIR / filename
-    return pd.read_csv(path)
+    if not use_cache:
+        df = pd.read_csv(path, **read_kwargs)
+        return apply_schema(df, schema) if schema else df
+    return read_csv_cached(path, schema=schema, **read_kwargs)
 
 def save_df(df: pd.DataFrame, filename: str) -> None:
     """Save df to Data/ or artifacts/ (choose path)."""
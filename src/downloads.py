@@ -0,0 +1,71 @@
+# src/downloads.py
+import gzip
+import io
+import os
+import threading
+import pandas as pd
+from src.artifacts import artifact_path, prune
+from src.catalog import DATASETS
+from src.data_io import DATA_DIR, file_version, read_csv_cached
+from src.schemas import SCHEMAS
+
+# label -> (file extension, mime type) offered next to the About page download buttons
+DOWNLOAD_FORMATS = {
+    "CSV": (".csv", "text/csv"),
+    "CSV (gzip)": (".csv.gz", "application/gzip"),
+    "Parquet": (".parquet", "application/vnd.apache.parquet"),
+}
+
+_payloads = {}  # (dataset, format) -> (version key, bytes)
+_lock = threading.Lock()
+
+def frame_payload(df: pd.DataFrame, fmt: str = "CSV") -> bytes:
+    """Serialize a frame in one of DOWNLOAD_FORMATS."""
+    if fmt == "Parquet":
+        buf = io.BytesIO()
+        df.to_parquet(buf, index=False)
+        return buf.getvalue()
+    data = df.to_csv(index=False).encode('utf-8')
+    return gzip.compress(data, compresslevel=6, mtime=0) if fmt == "CSV (gzip)" else data
+
+def _build_payload(dataset: str, fmt: str) -> bytes:
+    path = DATA_DIR / DATASETS[dataset]
+    if fmt == "Parquet":
+        # the typed read of the same CSV, so both formats carry the same values
+        return frame_payload(read_csv_cached(path, schema=SCHEMAS.get(dataset)), fmt)
+    # the CSV download is the file itself; no need to round-trip it through pandas
+    data = path.read_bytes()
+    return gzip.compress(data, compresslevel=6, mtime=0) if fmt == "CSV (gzip)" else data
+
+def download_payload(dataset: str, fmt: str = "CSV") -> bytes:
+    """
+    Download bytes for a dataset's published CSV in Data/, built once per version of that file
+    (with its schema for the Parquet). Payloads are stored next to the other artifacts and kept
+    in memory, so reruns and other sessions reuse the same bytes instead of re-serializing it.
+    """
+    version = file_version(DATA_DIR / DATASETS[dataset], schema=SCHEMAS.get(dataset) if fmt == "Parquet" else None)
+    key = (dataset, fmt)
+    with _lock:
+        cached = _payloads.get(key)
+        if cached is not None and cached[0] == version.key:
+            return cached[1]
+
+    path = artifact_path(f"downloads/{dataset}", version, suffix=DOWNLOAD_FORMATS[fmt][0])
+    if path.exists():
+        data = path.read_bytes()
+    else:
+        data = _build_payload(dataset, fmt)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+            prune(f"downloads/{dataset}")
+        except OSError:
+            pass
+    with _lock:
+        _payloads[key] = (version.key, data)
+    return data
+
+def download_file_name(stem: str, fmt: str) -> str:
+    return stem + DOWNLOAD_FORMATS[fmt][0]
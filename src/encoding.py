@@ -0,0 +1,50 @@
+# src/encoding.py
+import numpy as np
+import pandas as pd
+
+YES_NO_CODES = {'Yes': 1, 'No': 0}
+
+class CategoricalEncoder:
+    """
+    Encode several label columns into compact nullable Int8 codes at once.
+    config maps output column -> (source column, {label: code}), the same shape as
+    LUKE_ENCODINGS (src/luke_cleaning.py); each mapping's codes must be consecutive integers (e.g. 0..2 or 1..4).
+    Columns that share a label set are factorized together in one pass.
+    Labels outside the mapping and missing values become <NA>, as with Series.map.
+    """
+
+    def __init__(self, config: dict):
+        self.config = dict(config)
+        self._groups = {}  # (labels in code order, first code) -> [(output, source), ...]
+        for out, (source, mapping) in self.config.items():
+            labels = sorted(mapping, key=mapping.get)
+            codes = [mapping[label] for label in labels]
+            if codes != list(range(codes[0], codes[0] + len(codes))):
+                raise ValueError(f"{out}: codes must be consecutive integers, got {mapping}")
+            if max(abs(codes[0]), abs(codes[-1])) > np.iinfo(np.int8).max:
+                raise ValueError(f"{out}: codes do not fit in int8")
+            self._groups.setdefault((tuple(labels), codes[0]), []).append((out, source))
+
+    def encode(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Only the encoded columns, in config order, indexed like df."""
+        encoded = {}
+        for (labels, start), pairs in self._groups.items():
+            # stack the group's columns and factorize them together: one hash pass over all
+            # values, after which only the handful of distinct values are looked up
+            stacked = pd.concat([df[source] for _, source in pairs], ignore_index=True)
+            codes, uniques = pd.factorize(stacked)
+            lookup = np.append(pd.Index(labels).get_indexer(uniques), -1)  # code -1 (missing) -> -1
+            positions = lookup[codes].reshape(len(pairs), len(df))
+            missing = positions < 0
+            values = (positions + start).astype(np.int8)
+            for i, (out, _) in enumerate(pairs):
+                encoded[out] = pd.arrays.IntegerArray(values[i], missing[i])
+        return pd.DataFrame({out: encoded[out] for out in self.config}, index=df.index)
+
+    def transform(self, df: pd.DataFrame, copy: bool = True) -> pd.DataFrame:
+        """df with the encoded columns added (or replaced); CleaningPipeline-compatible."""
+        if copy:
+            df = df.copy()
+        for out, values in self.encode(df).items():
+            df[out] = values
+        return df
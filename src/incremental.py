@@ -0,0 +1,119 @@
+# src/incremental.py
+import os
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from src.cleaning import (PREDICT_CLEANED_COLUMNS, PREDICT_CLEANING_STEPS, CleaningPipeline,
+                          add_missing_flags, label_encode_features)
+from src.data_io import CACHE_DIRNAME, DATA_DIR
+from src.missingness import MEDICAL_MODE_GROUPS, NUTRITIONAL_MODE_GROUPS, impute_group_mode
+
+# Incremental re-cleaning of Predict Hair Fall.csv -> Predict Hair Fall Cleaned.csv.
+# A hash of every source row is kept in ROW_STATE; a re-run only cleans and imputes the
+# rows that were inserted or changed since, and drops the deleted ones.
+SOURCE = DATA_DIR / "Predict Hair Fall.csv"
+CLEANED = DATA_DIR / "Predict Hair Fall Cleaned.csv"
+ROW_STATE = DATA_DIR / CACHE_DIRNAME / "Predict Hair Fall Cleaned.rows.parquet"
+# the source Id is not unique (a few participants appear twice), so rows are keyed on
+# (Id, n-th occurrence of that Id)
+KEY = ['Source_Id', 'Occurrence']
+
+def source_row_state(source: pd.DataFrame) -> pd.DataFrame:
+    """Key and content hash of every source row, in file order."""
+    ids = source.iloc[:, 0]
+    return pd.DataFrame({
+        'Source_Id': ids.to_numpy(),
+        'Occurrence': ids.groupby(ids).cumcount().to_numpy(),
+        'Hash': pd.array(pd.util.hash_pandas_object(source, index=False).to_numpy(), dtype='UInt64'),
+    })
+
+def impute_nutritional(reference: pd.DataFrame, rows: pd.DataFrame) -> pd.Series:
+    """Mode of the originally observed values within the same Age_Range (as in the notebook)."""
+    return impute_group_mode(rows, 'Nutritional_Deficiencies', NUTRITIONAL_MODE_GROUPS,
+                             reference=reference[reference['Nutritional_Deficiencies_missing'] == 0])
+
+def impute_medical(reference: pd.DataFrame, rows: pd.DataFrame) -> pd.Series:
+    """
+    Mode within the same (Age_Range, Stress_Level), as the Missingness page's conditional mode.
+    The cleaned file keeps no missing flag for this column, so earlier imputations count too.
+    """
+    return impute_group_mode(rows, 'Medical_Conditions', MEDICAL_MODE_GROUPS, reference=reference)
+
+# column -> imputer(reference cleaned rows, newly cleaned rows) -> filled column
+IMPUTERS = {
+    'Nutritional_Deficiencies': impute_nutritional,
+    'Medical_Conditions': impute_medical,
+}
+
+def clean_rows(source_rows: pd.DataFrame, clean_ids, reference: pd.DataFrame, imputers=IMPUTERS) -> pd.DataFrame:
+    """Clean, encode and impute some source rows into the cleaned CSV layout."""
+    df = CleaningPipeline(PREDICT_CLEANING_STEPS, profile_memory=False).run(source_rows.reset_index(drop=True))
+    df['Id'] = np.asarray(clean_ids)
+    df = add_missing_flags(df, copy=False)
+    df = label_encode_features(df, copy=False)
+    reference = pd.concat([reference, df[reference.columns]], ignore_index=True)
+    for col, impute in imputers.items():
+        df[col] = impute(reference, df)
+    return df[PREDICT_CLEANED_COLUMNS]
+
+def _write_atomic(df: pd.DataFrame, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    if path.suffix == ".parquet":
+        df.to_parquet(tmp, index=False)
+    else:
+        df.to_csv(tmp, index=False)
+    os.replace(tmp, path)
+
+def refresh_cleaned(src=SOURCE, dst=CLEANED, state_path=ROW_STATE, imputers=IMPUTERS) -> dict:
+    """
+    Bring dst up to date with src, re-cleaning only inserted and changed rows.
+    Changed rows keep their cleaned Id, inserted rows get new Ids after the current maximum,
+    deleted rows are dropped. The first run (no state file yet) assumes dst matches src row
+    for row and only records the hashes.
+    Returns {"inserted": n, "changed": n, "deleted": n, "unchanged": n}.
+    """
+    src, dst, state_path = Path(src), Path(dst), Path(state_path)
+    source = pd.read_csv(src)
+    current = source_row_state(source)
+    cleaned = pd.read_csv(dst)
+
+    if not state_path.exists():
+        if len(cleaned) != len(source):
+            raise ValueError(f"{dst.name} has {len(cleaned)} rows but {src.name} has {len(source)}; "
+                             "re-clean the full file before tracking row hashes")
+        _write_atomic(current.assign(Clean_Id=cleaned['Id'].to_numpy()), state_path)
+        return {"inserted": 0, "changed": 0, "deleted": 0, "unchanged": len(source)}
+
+    state = pd.read_parquet(state_path).astype({'Hash': 'UInt64'})
+    merged = current.reset_index(names='Row').merge(state, on=KEY, how='outer', suffixes=('', '_old'), indicator=True)
+    inserted = merged['_merge'] == 'left_only'
+    deleted = merged['_merge'] == 'right_only'
+    changed = (merged['_merge'] == 'both') & (merged['Hash'] != merged['Hash_old'])
+    counts = {"inserted": int(inserted.sum()), "changed": int(changed.sum()),
+              "deleted": int(deleted.sum()), "unchanged": int((~(inserted | deleted | changed)).sum())}
+    if not (inserted.any() or deleted.any() or changed.any()):
+        return counts
+
+    next_id = int(max(state['Clean_Id'].max(), cleaned['Id'].max())) + 1
+    merged.loc[inserted, 'Clean_Id'] = np.arange(next_id, next_id + int(inserted.sum()))
+    redo = merged[inserted | changed]
+    dropped = merged.loc[deleted | changed, 'Clean_Id']
+
+    kept = cleaned[~cleaned['Id'].isin(dropped)]
+    fresh = clean_rows(source.iloc[redo['Row'].astype(int).to_numpy()], redo['Clean_Id'].astype(int), kept, imputers)
+    patched = pd.concat([kept, fresh], ignore_index=True).sort_values('Id', kind='stable', ignore_index=True)
+    _write_atomic(patched, dst)
+
+    new_state = merged[~deleted].sort_values('Row')[KEY + ['Hash', 'Clean_Id']].astype({'Clean_Id': 'int64'})
+    _write_atomic(new_state.reset_index(drop=True), state_path)
+    return counts
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Re-clean only the changed rows of the Predict Hair Fall export.")
+    parser.add_argument("--src", default=str(SOURCE))
+    parser.add_argument("--dst", default=str(CLEANED))
+    parser.add_argument("--state", default=str(ROW_STATE))
+    args = parser.parse_args()
+    print(refresh_cleaned(args.src, args.dst, args.state))
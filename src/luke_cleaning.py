@@ -0,0 +1,77 @@
+# src/luke_cleaning.py
+import os
+from pathlib import Path
+import pandas as pd
+from src.data_io import CACHE_DIRNAME, DATA_DIR
+from src.encoding import CategoricalEncoder
+from src.schemas import LUKE_CLEANED_SCHEMA, LUKE_DATE_FORMAT, apply_schema
+
+# The cleaning from data_cleaning_luke_hair_data.ipynb as a library: every step is a
+# whole-column operation, dates are parsed with an explicit format, and the result keeps
+# its native dtypes (datetime64 Date, int8 encodings) when persisted as Parquet.
+RAW_EXPORT = DATA_DIR / "Luke_hair_loss_documentation.csv"
+CLEANED_PARQUET = DATA_DIR / CACHE_DIRNAME / "Luke_hair_loss_documentation Cleaned.typed.parquet"
+
+LUKE_FILL_VALUES = {'School_Assesssment': "No assessment", 'Dandruff': "None", 'Hair_Grease': 0}
+LUKE_REPLACEMENTS = {
+    'School_Assesssment': {'Individual ass': 'Individual Assessment', 'Team ass': 'Team Assessment'},
+    'Hair_Washing': {'Y': 'Yes', 'N': 'No'},
+}
+LUKE_ENCODINGS = {
+    'Hair_Loss_Encoding': ('Hair_Loss', {'Few': 1, 'Medium': 2, 'Many': 3, 'A lot': 4}),
+    'Pressure_Level_Encoding': ('Pressure_Level', {'Low': 1, 'Medium': 2, 'High': 3, 'Very High': 4}),
+    'Stress_Level_Encoding': ('Stress_Level', {'Low': 1, 'Medium': 2, 'High': 3, 'Very High': 4}),
+    'Swimming_Encoding': ('Swimming', {'Yes': 1, 'No': 0}),
+    'Hair_Washing_Encoding': ('Hair_Washing', {'Yes': 1, 'No': 0}),
+    'Dandruff_Encoding': ('Dandruff', {'None': 0, 'Few': 1, 'Many': 2}),
+}
+LUKE_ENCODER = CategoricalEncoder(LUKE_ENCODINGS)
+
+def normalize_luke_columns(columns) -> list:
+    """'date ' / 'hair_loss' (raw export, possibly BOM-prefixed) -> 'Date' / 'Hair_Loss'."""
+    columns = pd.Index(columns).str.strip().str.lstrip('﻿')
+    return [col.replace('_', ' ').title().replace(' ', '_') for col in columns]
+
+def parse_luke_dates(dates: pd.Series) -> pd.Series:
+    """Day-first log dates with the explicit format; already-parsed columns are returned as-is."""
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        return dates
+    return pd.to_datetime(dates, format=LUKE_DATE_FORMAT, errors='coerce')
+
+def clean_luke_days(raw: pd.DataFrame) -> pd.DataFrame:
+    """
+    Clean and encode raw Luke log rows (same steps as data_cleaning_luke_hair_data.ipynb).
+    Accepts the raw export headers ('date ', 'hair_loss', ...) or already-titled ones.
+    """
+    df = raw.copy(deep=False)
+    df.columns = normalize_luke_columns(df.columns)
+    df = df.fillna(LUKE_FILL_VALUES).replace(LUKE_REPLACEMENTS)
+    df = LUKE_ENCODER.transform(df, copy=False)
+    if not pd.api.types.is_datetime64_any_dtype(df['Date']):
+        df['Date'] = pd.to_datetime(df['Date'], format=LUKE_DATE_FORMAT)
+    return apply_schema(df, LUKE_CLEANED_SCHEMA)
+
+def clean_luke_file(src=RAW_EXPORT, dst=CLEANED_PARQUET) -> pd.DataFrame:
+    """Clean the raw export and persist it as Parquet (write-then-rename); returns the cleaned frame."""
+    df = clean_luke_days(pd.read_csv(src))
+    dst = Path(dst)
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dst.with_name(f"{dst.name}.{os.getpid()}.tmp")
+    df.to_parquet(tmp, index=False)
+    os.replace(tmp, dst)
+    return df
+
+def load_luke_cleaned(path=CLEANED_PARQUET, src=RAW_EXPORT) -> pd.DataFrame:
+    """The persisted cleaned log; (re)built from the raw export when missing or older than it."""
+    path, src = Path(path), Path(src)
+    if not path.exists() or path.stat().st_mtime_ns < src.stat().st_mtime_ns:
+        return clean_luke_file(src, path)
+    return pd.read_parquet(path)
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Clean the raw Luke log export into typed Parquet.")
+    parser.add_argument("--src", default=str(RAW_EXPORT))
+    parser.add_argument("--dst", default=str(CLEANED_PARQUET))
+    args = parser.parse_args()
+    print(f"{len(clean_luke_file(args.src, args.dst))} days -> {args.dst}")
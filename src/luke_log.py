@@ -0,0 +1,130 @@
+# src/luke_log.py
+import json
+import os
+from pathlib import Path
+import pandas as pd
+from src.data_io import DATA_DIR
+from src.luke_cleaning import RAW_EXPORT, clean_luke_days, load_luke_cleaned
+from src.schemas import LUKE_CLEANED_SCHEMA
+
+# Append-only store for the Luke daily log: one Parquet file per calendar month,
+# plus the smoothed hair-loss series kept up to date as days are appended.
+# The first append seeds the store with the cleaned export, so it always holds the full log.
+LOG_DIR = DATA_DIR / "luke_log"
+MANIFEST = "manifest.json"
+SMOOTHED = "smoothed.parquet"
+SMOOTHING_WINDOW = 5  # centered rolling mean, as on the EDA page
+
+def _partition_path(month: str, log_dir: Path) -> Path:
+    return log_dir / f"month={month}.parquet"
+
+def _write_atomic(df: pd.DataFrame, path: Path) -> None:
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    df.to_parquet(tmp, index=False)
+    os.replace(tmp, path)
+
+def read_manifest(log_dir=LOG_DIR) -> dict:
+    path = Path(log_dir) / MANIFEST
+    if not path.exists():
+        return {"months": {}, "last_date": None, "rows": 0}
+    return json.loads(path.read_text())
+
+def _read_months(months, log_dir: Path) -> pd.DataFrame:
+    if not months:
+        return pd.DataFrame(columns=list(LUKE_CLEANED_SCHEMA))
+    return pd.concat([pd.read_parquet(_partition_path(m, log_dir)) for m in sorted(months)], ignore_index=True)
+
+def load_luke_log(log_dir=LOG_DIR) -> pd.DataFrame:
+    """All stored days, oldest first."""
+    log_dir = Path(log_dir)
+    return _read_months(read_manifest(log_dir)["months"], log_dir)
+
+def smoothed_series(encodings: pd.Series, window: int = SMOOTHING_WINDOW) -> pd.Series:
+    return encodings.astype(float).rolling(window=window, center=True, min_periods=1).mean()
+
+def _update_smoothed(new: pd.DataFrame, log_dir: Path, months, last_date) -> None:
+    """
+    Extend the stored smoothed series with the new days. A centered window of w only
+    changes the last w//2 stored values, so only a tail of 2*(w//2) old days is re-read.
+    Out-of-order appends (backfilled days) fall back to a full recompute from the months.
+    Runs before the manifest is written, so stored days after last_date (the manifest's)
+    are leftovers of an interrupted append and are dropped.
+    """
+    path = log_dir / SMOOTHED
+    half = SMOOTHING_WINDOW // 2
+    cols = ['Date', 'Hair_Loss_Encoding']
+    if last_date is None or new['Date'].min() <= last_date or not path.exists():
+        full = _read_months(months, log_dir)[cols]
+        full['Smoothed_Hair_Loss'] = smoothed_series(full['Hair_Loss_Encoding'])
+        _write_atomic(full, path)
+        return
+    old = pd.read_parquet(path)
+    old = old[old['Date'] <= last_date].reset_index(drop=True)
+    start, keep = max(len(old) - 2 * half, 0), max(len(old) - half, 0)
+    tail = pd.concat([old[cols].iloc[start:], new[cols]], ignore_index=True)
+    tail['Smoothed_Hair_Loss'] = smoothed_series(tail['Hair_Loss_Encoding'])
+    _write_atomic(pd.concat([old.iloc[:keep], tail.iloc[keep - start:]], ignore_index=True), path)
+
+def append_days(raw: pd.DataFrame, log_dir=LOG_DIR, seed=RAW_EXPORT) -> dict:
+    """
+    Clean/encode new raw days and add them to the monthly partitions they fall in.
+    An empty store is first seeded with the cleaned seed export (None starts it empty).
+    Days already in the log are skipped (the log is append-only); only the touched
+    month files and the tail of the smoothed series are rewritten, then the manifest.
+    Returns {"appended": n, "skipped": n, "months": [...]}.
+    """
+    log_dir = Path(log_dir)
+    log_dir.mkdir(parents=True, exist_ok=True)
+    manifest = read_manifest(log_dir)
+    new = clean_luke_days(raw)
+    if not manifest["months"] and seed is not None:
+        new = pd.concat([load_luke_cleaned(src=seed), new], ignore_index=True)
+    new = new.drop_duplicates('Date').sort_values('Date', ignore_index=True)
+
+    existing_dates = set()
+    months = new['Date'].dt.strftime('%Y-%m')
+    for month in months.unique():
+        if month in manifest["months"]:
+            existing_dates.update(pd.read_parquet(_partition_path(month, log_dir), columns=['Date'])['Date'])
+    is_new = ~new['Date'].isin(existing_dates)
+    skipped = int((~is_new).sum())
+    new, months = new[is_new].reset_index(drop=True), months[is_new].reset_index(drop=True)
+    if new.empty:
+        return {"appended": 0, "skipped": skipped, "months": []}
+
+    last_date = pd.Timestamp(manifest["last_date"]) if manifest["last_date"] else None
+    for month, part in new.groupby(months, sort=True):
+        path = _partition_path(month, log_dir)
+        if month in manifest["months"]:
+            part = pd.concat([pd.read_parquet(path), part], ignore_index=True).sort_values('Date', ignore_index=True)
+        _write_atomic(part, path)
+        manifest["months"][month] = len(part)
+
+    _update_smoothed(new, log_dir, manifest["months"], last_date)
+    manifest["rows"] = sum(manifest["months"].values())
+    manifest["last_date"] = max(new['Date'].max(), last_date or new['Date'].max()).strftime('%Y-%m-%d')
+    tmp = log_dir / f"{MANIFEST}.{os.getpid()}.tmp"
+    tmp.write_text(json.dumps(manifest, indent=1, sort_keys=True))
+    os.replace(tmp, log_dir / MANIFEST)
+    return {"appended": len(new), "skipped": skipped, "months": sorted(months.unique())}
+
+def load_smoothed(log_dir=LOG_DIR, covering=None) -> pd.DataFrame:
+    """
+    Date, Hair_Loss_Encoding, Smoothed_Hair_Loss for every stored day. None if the log is
+    empty, or if covering (dates) is given and the stored series is missing any of them.
+    """
+    path = Path(log_dir) / SMOOTHED
+    if not path.exists():
+        return None
+    smoothed = pd.read_parquet(path)
+    if covering is not None and not pd.Series(covering).dropna().isin(smoothed['Date']).all():
+        return None
+    return smoothed
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Append raw Luke log days to the partitioned store.")
+    parser.add_argument("csv", help="raw export with the new days (same columns as Luke_hair_loss_documentation.csv)")
+    parser.add_argument("--log-dir", default=str(LOG_DIR))
+    args = parser.parse_args()
+    print(append_days(pd.read_csv(args.csv), args.log_dir))
@@ -0,0 +1,179 @@
+# src/mcar.py
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from scipy.stats import chi2 as chi2_distribution
+from src.artifacts import cached_artifact
+from src.missingness import CHI2_FACTORS, MISSINGNESS_COLUMNS, one_hot_levels, chi2_tables
+
+# Formal MCAR checks for the Missingness page: Little's test over every column of the raw
+# Predict Hair Fall export, and Monte Carlo permutation p-values for the chi-squared
+# missingness x factor tests of src/missingness.chi2_tables.
+N_PERMUTATIONS = 20_000
+# working memory of one permutation batch (row indices + gathered indicator flags); batches
+# shrink below batch_size when the frame is too long to fit this
+PERMUTATION_BATCH_BYTES = 256 * 1024 ** 2
+
+def numeric_codes(df: pd.DataFrame) -> pd.DataFrame:
+    """Numeric columns as floats, everything else as sorted label codes; gaps stay NaN (as R's data.matrix)."""
+    out = {}
+    for col in df.columns:
+        if pd.api.types.is_numeric_dtype(df[col]) and not pd.api.types.is_bool_dtype(df[col]):
+            out[col] = df[col].to_numpy(dtype=float, na_value=np.nan)
+        else:
+            codes = pd.factorize(df[col], sort=True)[0].astype(float)
+            codes[codes < 0] = np.nan
+            out[col] = codes
+    return pd.DataFrame(out, index=df.index)
+
+def _patterns(observed: np.ndarray) -> tuple:
+    """Distinct rows of the observed mask and the pattern number of every row."""
+    patterns, inverse = np.unique(observed, axis=0, return_inverse=True)
+    return patterns, inverse.ravel()
+
+def em_mean_cov(X: np.ndarray, max_iter: int = 200, tol: float = 1e-8) -> tuple:
+    """
+    Maximum-likelihood mean and covariance of a multivariate normal with gaps (EM).
+    Every iteration works pattern by pattern: the missing block of all rows sharing a pattern
+    is filled by one regression on their observed block.
+    """
+    observed = ~np.isnan(X)
+    patterns, inverse = _patterns(observed)
+    groups = [np.flatnonzero(inverse == j) for j in range(len(patterns))]
+    n, p = X.shape
+    mu = np.nanmean(X, axis=0)
+    sigma = np.diag(np.nanvar(X, axis=0))
+    for _ in range(max_iter):
+        sum_x, sum_xx = np.zeros(p), np.zeros((p, p))
+        for obs, rows in zip(patterns, groups):
+            mis = ~obs
+            full = np.where(observed[rows], X[rows], 0.0)
+            if mis.any():
+                if obs.any():
+                    coef = np.linalg.solve(sigma[np.ix_(obs, obs)], sigma[np.ix_(obs, mis)]).T
+                    full[:, mis] = mu[mis] + (X[np.ix_(rows, obs)] - mu[obs]) @ coef.T
+                    residual = sigma[np.ix_(mis, mis)] - coef @ sigma[np.ix_(obs, mis)]
+                else:
+                    full[:, mis] = mu[mis]
+                    residual = sigma[np.ix_(mis, mis)]
+                sum_xx[np.ix_(mis, mis)] += len(rows) * residual
+            sum_x += full.sum(axis=0)
+            sum_xx += full.T @ full
+        new_mu = sum_x / n
+        new_sigma = sum_xx / n - np.outer(new_mu, new_mu)
+        done = max(np.abs(new_mu - mu).max(), np.abs(new_sigma - sigma).max()) < tol
+        mu, sigma = new_mu, new_sigma
+        if done:
+            break
+    return mu, sigma
+
+def littles_mcar_test(df: pd.DataFrame) -> dict:
+    """
+    Little's (1988) MCAR test over all columns of df (text columns as label codes).
+    d2 sums, over missingness patterns, n_j times the Mahalanobis distance between the pattern's
+    observed-column means and the EM estimates; under MCAR it is chi2 with sum(p_j) - p dof.
+    Returns {"statistic", "dof", "p_value", "patterns", "columns"}.
+    """
+    values = numeric_codes(df)
+    values = values.loc[:, values.notna().any()]
+    X = values.to_numpy()
+    mu, sigma = em_mean_cov(X)
+    observed = ~np.isnan(X)
+    patterns, inverse = _patterns(observed)
+    statistic, dof = 0.0, -X.shape[1]
+    for j, obs in enumerate(patterns):
+        if not obs.any():
+            continue
+        rows = inverse == j
+        diff = np.nanmean(X[np.ix_(rows, obs)], axis=0) - mu[obs]
+        statistic += rows.sum() * diff @ np.linalg.solve(sigma[np.ix_(obs, obs)], diff)
+        dof += int(obs.sum())
+    return {"statistic": float(statistic), "dof": int(dof),
+            "p_value": float(chi2_distribution.sf(statistic, dof)) if dof > 0 else 1.0,
+            "patterns": int(len(patterns)), "columns": list(values.columns)}
+
+def _permutation_batch(flags: np.ndarray, onehot: np.ndarray, starts: np.ndarray, weights: np.ndarray,
+                       expected: np.ndarray, observed_chi2: np.ndarray, n_permutations: int, seed) -> np.ndarray:
+    """
+    How often n_permutations shuffles of the rows reach each observed chi2 (indicators x factors).
+    The margins of every table survive a shuffle, so expected counts are fixed and only the
+    indicator's level counts change: one (permutations x indicators x rows) @ (rows x levels) product.
+    """
+    rng = np.random.default_rng(seed)
+    rows = np.arange(flags.shape[1], dtype=np.int32 if flags.shape[1] < 2 ** 31 else np.int64)
+    perms = rng.permuted(np.broadcast_to(rows, (n_permutations, flags.shape[1])), axis=1)
+    counts = np.matmul(flags[:, perms].transpose(1, 0, 2), onehot)
+    chi2 = np.add.reduceat(weights * (counts - expected) ** 2, starts, axis=2)
+    return (chi2 >= observed_chi2 - 1e-9).sum(axis=0)
+
+def chi2_permutation_tests(df: pd.DataFrame, columns=MISSINGNESS_COLUMNS, factors=CHI2_FACTORS,
+                           n_permutations: int = N_PERMUTATIONS, seed: int = 0, batch_size: int = 1000,
+                           workers: int = 1) -> pd.DataFrame:
+    """
+    Monte Carlo p-values of Pearson's chi2 (no continuity correction) for every missingness x factor pair.
+    Permutations run in batches of batch_size (fewer when a batch would exceed PERMUTATION_BATCH_BYTES),
+    each with its own child of SeedSequence(seed). Batches run in-process by default; workers > 1
+    (None: one per CPU) spreads them over a process pool, which only pays off on long frames.
+    Results depend on seed, n_permutations and the frame only, not on the worker count.
+    One row per pair: Column, Factor, Chi2, Dof, P_Value (asymptotic), Perm_P_Value.
+    """
+    columns = [c for c in columns if c in df.columns]
+    factors = [f for f in factors if f in df.columns]
+    flags = df[columns].isna().to_numpy(dtype=np.float32).T
+    onehot, _, owner = one_hot_levels(df[factors])
+    onehot = onehot.astype(np.float32)
+    starts = np.flatnonzero(np.r_[True, owner[1:] != owner[:-1]])
+    count = onehot.sum(axis=0, dtype=float)
+    total = np.add.reduceat(count, starts)[owner]
+    # rows with a missing factor value have an all-zero one-hot row, so they drop out of every table
+    row_missing = np.add.reduceat(flags.astype(float) @ onehot, starts, axis=1)[:, owner]
+    expected = row_missing * count / total
+    present = count - expected
+    weights = np.divide(1.0, expected, out=np.zeros_like(expected), where=expected > 0) \
+        + np.divide(1.0, present, out=np.zeros_like(present), where=present > 0)
+    observed_chi2 = np.add.reduceat(weights * (flags.astype(float) @ onehot - expected) ** 2, starts, axis=1)
+
+    per_permutation = flags.shape[1] * (4 + 2 * flags.itemsize * len(flags))  # indices, gathered + matmul copy
+    batch_size = max(1, min(batch_size, PERMUTATION_BATCH_BYTES // per_permutation))
+    sizes = [batch_size] * (n_permutations // batch_size) + ([n_permutations % batch_size] if n_permutations % batch_size else [])
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = (flags, onehot, starts, weights, expected, observed_chi2)
+    workers = min(workers or os.cpu_count() or 1, len(sizes))
+    if workers <= 1:
+        hits = sum(_permutation_batch(*args, size, s) for size, s in zip(sizes, seeds))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            hits = sum(pool.map(_permutation_batch, *zip(*[args + (size, s) for size, s in zip(sizes, seeds)])))
+
+    tests = chi2_tables(df[columns].isna(), df[factors]).drop_duplicates(['Column', 'Factor'])
+    return pd.DataFrame({
+        'Column': tests['Column'].to_numpy(), 'Factor': tests['Factor'].to_numpy(),
+        'Chi2': observed_chi2.ravel(), 'Dof': tests['Dof'].to_numpy(),
+        'P_Value': chi2_distribution.sf(observed_chi2.ravel(), np.maximum(tests['Dof'].to_numpy(), 1)),
+        'Perm_P_Value': (1 + hits.ravel()) / (1 + n_permutations),
+    })
+
+def with_missingness_factors(raw: pd.DataFrame) -> pd.DataFrame:
+    """Raw Predict Hair Fall rows plus the Stress_Level / Age_Range factors the Missingness page tests against."""
+    return raw.assign(
+        Stress_Level=pd.Categorical(raw['Stress'], categories=['Low', 'Moderate', 'High'], ordered=True),
+        Age_Range=pd.cut(raw['Age'], bins=[18, 30, 40, 51], labels=['18-30', '30-40', '40-51'], right=False))
+
+def mcar_tests(raw: pd.DataFrame, version=None, n_permutations: int = N_PERMUTATIONS, seed: int = 0,
+               workers: int = 1) -> tuple:
+    """
+    (Little's test over every column of the raw export but Id, permutation tests of its gaps
+    against CHI2_FACTORS), each cached per DatasetVersion when one is given.
+    """
+    columns = [c for c in raw.columns if c != 'Id']
+    def little():
+        return littles_mcar_test(raw[columns])
+    def permutations():
+        return chi2_permutation_tests(with_missingness_factors(raw), n_permutations=n_permutations,
+                                      seed=seed, workers=workers)
+    if version is None:
+        return little(), permutations()
+    return (cached_artifact("littles_mcar", version, little, params=columns),
+            cached_artifact("chi2_permutations", version, permutations,
+                            params={"n_permutations": n_permutations, "seed": seed}))
@@ -4,34 +4,25 @@ import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 import streamlit as st
-from scipy import stats
+from src.missingness_models import logit_summary, logit_table_html
+from src.rf_imputer import impute_predict_hair_fall
+from src.viz import render_mice_section
+from src.missingness import MEDICAL_MODE_GROUPS, chi2_missingness, chi2_result, impute_group_mode
 
 sns.set_style("whitegrid")
 
-def impute_medical_condition_mode(row, df):
-    """
-    Mode imputation grouped by Age_Range and Stress_Level.
-    Assumes df already has 'Age_Range' and 'Stress_Level' columns.
-    """
-    if pd.isna(row['Medical_Conditions']):
-        group = df[(df['Age_Range'] == row['Age_Range']) & (df['Stress_Level'] == row['Stress_Level'])]
-        mode_value = group['Medical_Conditions'].mode()
-        if not mode_value.empty:
-            return mode_value[0]
-        else:
-            return 'Unknown'
-    else:
-        return row['Medical_Conditions']
-
 def render_medical_missingness(hair_raw, df_raw, df_cleaned,
                                HEADER_COLOR="#2E8B57", TEXT="#333",
-                               SECTION_BG="#F0F8F5", ACCENT="#2E8B57"):
+                               SECTION_BG="#F0F8F5", ACCENT="#2E8B57", version=None):
     """
     Renders the full Medical Conditions missingness section in Streamlit.
     Expects:
       - hair_raw : DataFrame used for missingness analysis (has 'Stress' / 'Stress_Level', 'Age' columns).
       - df_raw : original raw file DataFrame (for before-imputation counts).
       - df_cleaned : cleaned/imputed DataFrame (for after-imputation counts).
+      - version : DatasetVersion of df_raw; when given, the chi-squared tables are cached for it and
+        the Random Forest counts come from src.rf_imputer for that version instead of df_cleaned,
+        and the multiple imputations (src.mice) are cached for it.
     """
 
     # -- Header
@@ -101,10 +92,9 @@ def render_medical_missingness(hair_raw, df_raw, df_cleaned,
 
     # Chi-squared summary (static text + actual calculation)
     st.markdown(f"<h2 style='color:{HEADER_COLOR}; font-size:22px; text-align:center'; >Chi-Squared Tests for Missingness</h2>", unsafe_allow_html=True)
-    contingency_stress = pd.crosstab(hair_raw['Medical_Conditions_missing'], hair_raw['Stress_Level'])
-    contingency_age = pd.crosstab(hair_raw['Medical_Conditions_missing'], hair_raw['Age_Range'])
-    chi2_stress, p_stress, dof_stress, ex_stress = stats.chi2_contingency(contingency_stress)
-    chi2_age, p_age, dof_age, ex_age = stats.chi2_contingency(contingency_age)
+    chi2_table = chi2_missingness(hair_raw, version=version)
+    chi2_stress, p_stress, dof_stress, levels_stress = chi2_result(chi2_table, 'Medical_Conditions', 'Stress_Level')
+    chi2_age, p_age, dof_age, levels_age = chi2_result(chi2_table, 'Medical_Conditions', 'Age_Range')
 
     st.markdown(
         f"""
@@ -119,15 +109,14 @@ def render_medical_missingness(hair_raw, df_raw, df_cleaned,
         unsafe_allow_html=True
     )
 
-    x = np.arange(len(contingency_stress.columns))
+    x = np.arange(len(levels_stress))
     width = 0.35
     col1, col2 = st.columns(2, gap="large")
 
     # Stress Level bar: observed vs expected
     with col1:
         fig, ax = plt.subplots(figsize=(8,5))
-        obs = contingency_stress.loc[1] if 1 in contingency_stress.index else pd.Series(0,index=contingency_stress.columns)
-        exp = pd.Series(ex_stress[1], index=contingency_stress.columns) if ex_stress.shape[0] > 1 else pd.Series(0,index=contingency_stress.columns)
+        obs, exp = levels_stress['Missing'], levels_stress['Expected']
         ax.bar(x - width/2, obs, width, label='Observed', color='#86aca9')
         ax.bar(x + width/2, exp, width, label='Expected', color='#5d9189')
         ax.set_xticks(x)
@@ -141,8 +130,7 @@ def render_medical_missingness(hair_raw, df_raw, df_cleaned,
     # Age Range bar
     with col2:
         fig, ax = plt.subplots(figsize=(8,5))
-        obs = contingency_age.loc[1] if 1 in contingency_age.index else pd.Series(0,index=contingency_age.columns)
-        exp = pd.Series(ex_age[1], index=contingency_age.columns) if ex_age.shape[0] > 1 else pd.Series(0,index=contingency_age.columns)
+        obs, exp = levels_age['Missing'], levels_age['Expected']
         ax.bar(x - width/2, obs, width, label='Observed', color='#A8D5BA')
         ax.bar(x + width/2, exp, width, label='Expected', color='#5d9189')
         ax.set_xticks(x)
@@ -156,7 +144,7 @@ def render_medical_missingness(hair_raw, df_raw, df_cleaned,
     st.markdown("<br>", unsafe_allow_html=True)
     st.markdown("<hr style='border:2px solid #AAA; margin:16px 0;'>", unsafe_allow_html=True)
 
-    # Logistic regression static table for Medical Conditions (keeps same style)
+    # Logistic regression for Medical Conditions (fitted per dataset version, same table style)
     st.markdown(f"<h2 style='color:{HEADER_COLOR}; font-size:22px; text-align:center'; >Logistic Regression for Missingness in Medical Conditions</h2>", unsafe_allow_html=True)
     st.markdown(
         f"""
@@ -168,25 +156,14 @@ def render_medical_missingness(hair_raw, df_raw, df_cleaned,
         unsafe_allow_html=True
     )
 
-    st.markdown(
-        f"""
-        <table style="width:70%; border-collapse:collapse; font-size:16px; color:{TEXT}; margin-left:auto; margin-right:auto;">
-            <tr style="background-color:#f2f2f2;">
-                <th> </th><th>coef</th><th>std err</th><th>z</th><th>P>|z|</th><th>[0.025</th><th>0.975]</th>
-            </tr>
-            <tr><td>const</td><td>-2.7795</td><td>0.247</td><td>-11.264</td><td>0.000</td><td>-3.263</td><td>-2.296</td></tr>
-            <tr><td>Weight_Loss_Encoding</td><td>0.0817</td><td>0.204</td><td>0.401</td><td>0.688</td><td>-0.317</td><td>0.481</td></tr>
-            <tr><td>Genetic_Encoding</td><td>0.3407</td><td>0.207</td><td>1.649</td><td>0.099</td><td>-0.064</td><td>0.746</td></tr>
-            <tr><td>Stress_Level</td><td>0.4212</td><td>0.130</td><td>3.243</td><td>0.001</td><td>0.167</td><td>0.676</td></tr>
-        </table>
-        """,
-        unsafe_allow_html=True
-    )
+    medical_logit = logit_summary(df_raw, version, 'Medical_Conditions_missing',
+                                  ['Weight_Loss_Encoding', 'Genetic_Encoding', 'Stress_Level'])
+    st.markdown(logit_table_html(medical_logit, TEXT), unsafe_allow_html=True)
 
     st.markdown(
         f"""
         <p style="font-size:18px; color:{TEXT}; line-height:1.5;">
-        We can observe that the <b>p-value for Stress_Level</b> is very low (0.001), indicating that it is statistically significant. 
+        We can observe that the <b>p-value for Stress_Level</b> is very low ({medical_logit.loc['Stress_Level', 'P>|z|']:.3f}), indicating that it is statistically significant. 
         This confirms that <b>Stress Level</b> has a meaningful relationship with the missingness of <b>Medical Conditions</b>.
         </p>
         """,
@@ -223,7 +200,7 @@ def render_medical_missingness(hair_raw, df_raw, df_cleaned,
     if 'Stress' in df_mode.columns:
         df_mode['Stress_Level'] = df_mode['Stress']
     # apply imputation
-    df_mode['Medical_Conditions'] = df_mode.apply(lambda row: impute_medical_condition_mode(row, df_mode), axis=1)
+    df_mode['Medical_Conditions'] = impute_group_mode(df_mode, 'Medical_Conditions', MEDICAL_MODE_GROUPS)
 
     # Plot before vs after (mode)
     count_mode = df_mode['Medical_Conditions'].value_counts().sort_index()
@@ -261,7 +238,11 @@ def render_medical_missingness(hair_raw, df_raw, df_cleaned,
 
     # prepare and plot raw vs cleaned
     df_raw_copy = df_raw.copy()
-    df_cleaned_copy = df_cleaned.copy()
+    if version is not None:
+        # imputer fitted (or warm-started) for this raw version, instead of the notebook's output
+        df_cleaned_copy = df_raw.assign(Medical_Conditions=impute_predict_hair_fall(df_raw, 'Medical_Conditions', version).to_numpy())
+    else:
+        df_cleaned_copy = df_cleaned.copy()
     if 'Medical_Conditions' in df_raw_copy.columns:
         df_raw_copy['Medical_Conditions'] = df_raw_copy['Medical_Conditions'].dropna().astype(str).str.strip().str.title()
     if 'Medical_Conditions' in df_cleaned_copy.columns:
@@ -299,6 +280,10 @@ def render_medical_missingness(hair_raw, df_raw, df_cleaned,
     </div>
     """, unsafe_allow_html=True)
 
+    st.markdown("<br>", unsafe_allow_html=True)
+    # ---- Multiple imputation (chained equations), pooled over the imputations ----
+    render_mice_section(df_raw, version, 'Medical_Conditions', 'Medical Conditions', HEADER_COLOR=HEADER_COLOR, TEXT=TEXT)
+
     st.markdown("<br>", unsafe_allow_html=True)
 
     # done
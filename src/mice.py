@@ -0,0 +1,130 @@
+# src/mice.py
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+from src.artifacts import cached_artifact
+from src.rf_imputer import RF_FEATURES, predict_hair_fall_features
+
+# Multiple imputation by chained equations for the categorical gaps of the Predict Hair Fall
+# export. Every chain cycles through the targets, fitting a multinomial logistic model on a
+# bootstrap of the observed rows (features + the other targets as they currently stand) and
+# drawing each gap from the predicted class probabilities. Chains are independent and seeded,
+# and can run in worker processes; only the imputed cells ("deltas") of the M datasets are kept.
+MICE_TARGETS = ['Medical_Conditions', 'Nutritional_Deficiencies']
+N_IMPUTATIONS = 20
+DELTA_COLUMNS = ['Imputation', 'Column', 'Row', 'Value']
+
+def _one_hot(codes: np.ndarray, n_classes: int) -> np.ndarray:
+    return np.eye(n_classes)[codes]
+
+def _draw(rng: np.random.Generator, proba: np.ndarray) -> np.ndarray:
+    """One class index per row, drawn from that row's probabilities."""
+    u = rng.random(len(proba))[:, None]
+    return np.minimum((proba.cumsum(axis=1) < u).sum(axis=1), proba.shape[1] - 1)
+
+def _chain(X: np.ndarray, codes: dict, n_classes: dict, n_iter: int, seed) -> dict:
+    """
+    One MICE chain. codes maps target -> class codes with -1 for gaps; returns target -> the
+    codes drawn for its gaps after n_iter rounds.
+    """
+    rng = np.random.default_rng(seed)
+    missing = {t: c < 0 for t, c in codes.items()}
+    current = {t: c.copy() for t, c in codes.items()}
+    for t, c in current.items():
+        c[missing[t]] = rng.choice(c[~missing[t]], missing[t].sum())
+    for _ in range(n_iter):
+        for t in codes:
+            design = np.hstack([X] + [_one_hot(current[o], n_classes[o]) for o in codes if o != t])
+            observed = np.flatnonzero(~missing[t])
+            boot = rng.choice(observed, len(observed))
+            model = LogisticRegression(max_iter=500).fit(design[boot], current[t][boot])
+            current[t][missing[t]] = model.classes_[_draw(rng, model.predict_proba(design[missing[t]]))]
+    return {t: current[t][missing[t]] for t in codes}
+
+def multiple_imputation(df: pd.DataFrame, targets=MICE_TARGETS, features=RF_FEATURES, m: int = N_IMPUTATIONS,
+                        n_iter: int = 5, seed: int = 0, workers: int = 1) -> pd.DataFrame:
+    """
+    M chained-equations imputations of the targets' gaps. Chain i is seeded with the i-th child of
+    SeedSequence(seed), so results depend on seed and m, not on the worker count. Chains run
+    in-process by default; workers > 1 (None: one per CPU) spreads them over a process pool,
+    which only pays off for large frames or many cores.
+    Returns the deltas: one row per imputed cell (Imputation, Column, Row position, Value).
+    """
+    X = df[features].to_numpy(dtype=float, na_value=np.nan)
+    X = np.where(np.isnan(X), np.nanmean(X, axis=0), X)
+    X = (X - X.mean(axis=0)) / np.where(X.std(axis=0) > 0, X.std(axis=0), 1.0)  # standardized, lbfgs needs far fewer steps
+    categories, codes = {}, {}
+    for t in targets:
+        codes[t], categories[t] = pd.factorize(df[t], sort=True)
+    n_classes = {t: len(c) for t, c in categories.items()}
+    seeds = np.random.SeedSequence(seed).spawn(m)
+    workers = min(workers or os.cpu_count() or 1, m)
+    if workers <= 1:
+        chains = [_chain(X, codes, n_classes, n_iter, s) for s in seeds]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chains = list(pool.map(_chain, *zip(*[(X, codes, n_classes, n_iter, s) for s in seeds])))
+
+    parts = []
+    for t in targets:
+        rows = np.flatnonzero(codes[t] < 0)
+        drawn = np.stack([chain[t] for chain in chains])  # imputations x gaps
+        parts.append(pd.DataFrame({
+            'Imputation': np.repeat(np.arange(m, dtype=np.int16), len(rows)),
+            'Column': t,
+            'Row': np.tile(rows.astype(np.int32), m),
+            'Value': pd.Categorical.from_codes(drawn.ravel(), categories=categories[t]),
+        }))
+    deltas = pd.concat(parts, ignore_index=True)
+    deltas['Column'] = deltas['Column'].astype('category')
+    return deltas[DELTA_COLUMNS]
+
+def predict_hair_fall_mice(raw: pd.DataFrame, version=None, m: int = N_IMPUTATIONS, n_iter: int = 5,
+                           seed: int = 0, workers: int = 1) -> pd.DataFrame:
+    """multiple_imputation of the raw export's MICE_TARGETS, cached per DatasetVersion when one is given."""
+    def build():
+        return multiple_imputation(predict_hair_fall_features(raw), m=m, n_iter=n_iter, seed=seed, workers=workers)
+    if version is None:
+        return build()
+    return cached_artifact("mice", version, build, params={"targets": MICE_TARGETS, "features": RF_FEATURES,
+                                                           "m": m, "n_iter": n_iter, "seed": seed})
+
+def completed(df: pd.DataFrame, deltas: pd.DataFrame, imputation: int) -> pd.DataFrame:
+    """The imputation-th completed dataset, rebuilt from df and the deltas on demand."""
+    df = df.copy()
+    for column, cells in deltas[deltas['Imputation'] == imputation].groupby('Column', observed=True):
+        values = np.array(df[column], dtype=object)
+        values[cells['Row'].to_numpy()] = cells['Value'].astype(object).to_numpy()
+        df[column] = values
+    return df
+
+def pooled_counts(observed: pd.Series, deltas: pd.DataFrame) -> pd.DataFrame:
+    """
+    Category counts of one column pooled over the imputations: observed count, mean/SD/min/max
+    of the imputed count across imputations, and the mean completed count (Rubin's point estimate).
+    observed must carry the same labels as the deltas (e.g. predict_hair_fall_features(raw)[column]);
+    imputed labels that were never observed raise ValueError.
+    """
+    column = observed.name
+    cells = deltas[deltas['Column'] == column]
+    m = int(deltas['Imputation'].max()) + 1 if len(deltas) else 0
+    per_imputation = (pd.crosstab(cells['Imputation'], cells['Value'].astype(str))
+                      .reindex(index=range(m), fill_value=0))
+    counts = observed.dropna().astype(str).value_counts()
+    unknown = set(per_imputation.columns) - set(counts.index)
+    if unknown:
+        raise ValueError(f"pooled_counts: imputed {column} labels {sorted(unknown)} are not among the observed "
+                         "labels; pass the observed column labelled like the deltas")
+    categories = sorted(counts.index)
+    per_imputation = per_imputation.reindex(columns=categories, fill_value=0)
+    out = pd.DataFrame({
+        'Observed': counts.reindex(categories, fill_value=0),
+        'Imputed_Mean': per_imputation.mean(),
+        'Imputed_SD': per_imputation.std(ddof=1) if m > 1 else 0.0,
+        'Imputed_Min': per_imputation.min(),
+        'Imputed_Max': per_imputation.max(),
+    })
+    out['Pooled'] = out['Observed'] + out['Imputed_Mean']
+    return out
@@ -1,6 +1,14 @@
+import numpy as np
 import pandas as pd
-from scipy.stats import chi2_contingency
+from scipy.stats import chi2 as chi2_distribution
 import statsmodels.api as sm
+from src.artifacts import cached_artifact
+
+# columns whose missingness the Missingness page analyses, and the factors it is tested against
+MISSINGNESS_COLUMNS = ['Medical_Conditions', 'Medications_and_Treatments', 'Nutritional_Deficiencies']
+CHI2_FACTORS = ['Stress_Level', 'Age_Range', 'Genetics', 'Hormonal_Changes', 'Poor_Hair_Care_Habits',
+                'Environmental_Factors', 'Smoking', 'Weight_Loss']
+CHI2_COLUMNS = ['Column', 'Factor', 'Level', 'Count', 'Missing', 'Expected', 'Chi2', 'P_Value', 'Dof']
 
 def missingness_indicator(df: pd.DataFrame, col='Medical_Conditions') -> pd.DataFrame:
     """Add Medical_Conditions_missing column (0/1) and return df copy."""
@@ -8,14 +16,134 @@ def missingness_indicator(df: pd.DataFrame, col='Medical_Conditions') -> pd.Data
     df[f"{col}_missing"] = df[col].isna().astype(int)
     return df
 
+def missingness_bitmask(df: pd.DataFrame, columns=MISSINGNESS_COLUMNS) -> np.ndarray:
+    """Every row's missingness as one integer: bit j is set when columns[j] is missing (at most 63 columns)."""
+    columns = list(columns)
+    if len(columns) > 63:
+        raise ValueError(f"missingness_bitmask: at most 63 columns fit in a bitmask, got {len(columns)}")
+    mask = np.zeros(len(df), dtype=np.int64)
+    for j, col in enumerate(columns):
+        mask |= df[col].isna().to_numpy(dtype=np.int64) << j
+    return mask
+
+def missingness_patterns(df: pd.DataFrame, columns=MISSINGNESS_COLUMNS, by=()) -> pd.DataFrame:
+    """
+    Frequency table of the distinct missingness patterns of columns, most frequent first.
+    Rows are grouped once by (bitmask, *by); everything else is summed from those group counts,
+    so the cost after that pass depends on the number of patterns, not rows x columns.
+    Index Pattern (the bitmask); one bool column per column (True = missing), N_Missing, Count, Share,
+    and for each cohort factor in by one count column per level, named "<factor>=<level>".
+    """
+    columns = list(columns)
+    by = [b for b in by if b in df.columns]
+    keys = pd.DataFrame({'Pattern': missingness_bitmask(df, columns), **{b: df[b].array for b in by}})
+    groups = keys.groupby(['Pattern', *by], observed=True, dropna=False).size()
+    count = groups.groupby(level='Pattern').sum()
+    pattern = count.index.to_numpy()
+    table = pd.DataFrame({col: (pattern >> j) & 1 == 1 for j, col in enumerate(columns)}, index=count.index)
+    table['N_Missing'] = table[columns].sum(axis=1)
+    table['Count'] = count
+    table['Share'] = count / max(len(df), 1)
+    for b in by:
+        cohort = groups.groupby(level=['Pattern', b], observed=True).sum().unstack(b, fill_value=0)
+        cohort.columns = [f"{b}={level}" for level in cohort.columns]
+        table = table.join(cohort)
+    return table.fillna(0).sort_values(['Count', 'N_Missing'], ascending=[False, True])
+
+def one_hot_levels(factors: pd.DataFrame) -> tuple:
+    """(rows x levels) 0/1 matrix of every factor's levels side by side, level labels, owning factor of each level."""
+    blocks, levels, owner = [], [], []
+    for j, col in enumerate(factors.columns):
+        values = factors[col]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            codes, uniques = values.cat.codes.to_numpy(), values.cat.categories
+        else:
+            codes, uniques = pd.factorize(values, sort=True)
+        block = np.zeros((len(values), len(uniques)))
+        present = codes >= 0
+        block[np.flatnonzero(present), codes[present]] = 1.0
+        seen = block.any(axis=0)  # crosstab leaves out levels that never occur
+        blocks.append(block[:, seen])
+        levels.extend(np.asarray(uniques)[seen])
+        owner.extend([j] * int(seen.sum()))
+    return np.hstack(blocks), levels, np.asarray(owner)
+
+def chi2_tables(indicators: pd.DataFrame, factors: pd.DataFrame) -> pd.DataFrame:
+    """
+    chi2_contingency(pd.crosstab(indicator, factor)) for every indicator x factor pair at once.
+    All 2 x levels tables come from one product of the indicator matrix with the factors' one-hot
+    matrix; expected counts, chi2 (with Yates' correction when dof == 1, as scipy) and p-values
+    are computed on the whole block. One row per (indicator, factor, level), see CHI2_COLUMNS;
+    Missing/Expected are the observed/expected counts in the indicator's 1 row.
+    """
+    flags = indicators.to_numpy(dtype=float)
+    onehot, levels, owner = one_hot_levels(factors)
+    starts = np.flatnonzero(np.r_[True, owner[1:] != owner[:-1]])
+
+    count = onehot.sum(axis=0)                       # level sizes (rows with that level)
+    missing = flags.T @ onehot                       # indicators x levels: the 1 row of every table
+    total = np.add.reduceat(count, starts)[owner]    # rows with a non-missing factor value
+    row_missing = np.add.reduceat(missing, starts, axis=1)[:, owner]
+    expected = row_missing * count / total
+    observed = np.stack([missing, count - missing])
+    expected_both = np.stack([expected, count - expected])
+
+    n_levels = np.bincount(owner)
+    n_rows = (row_missing > 0).astype(int) + (row_missing < total)
+    dof = (n_rows[:, starts] - 1) * (n_levels - 1)
+
+    diff = expected_both - observed
+    yates = (dof == 1)[:, owner]
+    observed = np.where(yates, observed + np.sign(diff) * np.minimum(0.5, np.abs(diff)), observed)
+    terms = np.divide((observed - expected_both) ** 2, expected_both,
+                      out=np.zeros_like(expected_both), where=expected_both > 0).sum(axis=0)
+    chi2 = np.where(dof > 0, np.add.reduceat(terms, starts, axis=1), 0.0)
+    p_value = np.where(dof > 0, chi2_distribution.sf(chi2, np.maximum(dof, 1)), 1.0)
+
+    n_ind, n_lev = missing.shape
+    return pd.DataFrame({
+        'Column': np.repeat(list(indicators.columns), n_lev),
+        'Factor': np.tile(np.asarray(factors.columns, dtype=object)[owner], n_ind),
+        'Level': np.tile(np.asarray([str(level) for level in levels], dtype=object), n_ind),
+        'Count': np.tile(count, n_ind).astype(int),
+        'Missing': missing.ravel().astype(int),
+        'Expected': expected.ravel(),
+        'Chi2': chi2[:, owner].ravel(),
+        'P_Value': p_value[:, owner].ravel(),
+        'Dof': dof[:, owner].ravel(),
+    }, columns=CHI2_COLUMNS)
+
+def chi2_missingness(df: pd.DataFrame, version=None, columns=MISSINGNESS_COLUMNS, factors=CHI2_FACTORS) -> pd.DataFrame:
+    """
+    chi2_tables of the missingness of columns against factors (those present in df).
+    With a DatasetVersion the whole table is cached in the artifact store for that version.
+    """
+    columns = [c for c in columns if c in df.columns]
+    factors = [f for f in factors if f in df.columns]
+    def build():
+        return chi2_tables(df[columns].isna(), df[factors])
+    if version is None:
+        return build()
+    return cached_artifact("chi2_missingness", version, build, params={"columns": columns, "factors": factors})
+
+def chi2_result(table: pd.DataFrame, column: str, factor: str) -> tuple:
+    """
+    (chi2, p_value, dof, levels) of one pair of a chi2_tables result; levels is indexed by
+    Level with the Count/Missing/Expected columns.
+    """
+    pair = table[(table['Column'] == column) & (table['Factor'] == factor)]
+    first = pair.iloc[0]
+    return (float(first['Chi2']), float(first['P_Value']), int(first['Dof']),
+            pair.set_index('Level')[['Count', 'Missing', 'Expected']])
+
 def chi2_test_between(df: pd.DataFrame, missing_col: str, factor_col: str) -> tuple:
     """
     Run chi2 on contingency table between missing indicator and a factor column.
     Returns (chi2, p_value, dof, expected)
     """
-    contingency = pd.crosstab(df[missing_col], df[factor_col])
-    chi2, p, dof, ex = chi2_contingency(contingency)
-    return chi2, p, dof, ex
+    chi2, p, dof, levels = chi2_result(chi2_tables(df[[missing_col]] == 1, df[[factor_col]]), missing_col, factor_col)
+    expected = np.vstack([levels['Count'] - levels['Expected'], levels['Expected']])
+    return chi2, p, dof, expected
 
 def logistic_missingness(df: pd.DataFrame, y_col='Medical_Conditions_missing', x_cols=None):
     """
@@ -29,17 +157,27 @@ def logistic_missingness(df: pd.DataFrame, y_col='Medical_Conditions_missing', x
     model = sm.Logit(y, sm.add_constant(X)).fit(disp=False)  # disp=False silences output
     return model
 
-def impute_medical_condition_mode(row, df):
-    
-    if pd.isna(row['Medical_Conditions']):
-        # Get the group based on Age_Range and Stress_Level
-        group = df[(df['Age_Range'] == row['Age_Range']) & 
-                   (df['Stress_Level'] == row['Stress_Level'])]
-        # Get the mode (most frequent value)
-        mode_value = group['Medical_Conditions'].mode()
-        if not mode_value.empty:
-            return mode_value[0]
-        else:
-            return 'Unknown'  # fallback if no mode exists
-    else:
-        return row['Medical_Conditions']
+MEDICAL_MODE_GROUPS = ['Age_Range', 'Stress_Level']
+NUTRITIONAL_MODE_GROUPS = ['Age_Range']
+
+def group_modes(df: pd.DataFrame, col: str, by: list) -> pd.Series:
+    """
+    Most frequent non-missing df[col] value of every by-group, indexed by the group keys.
+    Ties go to the smallest value, as Series.mode()[0] does; rows with a missing key are ignored.
+    """
+    observed = df[by + [col]].dropna()
+    counts = observed.groupby(by + [col], observed=True, sort=False).size().reset_index(name='_count')
+    counts = counts.sort_values(['_count', col], ascending=[False, True], kind='stable')
+    return counts.drop_duplicates(by).set_index(by)[col]
+
+def impute_group_mode(df: pd.DataFrame, col: str, by: list, reference: pd.DataFrame = None,
+                      fallback='Unknown') -> pd.Series:
+    """
+    df[col] with every gap filled by the mode of its by-group in reference (default: df itself).
+    Groups without an observed value, and rows with a missing key, get fallback.
+    One groupby for the modes and one join to fill, instead of a group scan per missing row.
+    """
+    modes = group_modes(df if reference is None else reference, col, by).rename('_mode')
+    filled = df[by].merge(modes, left_on=by, right_index=True, how='left')['_mode']
+    filled = filled.astype(object).where(filled.notna(), fallback).to_numpy()
+    return df[col].where(df[col].notna(), filled)
@@ -0,0 +1,144 @@
+# src/missingness_models.py
+import threading
+from itertools import combinations
+import numpy as np
+import pandas as pd
+from scipy.special import expit, log_expit
+from scipy.stats import norm
+from src.artifacts import cached_artifact
+from src.missingness import MISSINGNESS_COLUMNS
+from src.rf_imputer import predict_hair_fall_features
+
+# Logistic models of the missingness indicators of the raw Predict Hair Fall export, fitted
+# for every subset of the candidate predictors at once: all models with the same number of
+# terms share one stacked design array and are solved together by Newton/IRLS steps.
+# Tables are cached per dataset version and memoized per (version, indicator, predictor set).
+CANDIDATE_PREDICTORS = ['Genetic_Encoding', 'Hormonal_Encoding', 'Poor_Hair_Care_Encoding', 'Environmental_Encoding',
+                        'Smoking_Encoding', 'Weight_Loss_Encoding', 'Stress_Level', 'Age']
+LOGIT_COLUMNS = ['Indicator', 'Predictors', 'Term', 'Coef', 'Std_Err', 'Z', 'P_Value', 'CI_Low', 'CI_High',
+                 'LogLik', 'AIC', 'Converged']
+
+_fits = {}  # (version key, indicator, predictors) -> that model's rows of LOGIT_COLUMNS
+_fits_lock = threading.Lock()
+
+def fit_logit_batch(X: np.ndarray, y: np.ndarray, max_iter: int = 50, tol: float = 1e-8) -> tuple:
+    """
+    Maximum-likelihood logistic regressions for a stack of models: X is (models, rows, terms),
+    y (models, rows) of 0/1. Every Newton step solves all the models' (terms x terms) systems at once.
+    Returns (coefficients, covariances, log-likelihoods, converged), one entry per model.
+    Separated models (an indicator with a handful of gaps) drift off without converging; a tiny
+    ridge keeps their steps solvable, they are dropped from the iteration once a coefficient
+    runs away, and come back with converged False.
+    """
+    beta = np.zeros(X.shape[::2])
+    converged = np.zeros(len(X), dtype=bool)
+    ridge = 1e-10 * np.eye(X.shape[2])
+    active = np.arange(len(X))
+    for _ in range(max_iter):
+        Xa = X[active]
+        p = expit(np.matmul(Xa, beta[active, :, None])[..., 0])
+        grad = np.matmul((y[active] - p)[:, None, :], Xa)[:, 0]
+        hess = np.matmul(Xa.transpose(0, 2, 1) * (p * (1 - p))[:, None, :], Xa)
+        step = np.linalg.solve(hess + ridge, grad[..., None])[..., 0]
+        beta[active] += step
+        done = np.abs(step).max(axis=1) < tol
+        converged[active[done]] = True
+        # a coefficient this large means fitted probabilities of ~0/1: separated, stop iterating
+        active = active[~done & (np.abs(beta[active]).max(axis=1) < 50)]
+        if not len(active):
+            break
+    eta = np.matmul(X, beta[..., None])[..., 0]
+    p = expit(eta)
+    cov = np.linalg.pinv(np.matmul(X.transpose(0, 2, 1) * (p * (1 - p))[:, None, :], X))
+    loglik = (y * log_expit(eta) + (1 - y) * log_expit(-eta)).sum(axis=1)
+    return beta, cov, loglik, converged
+
+def _model_rows(indicators: list, predictor_sets: list, beta, cov, loglik, converged) -> pd.DataFrame:
+    se = np.sqrt(np.diagonal(cov, axis1=1, axis2=2))
+    z = beta / se
+    half = norm.ppf(0.975) * se
+    n_terms = beta.shape[1]
+    return pd.DataFrame({
+        'Indicator': np.repeat(indicators, n_terms),
+        'Predictors': np.repeat(['+'.join(s) for s in predictor_sets], n_terms),
+        'Term': [term for s in predictor_sets for term in ['const', *s]],
+        'Coef': beta.ravel(), 'Std_Err': se.ravel(), 'Z': z.ravel(), 'P_Value': (2 * norm.sf(np.abs(z))).ravel(),
+        'CI_Low': (beta - half).ravel(), 'CI_High': (beta + half).ravel(),
+        'LogLik': np.repeat(loglik, n_terms), 'AIC': np.repeat(2 * n_terms - 2 * loglik, n_terms),
+        'Converged': np.repeat(converged, n_terms),
+    }, columns=LOGIT_COLUMNS)
+
+def fit_models(df: pd.DataFrame, models: list) -> pd.DataFrame:
+    """
+    Fit (indicator column, predictor list) models on df, batching the ones with equally many predictors
+    into one fit_logit_batch call over a shared design matrix. One row per model term (LOGIT_COLUMNS).
+    """
+    predictors = list(dict.fromkeys(p for _, preds in models for p in preds))
+    design = np.column_stack([np.ones(len(df)), df[predictors].to_numpy(dtype=float)])
+    position = {p: j + 1 for j, p in enumerate(predictors)}
+    parts = []
+    for size in sorted({len(preds) for _, preds in models}):
+        batch = [(ind, list(preds)) for ind, preds in models if len(preds) == size]
+        columns = np.array([[0] + [position[p] for p in preds] for _, preds in batch])
+        X = design[:, columns].transpose(1, 0, 2)
+        y = np.stack([df[ind].to_numpy(dtype=float) for ind, _ in batch])
+        parts.append(_model_rows([ind for ind, _ in batch], [preds for _, preds in batch], *fit_logit_batch(X, y)))
+    return pd.concat(parts, ignore_index=True)
+
+def missingness_design(raw: pd.DataFrame, columns=MISSINGNESS_COLUMNS) -> pd.DataFrame:
+    """Encoded predictors of the raw export plus a 0/1 <col>_missing indicator per column."""
+    df = predict_hair_fall_features(raw)
+    return df.assign(**{f"{c}_missing": df[c].isna().to_numpy(dtype=int) for c in columns})
+
+def all_subset_models(raw: pd.DataFrame, version=None, columns=MISSINGNESS_COLUMNS,
+                      candidates=CANDIDATE_PREDICTORS, max_size: int = None) -> pd.DataFrame:
+    """
+    Logit models of every <col>_missing indicator on every non-empty subset of candidates (up to
+    max_size predictors), cached per DatasetVersion when one is given. Rank them with the AIC column.
+    """
+    candidates = list(candidates)
+    max_size = max_size or len(candidates)
+    def build():
+        models = [(f"{c}_missing", list(s)) for c in columns
+                  for k in range(1, max_size + 1) for s in combinations(candidates, k)]
+        return fit_models(missingness_design(raw, columns), models)
+    if version is None:
+        return build()
+    return cached_artifact("missingness_logits", version, build,
+                           params={"columns": list(columns), "candidates": candidates, "max_size": max_size})
+
+def logit_summary(raw: pd.DataFrame, version, indicator: str, predictors: list) -> pd.DataFrame:
+    """
+    Coefficient table of one missingness model, shaped like statsmodels' summary (index Term;
+    coef, std err, z, P>|z|, [0.025, 0.975]). Memoized per (version, indicator, predictors) when a
+    version is given;
+    a subset of CANDIDATE_PREDICTORS is read from all_subset_models, anything else is fitted on its own.
+    """
+    key = None if version is None else (version.key, indicator, tuple(predictors))
+    with _fits_lock:
+        rows = _fits.get(key)
+    if rows is None:
+        ordered = [p for p in CANDIDATE_PREDICTORS if p in predictors]
+        if indicator.endswith("_missing") and len(ordered) == len(predictors):
+            models = all_subset_models(raw, version)
+            rows = models[(models['Indicator'] == indicator) & (models['Predictors'] == '+'.join(ordered))]
+        if rows is None or rows.empty:
+            rows = fit_models(missingness_design(raw), [(indicator, list(predictors))])
+        rows = rows.set_index('Term').loc[['const', *predictors]].reset_index()
+        if key is not None:
+            with _fits_lock:
+                _fits[key] = rows
+    return (rows.set_index('Term')[['Coef', 'Std_Err', 'Z', 'P_Value', 'CI_Low', 'CI_High']]
+            .rename(columns={'Coef': 'coef', 'Std_Err': 'std err', 'Z': 'z', 'P_Value': 'P>|z|',
+                             'CI_Low': '[0.025', 'CI_High': '0.975]'}))
+
+def logit_table_html(summary: pd.DataFrame, text_color: str = "#333") -> str:
+    """logit_summary as the HTML table the Missingness page used to hand-type."""
+    head = "".join(f"<th>{c}</th>" for c in summary.columns)
+    body = "".join(
+        f"<tr><td>{term}</td><td>{r['coef']:.4f}</td><td>{r['std err']:.3f}</td><td>{r['z']:.3f}</td>"
+        f"<td>{r['P>|z|']:.3f}</td><td>{r['[0.025']:.3f}</td><td>{r['0.975]']:.3f}</td></tr>"
+        for term, r in summary.iterrows())
+    return (f'<table style="width:70%; border-collapse:collapse; font-size:16px; color:{text_color}; '
+            f'margin-left:auto; margin-right:auto;">'
+            f'<tr style="background-color:#f2f2f2;"><th> </th>{head}</tr>{body}</table>')
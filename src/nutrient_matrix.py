@@ -0,0 +1,157 @@
+# src/nutrient_matrix.py
+import json
+import os
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from src.catalog import dataset_version, get_catalog
+from src.data_io import CACHE_DIRNAME, DATA_DIR
+from src.schemas import NUTRIENT_COLUMNS
+
+DATASET = "nutrition_cleaned"
+MATRIX_PATH = DATA_DIR / CACHE_DIRNAME / "nutrient_matrix.npy"
+INDEX_PATH = DATA_DIR / CACHE_DIRNAME / "nutrient_matrix.json"
+# food names as fixed-width UTF-8 .npy arrays, memory-mapped like the matrix: one per row in
+# dataset order, and the distinct names sorted (with their first row) for searchsorted lookups
+FOODS_PATH = DATA_DIR / CACHE_DIRNAME / "nutrient_foods.npy"
+FOOD_INDEX_PATH = DATA_DIR / CACHE_DIRNAME / "nutrient_food_index.npy"
+
+def _save_atomic(array: np.ndarray, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as fh:
+        np.save(fh, array)
+    os.replace(tmp, path)
+
+def write_food_index(foods, foods_path=FOODS_PATH, food_index_path=FOOD_INDEX_PATH) -> None:
+    """Write the per-row food names and the sorted (name, first row) index NutrientMatrix maps."""
+    names = np.char.encode(np.asarray(foods, dtype=str), "utf-8") if len(foods) else np.empty(0, dtype="S1")
+    order = np.argsort(names, kind="stable")
+    ordered = names[order]
+    first = np.r_[True, ordered[1:] != ordered[:-1]] if len(ordered) else np.empty(0, dtype=bool)
+    index = np.empty(int(first.sum()), dtype=[("name", names.dtype), ("row", np.int64)])
+    index["name"], index["row"] = ordered[first], order[first]  # duplicates resolve to the first row
+    _save_atomic(names, Path(foods_path))
+    _save_atomic(index, Path(food_index_path))
+
+def write_sidecar(version, index_path=INDEX_PATH) -> None:
+    """The version stamp (+ column names); written last, so it never vouches for stale arrays."""
+    index_path = Path(index_path)
+    tmp = index_path.with_name(f"{index_path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps({"version": version, "columns": NUTRIENT_COLUMNS}))
+    os.replace(tmp, index_path)
+
+def build_nutrient_matrix(df: pd.DataFrame = None, version=None, matrix_path=MATRIX_PATH, index_path=INDEX_PATH,
+                          foods_path=FOODS_PATH, food_index_path=FOOD_INDEX_PATH) -> None:
+    """
+    Write the 34 nutrient columns as a float32 (foods x nutrients) .npy matrix, the title-cased
+    Food name of every row (write_food_index) and a JSON sidecar stamped with the data's version.
+    Without df the catalog's frame and its version are used; a df passed in is stamped with
+    version (its DatasetVersion), or left unversioned so get_nutrient_matrix() never trusts it.
+    """
+    if df is None:
+        version = dataset_version(DATASET)
+        df = get_catalog().get(DATASET)
+    matrix = np.ascontiguousarray(df[NUTRIENT_COLUMNS].to_numpy(dtype=np.float32, na_value=np.nan))
+    # write-then-rename; the sidecar goes last so a reader never pairs it with a stale matrix
+    _save_atomic(matrix, Path(matrix_path))
+    write_food_index(df["Food"].astype(str).str.title().to_numpy(), foods_path, food_index_path)
+    write_sidecar(version.key if version is not None else None, index_path)
+
+class NutrientMatrix:
+    """
+    Read-only, memory-mapped view of the nutrient matrix.
+    Rows are foods (in dataset order), columns are NUTRIENT_COLUMNS. Opening it maps the arrays
+    and reads a two-key JSON stamp; nothing is parsed per food.
+    """
+
+    def __init__(self, matrix_path=MATRIX_PATH, index_path=INDEX_PATH,
+                 foods_path=FOODS_PATH, food_index_path=FOOD_INDEX_PATH):
+        index = json.loads(Path(index_path).read_text())
+        self.values = np.load(matrix_path, mmap_mode="r")
+        self.columns = index["columns"]
+        self.version = index.get("version")
+        self._names = np.load(foods_path, mmap_mode="r")
+        self._index = np.load(food_index_path, mmap_mode="r")
+        if len(self._names) != len(self.values):
+            raise ValueError(f"{Path(foods_path).name} does not match {Path(matrix_path).name}")
+        self._col = {c: i for i, c in enumerate(self.columns)}
+        self._unique = {}
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def food_options(self) -> list:
+        """Sorted unique food names."""
+        return np.char.decode(self._index["name"], "utf-8").tolist()
+
+    def row_of(self, food: str) -> int:
+        """Row of the first entry for food (KeyError when absent), by binary search of the name index."""
+        key = food.encode("utf-8")
+        names = self._index["name"]
+        at = int(np.searchsorted(names, key))
+        if at == len(names) or names[at] != key:
+            raise KeyError(food)
+        return int(self._index["row"][at])
+
+    def food(self, row: int) -> str:
+        return self._names[row].decode("utf-8")
+
+    def row(self, food: str, cols=None) -> np.ndarray:
+        """Nutrient values for one food, optionally restricted to cols."""
+        values = self.values[self.row_of(food)]
+        return values if cols is None else values[[self._col[c] for c in cols]]
+
+    def column(self, name: str) -> np.ndarray:
+        return self.values[:, self._col[name]]
+
+    def unique(self, name: str) -> np.ndarray:
+        """Sorted distinct non-NaN values of a column (memoized)."""
+        if name not in self._unique:
+            col = np.asarray(self.column(name))
+            self._unique[name] = np.unique(col[~np.isnan(col)])
+        return self._unique[name]
+
+    def top_n(self, metric: str, n: int, rows=None) -> np.ndarray:
+        """
+        Row numbers of the n largest values of metric (NaNs skipped), largest first.
+        rows restricts the search to a subset (boolean mask or row numbers).
+        """
+        candidates = np.arange(len(self)) if rows is None else np.arange(len(self))[rows]
+        vals = np.asarray(self.column(metric)[candidates])
+        keep = ~np.isnan(vals)
+        candidates, vals = candidates[keep], vals[keep]
+        if n < len(vals):
+            part = np.argpartition(-vals, n - 1)[:n]
+            candidates, vals = candidates[part], vals[part]
+        return candidates[np.argsort(-vals, kind="stable")]
+
+    def frame(self, rows, cols) -> pd.DataFrame:
+        """Small DataFrame (Food + cols) for the given row numbers."""
+        rows = np.asarray(rows)
+        out = pd.DataFrame(self.values[np.ix_(rows, [self._col[c] for c in cols])], columns=cols)
+        out.insert(0, "Food", [self.food(i) for i in rows])
+        return out
+
+_matrix = None
+
+def get_nutrient_matrix() -> NutrientMatrix:
+    """Process-wide matrix, (re)built whenever the cleaned nutrition dataset version changes."""
+    global _matrix
+    version = dataset_version(DATASET).key
+    if _matrix is not None and _matrix.version == version:
+        return _matrix
+    try:
+        matrix = NutrientMatrix()
+        if matrix.version != version:
+            raise FileNotFoundError
+    except (FileNotFoundError, ValueError, KeyError, json.JSONDecodeError):
+        build_nutrient_matrix()
+        matrix = NutrientMatrix()
+    _matrix = matrix
+    return _matrix
+
+if __name__ == "__main__":
+    build_nutrient_matrix()
+    m = NutrientMatrix()
+    print(f"{len(m)} foods x {len(m.columns)} nutrients -> {MATRIX_PATH}")
@@ -0,0 +1,127 @@
+# src/nutrition_cleaning.py
+import os
+import shutil
+from contextlib import ExitStack
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from src.data_io import DATA_DIR, file_version
+from src.nutrient_matrix import (FOOD_INDEX_PATH, FOODS_PATH, INDEX_PATH, MATRIX_PATH, write_food_index,
+                                 write_sidecar)
+from src.schemas import NUTRIENT_COLUMNS, NUTRITION_CLEANED_SCHEMA
+
+# The cleaning from data_cleaning_nutrition_dataset.ipynb as a streaming job: the raw export
+# is read in chunks, names are normalized with vectorized string ops, repeated foods are
+# dropped through an index of food-name hashes, and the nutrient matrix the EDA page reads
+# (src/nutrient_matrix.py) is written alongside the cleaned CSV in the same pass.
+RAW_EXPORT = DATA_DIR / "Nutrition_Dataset.csv"
+CLEANED_CSV = DATA_DIR / "Cleaned_Nutrition_Dataset.csv"
+DROP_COLUMNS = ['Unnamed: 0']
+
+def normalize_nutrition_columns(columns) -> list:
+    """'Caloric Value' -> 'Caloric_Value', ' food' -> 'Food'."""
+    return [col.strip().replace('_', ' ').title().replace(' ', '_') for col in columns]
+
+def normalize_food_names(foods: pd.Series) -> pd.Series:
+    return foods.str.strip().str.title()
+
+def clean_nutrition_chunk(raw: pd.DataFrame) -> pd.DataFrame:
+    """Notebook steps for one block of rows: drop the index column, rename, title-case Food."""
+    df = raw.drop(columns=[c for c in DROP_COLUMNS if c in raw.columns])
+    df.columns = normalize_nutrition_columns(df.columns)
+    df['Food'] = normalize_food_names(df['Food'])
+    return df
+
+class FoodHashIndex:
+    """
+    Sorted uint64 hashes of the (normalized) food names kept so far; drops later rows for a
+    food already seen, within or across chunks. The first row of every food wins.
+    """
+
+    def __init__(self, key: str = 'Food'):
+        self.key = key
+        self._seen = np.empty(0, dtype=np.uint64)
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+    def new_rows(self, df: pd.DataFrame) -> np.ndarray:
+        """Boolean mask of the rows of df whose food was not seen before; records those foods."""
+        hashes = pd.util.hash_pandas_object(df[self.key], index=False).to_numpy()
+        # sorted distinct hashes of the chunk (+ first row of each): the lookups into the
+        # sorted index then walk it in order, and the new ones are merged in with one insert
+        unique, first = np.unique(hashes, return_index=True)
+        at = np.searchsorted(self._seen, unique)
+        new = at == len(self._seen)
+        if len(self._seen):
+            new |= self._seen[np.minimum(at, len(self._seen) - 1)] != unique
+        self._seen = np.insert(self._seen, at[new], unique[new])
+        keep = np.zeros(len(hashes), dtype=bool)
+        keep[first[new]] = True
+        return keep
+
+def _tmp(path: Path) -> Path:
+    return path.with_name(f"{path.name}.{os.getpid()}.tmp")
+
+def clean_nutrition_csv(src=RAW_EXPORT, dst=CLEANED_CSV, chunksize: int = 200_000,
+                        matrix_path=MATRIX_PATH, index_path=INDEX_PATH, foods_path=FOODS_PATH,
+                        food_index_path=FOOD_INDEX_PATH) -> dict:
+    """
+    Stream-clean the raw export into dst and emit the float32 nutrient matrix (+ food index and JSON
+    sidecar) for it, stamped with dst's new version so get_nutrient_matrix() uses it without a rebuild.
+    Only one chunk of rows is in memory at a time (plus the food names for the index).
+    Pass matrix_path=None to skip the matrix. Returns {"rows": n, "duplicates": n}.
+    """
+    dst = Path(dst)
+    body = None if matrix_path is None else _tmp(Path(matrix_path).with_suffix(".body"))
+    seen, foods = FoodHashIndex(), []
+    rows = duplicates = 0
+    try:
+        with ExitStack() as files:
+            out = files.enter_context(open(_tmp(dst), "w", newline=""))
+            values = files.enter_context(open(body, "wb")) if body else None
+            for chunk in pd.read_csv(src, chunksize=chunksize):
+                cleaned = clean_nutrition_chunk(chunk)
+                keep = seen.new_rows(cleaned)
+                duplicates += int((~keep).sum())
+                cleaned = cleaned[keep]
+                cleaned.to_csv(out, header=rows == 0, index=False)
+                rows += len(cleaned)
+                if values:
+                    values.write(np.ascontiguousarray(
+                        cleaned[NUTRIENT_COLUMNS].to_numpy(dtype=np.float32, na_value=np.nan)).tobytes())
+                    foods.append(cleaned['Food'].astype(str).to_numpy())
+        os.replace(_tmp(dst), dst)
+        if body:
+            _write_matrix(body, rows, Path(matrix_path))
+            write_food_index(np.concatenate(foods) if foods else [], foods_path, food_index_path)
+            write_sidecar(file_version(dst, NUTRITION_CLEANED_SCHEMA).key, index_path)
+    finally:
+        for tmp in (_tmp(dst), body):
+            if tmp and tmp.exists():
+                tmp.unlink()
+    return {"rows": rows, "duplicates": duplicates}
+
+def _write_matrix(body: Path, rows: int, matrix_path: Path) -> None:
+    # the row count is only known at the end, so the .npy header is written last and the
+    # streamed float32 body copied behind it; food index and sidecar follow, as in build_nutrient_matrix
+    matrix_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = _tmp(matrix_path)
+    with open(tmp, "wb") as fh, open(body, "rb") as src:
+        np.lib.format.write_array_header_1_0(fh, {"descr": np.lib.format.dtype_to_descr(np.dtype(np.float32)),
+                                                  "fortran_order": False, "shape": (rows, len(NUTRIENT_COLUMNS))})
+        shutil.copyfileobj(src, fh, 1 << 24)
+    os.replace(tmp, matrix_path)
+
+if __name__ == "__main__":
+    import argparse
+    import time
+    parser = argparse.ArgumentParser(description="Stream-clean the raw nutrition export and emit the nutrient matrix.")
+    parser.add_argument("--src", default=str(RAW_EXPORT))
+    parser.add_argument("--dst", default=str(CLEANED_CSV))
+    parser.add_argument("--chunksize", type=int, default=200_000)
+    parser.add_argument("--no-matrix", action="store_true", help="only write the cleaned CSV")
+    args = parser.parse_args()
+    start = time.perf_counter()
+    result = clean_nutrition_csv(args.src, args.dst, args.chunksize, None if args.no_matrix else MATRIX_PATH)
+    print(f"{result} -> {args.dst} in {time.perf_counter() - start:.1f}s")
@@ -4,31 +4,21 @@ import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 import streamlit as st
-from scipy import stats
+from src.missingness_models import logit_summary, logit_table_html
+from src.rf_imputer import impute_predict_hair_fall
+from src.viz import render_mice_section
+from src.missingness import NUTRITIONAL_MODE_GROUPS, chi2_missingness, chi2_result, impute_group_mode
 
 sns.set_style("whitegrid")
 
-def impute_nutritional_mode(row, df):
-    """
-    Fill missing Nutritional_Deficiencies values with the mode within the same Age_Range.
-    If no mode exists for that group, return 'Unknown'.
-    """
-    if pd.isna(row['Nutritional_Deficiencies']):
-        group = df[df['Age_Range'] == row['Age_Range']]
-        mode_val = group['Nutritional_Deficiencies'].mode()
-        if not mode_val.empty:
-            return mode_val[0]
-        else:
-            return 'Unknown'
-    else:
-        return row['Nutritional_Deficiencies']
-
 def render_nutritional_missingness(hair_raw, df_raw, df_cleaned,
                                   HEADER_COLOR="#2E8B57", TEXT="#333",
-                                  SECTION_BG="#F0F8F5", ACCENT="#2E8B57"):
+                                  SECTION_BG="#F0F8F5", ACCENT="#2E8B57", version=None):
     """
     Renders the Nutritional_Deficiencies missingness + imputation comparisons in Streamlit.
     Expects hair_raw (for missingness analysis), df_raw (before imputation), df_cleaned (after RF imputation).
+    With version (df_raw's DatasetVersion) the chi-squared tables are cached for it and the RF imputation
+    is computed by src.rf_imputer instead of read from df_cleaned; the src.mice imputations are cached for it too.
     """
 
     st.markdown(f"""
@@ -74,8 +64,8 @@ def render_nutritional_missingness(hair_raw, df_raw, df_cleaned,
 
     # Chi-squared test
     st.markdown(f"<h2 style='color:{HEADER_COLOR}; font-size:22px; text-align:center'; >Chi-Squared Tests for Missingness</h2>", unsafe_allow_html=True)
-    contingency_age = pd.crosstab(hair_raw['Nutritional_Deficiencies_missing'], hair_raw['Age_Range'])
-    chi2_age, p_age, dof_age, ex_age = stats.chi2_contingency(contingency_age)
+    chi2_age, p_age, dof_age, levels_age = chi2_result(chi2_missingness(hair_raw, version=version),
+                                                       'Nutritional_Deficiencies', 'Age_Range')
 
     st.markdown(
         f"""
@@ -89,11 +79,10 @@ def render_nutritional_missingness(hair_raw, df_raw, df_cleaned,
     )
 
     # Bar: observed vs expected for Age
-    x = np.arange(len(contingency_age.columns))
+    x = np.arange(len(levels_age))
     width = 0.35
     fig, ax = plt.subplots(figsize=(8,5))
-    obs = contingency_age.loc[1] if 1 in contingency_age.index else pd.Series(0,index=contingency_age.columns)
-    exp = pd.Series(ex_age[1], index=contingency_age.columns) if ex_age.shape[0] > 1 else pd.Series(0,index=contingency_age.columns)
+    obs, exp = levels_age['Missing'], levels_age['Expected']
     ax.bar(x - width/2, obs, width, label='Observed', color='#A8D5BA')
     ax.bar(x + width/2, exp, width, label='Expected', color='#5d9189')
     ax.set_xticks(x)
@@ -106,7 +95,7 @@ def render_nutritional_missingness(hair_raw, df_raw, df_cleaned,
 
     st.markdown("<hr style='border:2px solid #AAA; margin:16px 0;'>", unsafe_allow_html=True)
 
-    # Logistic regression static table for Nutritional_Deficiencies
+    # Logistic regression for Nutritional_Deficiencies (fitted per dataset version)
     st.markdown(f"<h2 style='color:{HEADER_COLOR}; font-size:22px; text-align:center'; >Logistic Regression for Missingness in Nutritional Deficiencies</h2>", unsafe_allow_html=True)
     st.markdown(
         f"""
@@ -117,25 +106,14 @@ def render_nutritional_missingness(hair_raw, df_raw, df_cleaned,
         unsafe_allow_html=True
     )
 
-    st.markdown(
-        f"""
-        <table style="width:70%; border-collapse:collapse; font-size:16px; color:{TEXT}; margin-left:auto; margin-right:auto;">
-        <tr style="background-color:#f2f2f2;">
-            <th> </th><th>coef</th><th>std err</th><th>z</th><th>P>|z|</th><th>[0.025</th><th>0.975]</th>
-        </tr>
-        <tr><td>const</td><td>4.7461</td><td>0.711</td><td>6.679</td><td>0.000</td><td>3.353</td><td>6.139</td></tr>
-        <tr><td>Weight_Loss_Encoding</td><td>-0.1755</td><td>0.269</td><td>-0.653</td><td>0.514</td><td>-0.703</td><td>0.351</td></tr>
-        <tr><td>Genetic_Encoding</td><td>0.1333</td><td>0.269</td><td>0.496</td><td>0.620</td><td>-0.394</td><td>0.660</td></tr>
-        <tr><td>Age</td><td>-0.2659</td><td>0.029</td><td>-9.099</td><td>0.002</td><td>-0.323</td><td>-0.209</td></tr>
-        </table>
-        """,
-        unsafe_allow_html=True
-    )
+    nutritional_logit = logit_summary(df_raw, version, 'Nutritional_Deficiencies_missing',
+                                      ['Weight_Loss_Encoding', 'Genetic_Encoding', 'Age'])
+    st.markdown(logit_table_html(nutritional_logit, TEXT), unsafe_allow_html=True)
 
     st.markdown(
         f"""
         <p style="font-size:18px; color:{TEXT}; line-height:1.5;">
-        We can observe that the <b>p-value for Age</b> is very low (0.002), indicating that it is statistically significant. 
+        We can observe that the <b>p-value for Age</b> is very low ({nutritional_logit.loc['Age', 'P>|z|']:.3f}), indicating that it is statistically significant. 
         This confirms that <b>Age</b> has a meaningful relationship with the missingness of <b>Nutritional_Deficiencies</b>.
         </p>
         """,
@@ -159,7 +137,7 @@ def render_nutritional_missingness(hair_raw, df_raw, df_cleaned,
     labels = ['18-30', '30-40', '40-51']
     if 'Age' in df_nut_mode.columns:
         df_nut_mode['Age_Range'] = pd.cut(df_nut_mode['Age'], bins=bins, labels=labels, right=False)
-    df_nut_mode['Nutritional_Deficiencies'] = df_nut_mode.apply(lambda row: impute_nutritional_mode(row, df_nut_mode), axis=1)
+    df_nut_mode['Nutritional_Deficiencies'] = impute_group_mode(df_nut_mode, 'Nutritional_Deficiencies', NUTRITIONAL_MODE_GROUPS)
 
     # Plot before vs after mode
     count_raw_nut = df_raw['Nutritional_Deficiencies'].value_counts().sort_index()
@@ -195,7 +173,11 @@ def render_nutritional_missingness(hair_raw, df_raw, df_cleaned,
 
     # Prepare cleaned vs raw plotting
     df_raw_copy = df_raw.copy()
-    df_cleaned_copy = df_cleaned.copy()
+    if version is not None:
+        # imputer fitted (or warm-started) for this raw version, instead of the notebook's output
+        df_cleaned_copy = df_raw.assign(Nutritional_Deficiencies=impute_predict_hair_fall(df_raw, 'Nutritional_Deficiencies', version).to_numpy())
+    else:
+        df_cleaned_copy = df_cleaned.copy()
     if 'Nutritional_Deficiencies' in df_raw_copy.columns:
         df_raw_copy['Nutritional_Deficiencies'] = df_raw_copy['Nutritional_Deficiencies'].dropna().astype(str).str.strip().str.title()
     if 'Nutritional_Deficiencies' in df_cleaned_copy.columns:
@@ -234,6 +216,12 @@ def render_nutritional_missingness(hair_raw, df_raw, df_cleaned,
     </div>
     """, unsafe_allow_html=True)
 
+    st.markdown("<br>", unsafe_allow_html=True)
+    # ---- Multiple imputation (chained equations), pooled over the imputations ----
+    render_mice_section(df_raw, version, 'Nutritional_Deficiencies', 'Nutritional Deficiencies',
+                        heading='Third Method: Multiple Imputation (MICE) (Nutritional Deficiencies)',
+                        HEADER_COLOR=HEADER_COLOR, TEXT=TEXT)
+
     st.markdown("<br>", unsafe_allow_html=True)
 
     # done
@@ -0,0 +1,164 @@
+# src/rf_imputer.py
+import pickle
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from src.artifacts import cached_artifact, latest_artifact, load_artifact, save_artifact
+from src.cleaning import PREDICT_CLEANING_STEPS, CleaningPipeline, label_encode_features
+
+# The Random Forest imputation of data_cleaning_predit_hair_loss.ipynb ("Second Method" on the
+# Missingness page) as a reusable imputer. Trees are built in parallel and only the imputed
+# column is cached per dataset version, so a version's result never depends on what else is in
+# the local store. Opt-in warm starts keep a single fitted forest per target and grow it forward
+# instead of growing the whole forest again.
+RF_FEATURES = ['Stress_Level', 'Age_Range', 'Genetic_Encoding', 'Hormonal_Changes',
+               'Smoking', 'Weight_Loss', 'Environmental_Factors']
+
+class RandomForestImputer:
+    """
+    Fill the gaps of one categorical column with a RandomForestClassifier over feature columns.
+    Text/categorical features are label encoded (sorted labels, as LabelEncoder), numeric ones used as-is.
+    """
+
+    def __init__(self, target: str, features=RF_FEATURES, n_estimators: int = 1000,
+                 n_jobs: int = -1, random_state: int = 42):
+        self.target = target
+        self.features = list(features)
+        self.n_estimators = n_estimators
+        self.n_jobs = n_jobs
+        self.random_state = random_state
+        self.model = None
+        self.classes_ = None
+        self.categories_ = {}
+        self.updates_ = 0
+
+    @property
+    def params(self) -> dict:
+        """What the fitted forest depends on (n_jobs only changes how fast it is built)."""
+        return {"target": self.target, "features": self.features,
+                "n_estimators": self.n_estimators, "random_state": self.random_state}
+
+    def _encode(self, df: pd.DataFrame, fit: bool = False) -> np.ndarray:
+        if fit:
+            self.categories_ = {col: pd.Index(np.unique(df[col].astype(str))) for col in self.features
+                                if not pd.api.types.is_numeric_dtype(df[col])}
+        columns = []
+        for col in self.features:
+            if col in self.categories_:
+                columns.append(self.categories_[col].get_indexer(df[col].astype(str)).astype(float))
+            else:
+                columns.append(df[col].to_numpy(dtype=float, na_value=np.nan))
+        return np.column_stack(columns)
+
+    def _known(self, df: pd.DataFrame) -> tuple:
+        known = df[self.target].notna().to_numpy()
+        return known, df.loc[known, self.target].astype(str).to_numpy()
+
+    def fit(self, df: pd.DataFrame) -> "RandomForestImputer":
+        """Fit on the rows where the target is present."""
+        X = self._encode(df, fit=True)
+        known, labels = self._known(df)
+        self.classes_, y = np.unique(labels, return_inverse=True)
+        self.model = RandomForestClassifier(n_estimators=self.n_estimators, n_jobs=self.n_jobs,
+                                            random_state=self.random_state)
+        self.model.fit(X[known], y)
+        self.updates_ = 0
+        return self
+
+    def can_update(self, df: pd.DataFrame) -> bool:
+        """
+        A warm start needs the fitted target labels (the forest's class columns) and the feature
+        encodings (categories_) to be unchanged; otherwise old and new trees would disagree.
+        """
+        if self.model is None or not np.array_equal(np.unique(self._known(df)[1]), self.classes_):
+            return False
+        text = {col for col in self.features if not pd.api.types.is_numeric_dtype(df[col])}
+        return (text == set(self.categories_)
+                and all(np.array_equal(np.unique(df[col].astype(str)), self.categories_[col]) for col in text))
+
+    def update(self, df: pd.DataFrame, n_trees: int = 100) -> "RandomForestImputer":
+        """
+        Warm start after a data change: grow n_trees new trees on df and drop the n_trees oldest,
+        so the forest keeps its size and follows the current data without a full refit.
+        Refits from scratch when the target labels or the feature categories changed.
+        """
+        if not self.can_update(df) or n_trees >= len(self.model.estimators_):
+            return self.fit(df)
+        X = self._encode(df)
+        known, labels = self._known(df)
+        self.updates_ += 1
+        self.model.set_params(warm_start=True, n_jobs=self.n_jobs, random_state=self.random_state + self.updates_,
+                              n_estimators=len(self.model.estimators_) + n_trees)
+        self.model.fit(X[known], np.searchsorted(self.classes_, labels))
+        self.model.estimators_ = self.model.estimators_[n_trees:]
+        self.model.set_params(warm_start=False, n_estimators=len(self.model.estimators_))
+        return self
+
+    def predict(self, df: pd.DataFrame) -> np.ndarray:
+        return self.classes_[self.model.predict(self._encode(df))]
+
+    def transform(self, df: pd.DataFrame, copy: bool = True) -> pd.DataFrame:
+        """df with the target's gaps filled by the forest's predictions."""
+        if copy:
+            df = df.copy()
+        missing = df[self.target].isna().to_numpy()
+        if missing.any():
+            df.loc[missing, self.target] = self.predict(df[missing])
+        return df
+
+    def fit_transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        return self.fit(df).transform(df)
+
+def predict_hair_fall_features(raw: pd.DataFrame) -> pd.DataFrame:
+    """Raw Predict Hair Fall rows cleaned and encoded the way the notebook's RF cells saw them."""
+    df = CleaningPipeline(PREDICT_CLEANING_STEPS, profile_memory=False).run(raw)
+    return label_encode_features(df, copy=False)
+
+def fitted_imputer(df: pd.DataFrame, target: str, version, n_trees_on_update: int = 100,
+                   warm_start: bool = False, **params) -> RandomForestImputer:
+    """
+    The imputer for target fitted on df (whose DatasetVersion is version). By default it is
+    fitted from scratch, so the result depends only on df and params. With warm_start it is
+    read from the artifact store when this version was fitted last, otherwise warm-started from
+    the stored imputer with the same settings (or fitted when there is none or it cannot be
+    updated) and stored in its place: at most one forest per target and settings is kept.
+    Without a version the imputer is just fitted, nothing is read or stored.
+    """
+    imputer = RandomForestImputer(target, **params)
+    if version is None or not warm_start:
+        return imputer.fit(df)
+    kind = f"rf_imputer/{target}"
+    stored = load_artifact(kind, version, imputer.params)
+    if stored is None:
+        stored = latest_artifact(kind, imputer.params)
+        if stored is not None:
+            stored.n_jobs = imputer.n_jobs
+            imputer = stored.update(df, n_trees_on_update)
+        else:
+            imputer.fit(df)
+        try:
+            save_artifact(kind, version, imputer, imputer.params, keep_latest=1)
+        except (OSError, pickle.PicklingError):
+            pass
+        return imputer
+    stored.n_jobs = imputer.n_jobs
+    stored.model.set_params(n_jobs=imputer.n_jobs)
+    return stored
+
+def impute_predict_hair_fall(raw: pd.DataFrame, target: str, version=None, warm_start: bool = False,
+                             **params) -> pd.Series:
+    """
+    raw[target] (cleaned) with its gaps filled by the Random Forest imputer of raw's version.
+    Only the filled column is cached per version, so repeat renders never fit or load a forest;
+    without a version it is computed without touching the artifact store. warm_start is passed
+    to fitted_imputer and is part of the cache key, since a warm-started column depends on the
+    stored forest.
+    """
+    def build():
+        df = predict_hair_fall_features(raw)
+        imputer = fitted_imputer(df, target, version, warm_start=warm_start, **params)
+        return imputer.transform(df[[target] + imputer.features], copy=False)[[target]]
+    if version is None:
+        return build()[target]
+    key = {**RandomForestImputer(target, **params).params, "warm_start": warm_start}
+    return cached_artifact(f"rf_imputed/{target}", version, build, params=key)[target]
@@ -0,0 +1,136 @@
+# src/schemas.py
+import hashlib
+import pandas as pd
+from pandas.api.types import is_integer_dtype
+
+YES_NO = pd.CategoricalDtype(["No", "Yes"])
+PREDICT_STRESS = pd.CategoricalDtype(["Low", "Moderate", "High"], ordered=True)
+LUKE_LEVELS = pd.CategoricalDtype(["Low", "Medium", "High", "Very High"], ordered=True)
+LUKE_HAIR_LOSS = pd.CategoricalDtype(["Few", "Medium", "Many", "A lot"], ordered=True)
+LUKE_DATE_FORMAT = "%d/%m/%Y"
+
+# Text columns that can hold NaN use string[pyarrow] rather than category so pages can fillna('Missing').
+PREDICT_CLEANED_SCHEMA = {
+    "Id": "int32",
+    "Genetics": YES_NO,
+    "Hormonal_Changes": "int8",
+    "Medical_Conditions": "category",
+    "Medications_and_Treatments": "string[pyarrow]",
+    "Nutritional_Deficiencies": "category",
+    "Stress": PREDICT_STRESS,
+    "Age": "int8",
+    "Poor_Hair_Care_Habits": YES_NO,
+    "Environmental_Factors": "int8",
+    "Smoking": "int8",
+    "Weight_Loss": "int8",
+    "Hair_Loss": "int8",
+    "Genetic_Encoding": "int8",
+    "Hormonal_Encoding": "int8",
+    "Poor_Hair_Care_Encoding": "int8",
+    "Environmental_Encoding": "int8",
+    "Smoking_Encoding": "int8",
+    "Weight_Loss_Encoding": "int8",
+    "Stress_Level": "int8",
+    "Age_Range": "int8",
+    "Nutritional_Deficiencies_missing": "int8",
+}
+
+LUKE_CLEANED_SCHEMA = {
+    "Date": ("datetime64[ns]", LUKE_DATE_FORMAT),
+    "Hair_Loss": LUKE_HAIR_LOSS,
+    "Stay_Up_Late": "int8",
+    "Pressure_Level": LUKE_LEVELS,
+    "Coffee_Consumed": "int8",
+    "Brain_Working_Duration": "int8",
+    "School_Assesssment": "category",
+    "Stress_Level": LUKE_LEVELS,
+    "Shampoo_Brand": "category",
+    "Swimming": YES_NO,
+    "Hair_Washing": YES_NO,
+    "Hair_Grease": "float32",
+    "Dandruff": "string[pyarrow]",
+    "Libido": "int8",
+    "Hair_Loss_Encoding": "int8",
+    "Pressure_Level_Encoding": "int8",
+    "Stress_Level_Encoding": "int8",
+    "Swimming_Encoding": "int8",
+    "Hair_Washing_Encoding": "int8",
+    "Dandruff_Encoding": "int8",
+}
+
+NUTRIENT_COLUMNS = [
+    "Caloric_Value", "Fat", "Saturated_Fats", "Monounsaturated_Fats", "Polyunsaturated_Fats",
+    "Carbohydrates", "Sugars", "Protein", "Dietary_Fiber", "Cholesterol", "Sodium", "Water",
+    "Vitamin_A", "Vitamin_B1", "Vitamin_B11", "Vitamin_B12", "Vitamin_B2", "Vitamin_B3",
+    "Vitamin_B5", "Vitamin_B6", "Vitamin_C", "Vitamin_D", "Vitamin_E", "Vitamin_K",
+    "Calcium", "Copper", "Iron", "Magnesium", "Manganese", "Phosphorus", "Potassium",
+    "Selenium", "Zinc", "Nutrition_Density",
+]
+
+NUTRITION_CLEANED_SCHEMA = {
+    "Food": "string[pyarrow]",
+    "Caloric_Value": "int32",
+    **{col: "float32" for col in NUTRIENT_COLUMNS if col != "Caloric_Value"},
+}
+
+# catalog dataset name -> schema
+SCHEMAS = {
+    "predict_hair_fall_cleaned": PREDICT_CLEANED_SCHEMA,
+    "luke_hair_loss_cleaned": LUKE_CLEANED_SCHEMA,
+    "nutrition_cleaned": NUTRITION_CLEANED_SCHEMA,
+}
+
+def schema_fingerprint(schema: dict) -> str:
+    """Short stable hash of a schema; changes whenever a column or dtype changes."""
+    text = repr(sorted((col, repr(spec)) for col, spec in schema.items()))
+    return hashlib.blake2b(text.encode(), digest_size=8).hexdigest()
+
+def _to_dtype(s: pd.Series, spec):
+    if isinstance(spec, tuple):  # (datetime dtype, explicit format)
+        dtype, fmt = spec
+        return pd.to_datetime(s, format=fmt).astype(dtype)
+    dtype = pd.api.types.pandas_dtype(spec)
+    if isinstance(dtype, pd.CategoricalDtype) and dtype.categories is not None:
+        # never silently turn unexpected labels into NaN: append them after the declared ones
+        extra = pd.Index(s.dropna().unique()).difference(dtype.categories)
+        if len(extra):
+            dtype = pd.CategoricalDtype(list(dtype.categories) + list(extra), ordered=dtype.ordered)
+    elif is_integer_dtype(dtype) and s.isna().any():
+        dtype = pd.api.types.pandas_dtype(dtype.name.capitalize())  # int8 -> Int8 keeps the NaNs
+    return s.astype(dtype)
+
+def apply_schema(df: pd.DataFrame, schema: dict) -> pd.DataFrame:
+    """
+    Cast columns to the dtypes declared in schema and return a copy.
+    Columns missing from df are skipped; columns not in the schema are left as-is.
+    """
+    df = df.copy()
+    for col, spec in schema.items():
+        if col in df.columns:
+            df[col] = _to_dtype(df[col], spec)
+    return df
+
+def dtype_memory_report(before: pd.DataFrame, after: pd.DataFrame) -> pd.DataFrame:
+    """Per-column dtype and deep memory usage before/after a schema, plus a TOTAL row."""
+    b = before.memory_usage(deep=True, index=False)
+    a = after.memory_usage(deep=True, index=False)
+    report = pd.DataFrame({
+        "Column": before.columns,
+        "Before dtype": [str(t) for t in before.dtypes],
+        "After dtype": [str(after[c].dtype) if c in after.columns else "" for c in before.columns],
+        "Before bytes": b.reindex(before.columns).to_numpy(),
+        "After bytes": a.reindex(before.columns).fillna(0).astype(int).to_numpy(),
+    })
+    total = pd.DataFrame([{"Column": "TOTAL", "Before dtype": "", "After dtype": "",
+                           "Before bytes": int(b.sum()), "After bytes": int(a.sum())}])
+    report = pd.concat([report, total], ignore_index=True)
+    report["Ratio"] = (report["Before bytes"] / report["After bytes"].where(report["After bytes"] > 0)).round(2)
+    return report
+
+if __name__ == "__main__":
+    from src.catalog import DATASETS
+    from src.data_io import DATA_DIR
+    for name, schema in SCHEMAS.items():
+        raw = pd.read_csv(DATA_DIR / DATASETS[name])
+        print(f"== {name}")
+        print(dtype_memory_report(raw, apply_schema(raw, schema)).to_string(index=False))
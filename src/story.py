@@ -0,0 +1,39 @@
+# src/story.py
+import pandas as pd
+from src.artifacts import cached_artifact
+from src.catalog import dataset_version, load_dataset
+
+PREDICT = "predict_hair_fall_cleaned"
+LUKE = "luke_hair_loss_cleaned"
+LUKE_DAILY_COLUMNS = ['Date', 'Hair_Loss_Encoding', 'Stress_Level_Encoding', 'Brain_Working_Duration', 'Hair_Grease']
+
+def build_story_summaries(df_predict: pd.DataFrame, df_luke: pd.DataFrame) -> dict:
+    """Every table the story page (05_Story.py) plots, computed from the cleaned datasets."""
+    genetic_summary = df_predict.groupby('Genetic_Encoding')['Hair_Loss'].value_counts(normalize=True).rename('proportion').reset_index()
+
+    # Only genetically predisposed
+    df_nutrition = df_predict[df_predict['Genetic_Encoding'] == 1]
+    nutrient_summary = df_nutrition.groupby(['Hair_Loss', 'Nutritional_Deficiencies'], observed=True).size().reset_index(name='count')
+    nutrient_summary['proportion'] = nutrient_summary.groupby('Hair_Loss')['count'].transform(lambda x: x/x.sum())
+
+    alopecia_summary = df_predict.groupby(['Age_Range', 'Hair_Loss'], observed=True).size().reset_index(name='count')
+
+    return {
+        "genetic_summary": genetic_summary,
+        "nutrient_summary": nutrient_summary,
+        "alopecia_summary": alopecia_summary,
+        "luke_daily": df_luke[LUKE_DAILY_COLUMNS].reset_index(drop=True),
+    }
+
+def story_summaries() -> dict:
+    """
+    The story page tables, built once per (predict, luke) dataset version and stored
+    as an artifact; the row-level datasets are only loaded when the artifact is missing.
+    Returns None if either dataset file is missing.
+    """
+    try:
+        versions = [dataset_version(PREDICT), dataset_version(LUKE)]
+    except FileNotFoundError:
+        return None
+    return cached_artifact("story", versions,
+                           lambda: build_story_summaries(load_dataset(PREDICT), load_dataset(LUKE)))
@@ -0,0 +1,115 @@
+# src/validation.py
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+
+@dataclass(frozen=True)
+class Rule:
+    """
+    One check over one or more columns.
+    kind: "not_null", "domain" (value in values) or "range" (low <= value < high, numeric).
+    Missing values fail "domain" and "range" rules too.
+    """
+    name: str
+    columns: tuple
+    kind: str
+    values: tuple = ()
+    low: float = None
+    high: float = None
+
+    def violations(self, df: pd.DataFrame) -> np.ndarray:
+        """(rows x columns) boolean matrix, True where the value breaks the rule."""
+        block = df[list(self.columns)]
+        if self.kind == "not_null":
+            return block.isna().to_numpy()
+        if self.kind == "domain":
+            # a few == comparisons per column beat isin's hash table on small value sets
+            ok = np.zeros(block.shape, dtype=bool)
+            for j, col in enumerate(self.columns):
+                for value in self.values:
+                    ok[:, j] |= (block[col] == value).to_numpy(dtype=bool, na_value=False)
+            return ~ok
+        if self.kind == "range":
+            if not all(pd.api.types.is_numeric_dtype(t) for t in block.dtypes):
+                block = block.apply(pd.to_numeric, errors='coerce')
+            values = block.to_numpy(dtype=float, na_value=np.nan)
+            with np.errstate(invalid='ignore'):
+                return ~((values >= self.low) & (values < self.high))
+        raise ValueError(f"Unknown rule kind: {self.kind!r}")
+
+# standardized names of the raw Predict Hair Fall columns, in file order (see standardize_column_names)
+PREDICT_COLUMNS = ('Id', 'Genetics', 'Hormonal_Changes', 'Medical_Conditions', 'Medications_and_Treatments',
+                   'Nutritional_Deficiencies', 'Stress', 'Age', 'Poor_Hair_Care_Habits', 'Environmental_Factors',
+                   'Smoking', 'Weight_Loss', 'Hair_Loss')
+
+YES_NO_COLUMNS = ('Genetics', 'Hormonal_Changes', 'Poor_Hair_Care_Habits', 'Environmental_Factors', 'Smoking', 'Weight_Loss')
+
+# What the Predict Hair Fall cleaning steps assume about a chunk once its columns are standardized
+PREDICT_RULES = (
+    Rule("id_present", ('Id',), "not_null"),
+    Rule("yes_no", YES_NO_COLUMNS, "domain", values=('Yes', 'No')),
+    Rule("stress_level", ('Stress',), "domain", values=('Low', 'Moderate', 'High')),
+    Rule("age_in_bins", ('Age',), "range", low=18, high=51),  # create_age_ranges bins [18, 51)
+    Rule("hair_loss_binary", ('Hair_Loss',), "domain", values=(0, 1)),
+)
+
+REPORT_COLUMNS = ['Rule', 'Column', 'Violations', 'First_Row', 'Example']
+
+def structure_ok(df: pd.DataFrame, columns=None) -> bool:
+    """True if df has one column per expected name (or no names are expected)."""
+    return columns is None or len(df.columns) == len(columns)
+
+def validate_chunk(df: pd.DataFrame, rules=PREDICT_RULES, offset: int = 0, columns=None) -> pd.DataFrame:
+    """
+    Violation counts of every rule/column over one chunk, one row per (rule, column) that failed.
+    offset is the chunk's first row number in the file, so First_Row is a file row number.
+    With columns (the expected names, in file order), a raw chunk is checked for its structure
+    first: the wrong column count is one "column_count" row covering the whole chunk and the
+    value rules are skipped; otherwise the rules run against the chunk under those names.
+    """
+    if columns is not None:
+        if not structure_ok(df, columns):
+            return pd.DataFrame([{"Rule": "column_count", "Column": "*", "Violations": len(df), "First_Row": offset,
+                                  "Example": f"{len(df.columns)} columns, expected {len(columns)}: {list(df.columns)}"}],
+                                columns=REPORT_COLUMNS)
+        df = df.set_axis(list(columns), axis=1)
+    rows = []
+    for rule in rules:
+        bad = rule.violations(df)
+        counts = bad.sum(axis=0)
+        for j in np.flatnonzero(counts):
+            first = int(bad[:, j].argmax())
+            rows.append({"Rule": rule.name, "Column": rule.columns[j], "Violations": int(counts[j]),
+                         "First_Row": offset + first, "Example": str(df[rule.columns[j]].iloc[first])})
+    return pd.DataFrame(rows, columns=REPORT_COLUMNS)
+
+class ValidationReport:
+    """Violation counts accumulated over the chunks of one load."""
+
+    def __init__(self, rules=PREDICT_RULES, columns=PREDICT_COLUMNS):
+        self.rules = rules
+        self.columns = columns  # expected raw columns, checked before the rules (None: skip)
+        self.rows = 0
+        self._parts = []
+
+    def add(self, chunk_report: pd.DataFrame, rows: int) -> None:
+        self.rows += rows
+        if not chunk_report.empty:
+            self._parts.append(chunk_report)
+
+    def check(self, df: pd.DataFrame) -> None:
+        """Validate the next (raw) chunk of the load and add its counts."""
+        self.add(validate_chunk(df, self.rules, offset=self.rows, columns=self.columns), len(df))
+
+    @property
+    def ok(self) -> bool:
+        return not self._parts
+
+    def frame(self) -> pd.DataFrame:
+        """One row per (rule, column): total violations, first offending row and its value."""
+        if not self._parts:
+            return pd.DataFrame(columns=REPORT_COLUMNS)
+        parts = pd.concat(self._parts, ignore_index=True)
+        return (parts.groupby(['Rule', 'Column'], sort=False)
+                .agg(Violations=('Violations', 'sum'), First_Row=('First_Row', 'min'), Example=('Example', 'first'))
+                .reset_index())
@@ -2,21 +2,47 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
 import pandas as pd
+import streamlit as st
+from src.mice import pooled_counts, predict_hair_fall_mice
+from src.missingness import missingness_patterns
+from src.rf_imputer import predict_hair_fall_features
 
-def missing_values_heatmap_matrix(df: pd.DataFrame, subset_cols: list) -> plt.Figure:
+def missing_patterns_plot(patterns: pd.DataFrame, columns: list, title='Missing Value Patterns',
+                          cmap='YlGn', bar_color='#416c65') -> plt.Figure:
     """
-    Create heatmap showing missingness pattern (transposed) similar to notebook.
+    Draw a src.missingness.missingness_patterns table: one matrix row per distinct pattern
+    (missing cells highlighted) next to a bar of how many rows share it.
     Returns matplotlib Figure object.
     """
-    nan_array = df[subset_cols].isna().astype(int).to_numpy()
-    fig, ax = plt.subplots(figsize=(12,6))
-    im = ax.imshow(nan_array.T, interpolation='nearest', aspect='auto', cmap='viridis')
-    ax.set_xlabel('Index')
-    ax.set_yticks(range(len(subset_cols)))
-    ax.set_yticklabels(subset_cols)
-    ax.set_title('Missing Values Heatmap')
+    fig, (ax, ax_count) = plt.subplots(1, 2, figsize=(12, 1.5 + 0.5 * len(patterns)), sharey=True,
+                                       gridspec_kw={'width_ratios': [max(len(columns), 1), 4]})
+    ax.imshow(patterns[columns].to_numpy(dtype=int), interpolation='nearest', aspect='auto', cmap=cmap, vmin=0, vmax=1)
+    ax.set_xticks(range(len(columns)))
+    ax.set_xticklabels(columns, rotation=30, ha='right')
+    ax.set_yticks(range(len(patterns)))
+    ax.set_yticklabels([f"{n} missing" for n in patterns['N_Missing']])
+    ax.set_xticks(np.arange(len(columns) + 1) - 0.5, minor=True)
+    ax.set_yticks(np.arange(len(patterns) + 1) - 0.5, minor=True)
+    ax.grid(which='minor', color='white', linewidth=2)
+    ax.tick_params(which='minor', length=0)
+    y = np.arange(len(patterns))
+    ax_count.barh(y, patterns['Count'], color=bar_color)
+    for i, (count, share) in enumerate(zip(patterns['Count'], patterns['Share'])):
+        ax_count.text(count, i, f" {count:,} ({share:.1%})", va='center')
+    ax_count.set_xlabel('Rows')
+    ax_count.set_xlim(0, patterns['Count'].max() * 1.25 if len(patterns) else 1)
+    fig.suptitle(title)
+    fig.tight_layout()
     return fig
 
+def missing_values_heatmap_matrix(df: pd.DataFrame, subset_cols: list) -> plt.Figure:
+    """
+    Missingness pattern chart of subset_cols (see missing_patterns_plot); draws one row per
+    distinct pattern instead of one column per record.
+    Returns matplotlib Figure object.
+    """
+    return missing_patterns_plot(missingness_patterns(df, subset_cols), subset_cols, title='Missing Values Heatmap')
+
 def observed_vs_expected_bar(observed: pd.Series, expected: pd.Series, labels: list, title="Observed vs Expected"):
     """
     Create bar chart comparing observed vs expected counts.
@@ -47,3 +73,53 @@ def pivot_heatmap(df: pd.DataFrame, index='Age_Range', columns='Stress_Level', v
     ax.set_ylabel(index)
     ax.set_title(f'Missingness of {value} by {index} and {columns}')
     return fig
+
+def pooled_counts_bar(pooled: pd.DataFrame, title="Before vs After Multiple Imputation", color="#416c65"):
+    """
+    Bar chart of src.mice.pooled_counts: observed counts next to the counts pooled over the
+    imputations, with the imputations' spread (+/- 1 SD, min-max whiskers) on the pooled bars.
+    Returns Figure.
+    """
+    x = np.arange(len(pooled))
+    width = 0.35
+    fig, ax = plt.subplots(figsize=(12,6))
+    ax.bar(x - width/2, pooled['Observed'], width, label='Before Imputation', color="#9BDEB6")
+    ax.bar(x + width/2, pooled['Pooled'], width, yerr=pooled['Imputed_SD'], capsize=4,
+           label='After Imputation (pooled mean +/- SD)', color=color)
+    low = pooled['Observed'] + pooled['Imputed_Min']
+    high = pooled['Observed'] + pooled['Imputed_Max']
+    ax.vlines(x + width/2 + width/4, low, high, color='#555', linewidth=1, label='Range over imputations')
+    ax.set_xticks(x)
+    ax.set_xticklabels(pooled.index, rotation=45, ha='right')
+    ax.set_ylabel('Count', fontsize=14)
+    ax.set_title(title, fontsize=16)
+    ax.legend(fontsize=12)
+    return fig
+
+def render_mice_section(df_raw: pd.DataFrame, version, column: str, title: str,
+                        heading="Third Method: Multiple Imputation (MICE)", HEADER_COLOR="#2E8B57", TEXT="#333"):
+    """
+    Streamlit "Multiple Imputation (MICE)" section of the Missingness page for one column:
+    heading, explanation, pooled_counts_bar ("<title>: Before vs After ...") and the pooled table.
+    The imputations come from src.mice for df_raw's version.
+    """
+    st.markdown("<hr style='border:2px solid #AAA; margin:16px 0;'>", unsafe_allow_html=True)
+    st.markdown("<br>", unsafe_allow_html=True)
+    st.markdown(f"<h2 style='color:{TEXT}; font-size:22px; text-align:center'; >{heading}</h2>", unsafe_allow_html=True)
+    deltas = predict_hair_fall_mice(df_raw, version)
+    # observed labels as the imputation engine saw them (the page's other plots title-case theirs)
+    pooled = pooled_counts(predict_hair_fall_features(df_raw)[column], deltas)
+    n_imputations = deltas['Imputation'].nunique()
+    st.markdown(f"""
+    <p style='font-size:18px; color:{TEXT}; line-height:1.5;'>
+    Instead of one "best guess" per gap, <b>{n_imputations} imputed datasets</b> were drawn by chained equations:
+    Medical_Conditions and Nutritional_Deficiencies are modelled in turn (multinomial logistic regression on the
+    Random Forest features plus the other column), and every gap is drawn from the predicted probabilities.
+    The bars show the count per category pooled over the imputations; whiskers show how much the imputations disagree.
+    </p>
+    """, unsafe_allow_html=True)
+    fig = pooled_counts_bar(pooled, title=f'{title}: Before vs After Multiple Imputation ({n_imputations} imputations)')
+    fig.axes[0].title.set_color(HEADER_COLOR)
+    st.pyplot(fig)
+    plt.close(fig)
+    st.dataframe(pooled.round(2), use_container_width=True)